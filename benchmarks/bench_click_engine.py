@@ -0,0 +1,408 @@
+"""
+Headless benchmarks for the click engine.
+
+Runs ClickEngine against the null input backend, so no Qt widgets, display or
+real mouse are involved, and prints the results as JSON. Save the output of
+two commits and pass one as --baseline to the other to compare them:
+
+    python -m benchmarks.bench_click_engine --output before.json
+    python -m benchmarks.bench_click_engine --baseline before.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+from core.click_engine import ClickEngine
+from core.control_client import ControlClient
+from core.control_server import ControlServer
+from core.input_backends import NullBackend
+from core.macro import Macro, PRESS, RELEASE, event_code
+from core.process_engine import ProcessClickEngine
+from core.settings_snapshot import SettingsSnapshot
+from core.window_tracker import WindowTracker
+
+BENCH_SETTINGS = {
+    'cps': 10,
+    'random_delay': False,
+    'mouse_button': 'left',
+    'click_type': 1,
+    'target_mode': 'specific_pos',
+    'specific_pos_x': 400,
+    'specific_pos_y': 300,
+    'window_targeting_enabled': False,
+    'target_window': None,
+    'click_limit_enabled': True,
+    'click_limit_count': 100,
+    'overrun_policy': 'skip',
+    'input_backend': 'null',
+}
+JITTER_RATES = (10, 50, 100)
+JOB_COUNTS = (4, 32)
+# (engine_priority, engine_cpu, low_timer_slack) combinations compared by bench_realtime
+REALTIME_OPTIONS = {
+    'normal': ('normal', -1, False),
+    'high': ('high', -1, False),
+    'fifo': ('realtime', -1, False),
+    'pinned_cpu0': ('normal', 0, False),
+    'low_slack': ('normal', -1, True),
+    'all': ('realtime', 0, True),
+}
+WINDOW_TITLE = "Benchmark Window"
+
+Box = namedtuple('Box', 'left top width height')
+
+
+class FakeWindow:
+    box = Box(0, 0, 1920, 1080)
+
+
+class FixedSettings:
+    """A stand-in for StateManager that publishes a single snapshot."""
+    def __init__(self, **overrides):
+        settings = dict(BENCH_SETTINGS, **overrides)
+        self.snapshot = SettingsSnapshot(1, settings)
+        self.version = 1
+
+
+def run_engine(window_targeting, **overrides):
+    if window_targeting:
+        overrides.update(window_targeting_enabled=True, target_window=WINDOW_TITLE)
+    settings = FixedSettings(**overrides)
+    backend = NullBackend()
+    tracker = WindowTracker(None, lookup=lambda title: [FakeWindow()])
+    engine = ClickEngine(settings, backend=backend, window_tracker=tracker, log=lambda message: None)
+    started = time.perf_counter()
+    engine.run_session()
+    elapsed = time.perf_counter() - started
+    return engine, backend, elapsed
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def bench_overhead(window_targeting, clicks):
+    """Runs unthrottled, so the time per click is the engine's own overhead."""
+    engine, backend, elapsed = run_engine(window_targeting, cps=1_000_000, click_limit_count=clicks)
+    per_click = elapsed / max(engine.click_count, 1)
+    return {
+        'clicks': engine.click_count,
+        'button_clicks': backend.button_clicks,
+        'per_click_overhead_us': round(per_click * 1e6, 3),
+        'max_sustainable_cps': round(1.0 / per_click) if per_click else None,
+    }
+
+
+def bench_sequence_overhead(clicks, points=16):
+    """Like bench_overhead, cycling through window-relative sequence points inside the target window."""
+    sequence = [{'x': 10 * i, 'y': 10 * i, 'relative': True} for i in range(points)]
+    engine, backend, elapsed = run_engine(True, cps=1_000_000, click_limit_count=clicks, target_mode='sequence', click_sequence=sequence)
+    per_click = elapsed / max(engine.click_count, 1)
+    return {
+        'clicks': engine.click_count,
+        'points': points,
+        'per_click_overhead_us': round(per_click * 1e6, 3),
+    }
+
+
+def bench_jitter(window_targeting, cps, duration):
+    engine, backend, elapsed = run_engine(window_targeting, cps=cps, click_limit_count=max(2, int(cps * duration)))
+    period = 1.0 / cps
+    stamps = backend.timestamps
+    deviations = sorted(abs((stamps[i] - stamps[i - 1]) - period) * 1e6 for i in range(1, len(stamps)))
+    achieved = (len(stamps) - 1) / (stamps[-1] - stamps[0]) if len(stamps) > 1 else 0.0
+    return {
+        'clicks': engine.click_count,
+        'achieved_cps': round(achieved, 3),
+        'missed_deadlines': engine.missed_deadlines,
+        'jitter_p50_us': round(percentile(deviations, 50), 1),
+        'jitter_p90_us': round(percentile(deviations, 90), 1),
+        'jitter_p99_us': round(percentile(deviations, 99), 1),
+        'jitter_max_us': round(deviations[-1], 1) if deviations else 0.0,
+    }
+
+
+def bench_realtime(option, duration, cps=100):
+    """Jitter with one set of scheduling options. Runs on a fresh thread so the options never leak into the next run."""
+    priority, cpu, low_timer_slack = REALTIME_OPTIONS[option]
+    settings = FixedSettings(cps=cps, click_limit_count=max(2, int(cps * duration)),
+                             engine_priority=priority, engine_cpu=cpu, low_timer_slack=low_timer_slack)
+    backend = NullBackend()
+    problems = []
+    engine = ClickEngine(settings, backend=backend, log=problems.append)
+    thread = threading.Thread(target=engine.run_session)
+    thread.start()
+    thread.join()
+    period = 1.0 / cps
+    stamps = backend.timestamps
+    deviations = sorted(abs((stamps[i] - stamps[i - 1]) - period) * 1e6 for i in range(1, len(stamps)))
+    return {
+        'applied': list(engine.realtime.applied),
+        'problems': [message for message in problems if message.startswith("Warning:")],
+        'missed_deadlines': engine.missed_deadlines,
+        'jitter_p50_us': round(percentile(deviations, 50), 1),
+        'jitter_p99_us': round(percentile(deviations, 99), 1),
+        'jitter_max_us': round(deviations[-1], 1) if deviations else 0.0,
+    }
+
+
+def bench_arm_latency(samples, cps=50):
+    """Arms and disarms a persistent engine, as a hotkey would, and reports both latencies."""
+    settings = FixedSettings(cps=cps, click_limit_enabled=False)
+    engine = ClickEngine(settings, backend=NullBackend(), log=lambda message: None)
+    stopped = threading.Event()
+    worker = threading.Thread(target=engine.serve_forever, kwargs={'on_stopped': stopped.set}, daemon=True)
+    worker.start()
+    activation, release = [], []
+    for _ in range(samples):
+        stopped.clear()
+        engine.arm(time.perf_counter())
+        time.sleep(3.5 / cps)
+        engine.disarm(time.perf_counter())
+        stopped.wait(1.0)
+        session = engine.last_session
+        if session['activation_latency_ms'] is not None:
+            activation.append(session['activation_latency_ms'] * 1000.0)
+        if session['release_latency_ms'] is not None:
+            release.append(session['release_latency_ms'] * 1000.0)
+    engine.shutdown()
+    worker.join(1.0)
+    activation.sort()
+    release.sort()
+    return {
+        'samples': samples,
+        'activation_p50_us': round(percentile(activation, 50), 1),
+        'activation_max_us': round(activation[-1], 1) if activation else None,
+        # Negative values mean no click happened after the release
+        'release_to_last_click_max_us': round(release[-1], 1) if release else None,
+    }
+
+
+def bench_control_latency(samples, cps=50):
+    """
+    Drives a served engine through the control socket and reports the time from
+    sending 'start' to the first click, from sending 'stop' to its reply, and
+    the round trip of a 'status' request.
+    """
+    settings = FixedSettings(cps=cps, click_limit_enabled=False)
+    backend = NullBackend()
+    engine = ClickEngine(settings, backend=backend, log=lambda message: None)
+    stopped = threading.Event()
+    worker = threading.Thread(target=engine.serve_forever, kwargs={'on_stopped': stopped.set}, daemon=True)
+    worker.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = ControlServer(settings, None, engine, path=os.path.join(tmp, "control.sock"), log=lambda message: None)
+        server.start()
+        start_to_click, stop_reply, status_reply = [], [], []
+        with ControlClient(server.path) as client:
+            for _ in range(samples):
+                stopped.clear()
+                clicks_before = len(backend.timestamps)
+                sent = time.perf_counter()
+                client.start()
+                while len(backend.timestamps) == clicks_before:
+                    time.sleep(0.0001)
+                start_to_click.append((backend.timestamps[clicks_before] - sent) * 1e6)
+                sent = time.perf_counter()
+                client.status()
+                status_reply.append((time.perf_counter() - sent) * 1e6)
+                sent = time.perf_counter()
+                client.stop()
+                stop_reply.append((time.perf_counter() - sent) * 1e6)
+                stopped.wait(1.0)
+        server.stop()
+    engine.shutdown()
+    worker.join(1.0)
+    for values in (start_to_click, stop_reply, status_reply):
+        values.sort()
+    return {
+        'samples': samples,
+        'start_to_first_click_p50_us': round(percentile(start_to_click, 50), 1),
+        'start_to_first_click_max_us': round(start_to_click[-1], 1),
+        'stop_reply_p50_us': round(percentile(stop_reply, 50), 1),
+        'status_round_trip_p50_us': round(percentile(status_reply, 50), 1),
+        'status_round_trip_max_us': round(status_reply[-1], 1),
+    }
+
+
+def bench_jobs(job_count, duration):
+    """Runs many click jobs at mixed rates on one thread and reports the worst per-job timing error."""
+    # Each job clicks its own x coordinate, so the clicks can be told apart afterwards
+    jobs = [{'mouse_button': 'left', 'cps': 5 + (i % 8) * 5, 'x': i, 'y': 0, 'click_type': 1, 'click_limit': 0}
+            for i in range(job_count)]
+    total = sum(int(job['cps'] * duration) for job in jobs)
+    engine, backend, elapsed = run_engine(False, multi_job_enabled=True, click_jobs=jobs, click_limit_count=total)
+    by_job = [[] for _ in jobs]
+    for x, stamp in zip(backend.xs, backend.timestamps):
+        by_job[x].append(stamp)
+    deviations, rate_errors = [], []
+    for job, stamps in zip(jobs, by_job):
+        period = 1.0 / job['cps']
+        deviations.extend(abs((stamps[i] - stamps[i - 1]) - period) * 1e6 for i in range(1, len(stamps)))
+        if len(stamps) > 1:
+            achieved = (len(stamps) - 1) / (stamps[-1] - stamps[0])
+            rate_errors.append(abs(achieved - job['cps']) / job['cps'] * 100)
+    deviations.sort()
+    return {
+        'jobs': job_count,
+        'clicks': engine.click_count,
+        'missed_deadlines': engine.missed_deadlines,
+        'worst_rate_error_pct': round(max(rate_errors), 3) if rate_errors else None,
+        'jitter_p50_us': round(percentile(deviations, 50), 1),
+        'jitter_p99_us': round(percentile(deviations, 99), 1),
+        'jitter_max_us': round(deviations[-1], 1) if deviations else 0.0,
+    }
+
+
+def bench_macro_replay(duration, cps=100):
+    """Replays a synthetic recording (press, release 2 ms later) and reports how far each press lands from its slot."""
+    period_us = int(1e6 / cps)
+    macro = Macro()
+    for _ in range(max(2, int(cps * duration))):
+        macro.append(period_us - 2000, 0, 0, event_code(PRESS, 'left'))
+        macro.append(2000, 0, 0, event_code(RELEASE, 'left'))
+    backend = NullBackend()
+    engine = ClickEngine(FixedSettings(), backend=backend, log=lambda message: None)
+    engine.play_macro(macro)
+    engine.run_session()
+    stamps = backend.timestamps
+    deviations = sorted(abs((stamps[i] - stamps[i - 1]) * 1e6 - period_us) for i in range(1, len(stamps)))
+    return {
+        'events': len(macro),
+        'macro_bytes': macro.nbytes,
+        'clicks': engine.click_count,
+        'jitter_p50_us': round(percentile(deviations, 50), 1),
+        'jitter_p99_us': round(percentile(deviations, 99), 1),
+        'jitter_max_us': round(deviations[-1], 1) if deviations else 0.0,
+    }
+
+
+def _busy_gui(stop):
+    """Stands in for a busy GUI thread: pure Python work that holds the GIL."""
+    while not stop.is_set():
+        sum(i * i for i in range(20_000))
+
+
+def bench_isolation(duration, use_process, cps=100):
+    """
+    Clicks while another thread hogs the GIL, with the engine in-process or in its own process.
+    The click process can only pull ahead on a machine with a spare core: on one CPU it
+    waits for the core the load is using, however the GIL is shared.
+    """
+    settings = FixedSettings(cps=cps, click_limit_enabled=False)
+    if use_process:
+        engine = ProcessClickEngine(settings, log=lambda message: None)
+    else:
+        engine = ClickEngine(settings, backend=NullBackend(), log=lambda message: None)
+    stopped = threading.Event()
+    worker = threading.Thread(target=engine.serve_forever, kwargs={'on_stopped': stopped.set}, daemon=True)
+    worker.start()
+    # One short session first, so the click process has started up and imported
+    # everything before the measured one
+    engine.arm()
+    time.sleep(0.2)
+    engine.disarm()
+    stopped.wait(30.0)
+    stopped.clear()
+    load_stop = threading.Event()
+    load = threading.Thread(target=_busy_gui, args=(load_stop,), daemon=True)
+    load.start()
+    engine.arm()
+    time.sleep(duration)
+    engine.disarm()
+    stopped.wait(5.0)
+    load_stop.set()
+    load.join()
+    engine.shutdown()
+    worker.join(5.0)
+    stats = engine.last_session['interval_stats'] or {}
+    period_ms = 1000.0 / cps
+    return {
+        'cpu_count': os.cpu_count(),
+        'clicks': engine.last_session['clicks'],
+        'interval_p99_error_ms': round(stats.get('p99', period_ms) - period_ms, 3),
+        'interval_max_error_ms': round(stats.get('max', period_ms) - period_ms, 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(duration, overhead_clicks, arm_samples=20):
+    results = {}
+    for window_targeting in (False, True):
+        prefix = 'window' if window_targeting else 'plain'
+        results[f'{prefix}.overhead'] = bench_overhead(window_targeting, overhead_clicks)
+        for cps in JITTER_RATES:
+            results[f'{prefix}.jitter_{cps}cps'] = bench_jitter(window_targeting, cps, duration)
+    results['window.sequence_overhead'] = bench_sequence_overhead(overhead_clicks)
+    for job_count in JOB_COUNTS:
+        results[f'jobs.{job_count}'] = bench_jobs(job_count, duration)
+    results['macro_replay'] = bench_macro_replay(duration)
+    results['gil_load.in_process'] = bench_isolation(duration, use_process=False)
+    results['gil_load.separate_process'] = bench_isolation(duration, use_process=True)
+    for option in REALTIME_OPTIONS:
+        results[f'realtime.{option}'] = bench_realtime(option, duration)
+    results['arm_latency'] = bench_arm_latency(arm_samples)
+    results['control_latency'] = bench_control_latency(arm_samples)
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'duration_s': duration,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, current):
+    """Prints every numeric metric next to its baseline value."""
+    for name, metrics in current['results'].items():
+        base_metrics = baseline.get('results', {}).get(name, {})
+        for key, value in metrics.items():
+            base = base_metrics.get(key)
+            if not isinstance(value, (int, float)) or not isinstance(base, (int, float)):
+                continue
+            change = f"{(value - base) / base * 100:+.1f}%" if base else "n/a"
+            print(f"{name + '.' + key:<45} {base:>12} -> {value:<12} {change}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless click engine benchmarks.")
+    parser.add_argument('--duration', type=float, default=3.0, help="Seconds per jitter run.")
+    parser.add_argument('--overhead-clicks', type=int, default=50_000)
+    parser.add_argument('--arm-samples', type=int, default=20, help="Arm/disarm cycles for the latency benchmark.")
+    parser.add_argument('--output', help="Write the JSON results to this file instead of stdout.")
+    parser.add_argument('--baseline', help="A previous JSON result to compare against.")
+    args = parser.parse_args(argv)
+
+    report = run_all(args.duration, args.overhead_clicks, args.arm_samples)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
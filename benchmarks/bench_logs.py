@@ -0,0 +1,114 @@
+"""
+Session log benchmarks: fills a scratch database with synthetic sessions and
+times what the Session Logs page does with it, comparing loading the whole
+history with keyset paging, and the summary panel's rollup lookups with the
+equivalent GROUP BY over the logs.
+
+    python -m benchmarks.bench_logs --rows 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from database.database_manager import DatabaseManager
+
+PAGE_SIZE = 200
+PROFILES = ["Farming", "Jungle", None]
+
+
+def populate(db, rows, batch=50_000):
+    start = time.time() - rows * 60
+    for first in range(0, rows, batch):
+        sessions = []
+        for i in range(first, min(first + batch, rows)):
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start + i * 60))
+            sessions.append((started, started, 30.0, 300, int(start + i * 60), PROFILES[i % len(PROFILES)]))
+        db.cursor.executemany("INSERT INTO logs (start_time, end_time, duration_seconds, total_clicks, started_at, profile) VALUES (?, ?, ?, ?, ?, ?)", sessions)
+    db.commit()
+
+
+def timed_ms(fn, repeat=5):
+    """Best of repeat runs, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def bench_paging(db, rows):
+    deep_id = rows // 2
+    return {
+        'rows': rows,
+        'all_logs_ms': timed_ms(db.get_all_logs, repeat=1),
+        'first_page_ms': timed_ms(lambda: db.get_logs_page(None, PAGE_SIZE)),
+        'deep_page_ms': timed_ms(lambda: db.get_logs_page(deep_id, PAGE_SIZE)),
+        'new_sessions_ms': timed_ms(lambda: db.get_logs_after(rows - 2)),
+    }
+
+
+def _scan_stats(db):
+    """The week's summary computed from the logs themselves, for comparison with get_log_stats()."""
+    db.cursor.execute("""SELECT COALESCE(profile, ''), COUNT(*), SUM(total_clicks), SUM(duration_seconds) FROM logs
+                         WHERE started_at >= CAST(strftime('%s', date('now', 'localtime', 'weekday 0', '-6 days'), 'utc') AS INTEGER)
+                         GROUP BY 1""")
+    return db.cursor.fetchall()
+
+
+def _write_session(db):
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    log_id = db.begin_log(now, PROFILES[0]); db.update_log(log_id, now, 30.0, 300); db.commit()
+    return log_id
+
+
+def bench_stats(db):
+    """The summary panel's queries against scanning the logs, and what the rollup triggers add to writing a session."""
+    with_triggers = timed_ms(lambda: _write_session(db), repeat=20)
+    db.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'logs'")
+    triggers = db.cursor.fetchall()
+    for name, sql in triggers: db.cursor.execute(f"DROP TRIGGER {name}")
+    without_triggers = timed_ms(lambda: _write_session(db), repeat=20)
+    for name, sql in triggers: db.cursor.execute(sql)
+    db.commit()
+    return {
+        'day_ms': timed_ms(lambda: db.get_log_stats('day')),
+        'week_ms': timed_ms(lambda: db.get_log_stats('week')),
+        'week_scan_ms': timed_ms(lambda: _scan_stats(db), repeat=3),
+        'write_session_ms': with_triggers,
+        'write_session_no_rollups_ms': without_triggers,
+    }
+
+
+def bench_model(db):
+    """Opening the table model and scrolling one page, without a view. Needs PyQt6."""
+    from ui.views.logs_view import LogsTableModel
+    model = LogsTableModel(db, page_size=PAGE_SIZE)
+    return {
+        'open_ms': timed_ms(model.reload),
+        'next_page_ms': timed_ms(model.fetchMore),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Session log loading benchmarks.")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Synthetic sessions in the scratch database.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        populate(db, args.rows)
+        results = {'paging': bench_paging(db, args.rows), 'stats': bench_stats(db)}
+        try:
+            results['model'] = bench_model(db)
+        except ImportError as e:
+            results['model'] = {'skipped': str(e)}
+        db.close()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Startup benchmarks: launches the GUI and the headless mode in fresh
+interpreters and measures import time, the time until each is ready (GUI:
+first paint of the main window; headless: hotkeys listening) and the peak
+resident memory at that point. The GUI runs on Qt's offscreen platform unless
+QT_QPA_PLATFORM is already set.
+Every run uses a scratch database and an empty icon cache, so it measures a
+cold start and leaves autoclicker.db and the user's cache untouched.
+
+It also times a second launch of main.py that forwards its options to an
+already running instance and exits.
+
+--check fails (exit status 1) if the GUI's import time or time to first paint
+is over STARTUP_BUDGET_MS; tests/test_startup_budget.py enforces the same
+budget in the test suite:
+
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --modes gui --check
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from core.control_server import ControlServer, SOCKET_NAME
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each child prints one JSON line once it is ready, then shuts down cleanly. Times are
+# in milliseconds from the start of the child's script, so interpreter startup is excluded.
+_CHILDREN = {
+    'gui': """
+import json, sys, time
+started = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QEvent, QObject
+from main import FontManager
+from main_window import MainWindow
+imported = time.perf_counter()
+
+class FirstPaint(QObject):
+    painted = None
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and self.painted is None:
+            self.painted = time.perf_counter()
+        return False
+
+app = QApplication(sys.argv[:1])
+font_manager = FontManager()
+app.setFont(font_manager.antialiased_font)
+window = MainWindow(font_manager, sys.argv[1])
+first_paint = FirstPaint()
+window.installEventFilter(first_paint)
+window.show()
+deadline = time.perf_counter() + 10.0
+while first_paint.painted is None and time.perf_counter() < deadline:
+    app.processEvents()
+from headless import peak_memory_mb
+print(json.dumps({'import_ms': (imported - started) * 1000,
+                  'first_paint_ms': (first_paint.painted - started) * 1000 if first_paint.painted else None,
+                  'peak_rss_mb': peak_memory_mb()}), flush=True)
+window.close()
+""",
+    'headless': """
+import json, sys, time
+started = time.perf_counter()
+from PyQt6.QtCore import QCoreApplication
+from headless import HeadlessClicker, peak_memory_mb
+imported = time.perf_counter()
+app = QCoreApplication(sys.argv[:1])
+clicker = HeadlessClicker(sys.argv[1], log=lambda message: None)
+clicker.start()
+app.processEvents()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'peak_rss_mb': peak_memory_mb()}), flush=True)
+clicker.shutdown()
+""",
+}
+
+# Upper limits for the GUI's median startup, checked by --check (e.g. in CI)
+STARTUP_BUDGET_MS = {
+    'import_ms': 400.0,
+    'first_paint_ms': 1000.0,
+}
+
+
+def measure(mode, tmp):
+    # A scratch runtime directory keeps the child's control socket away from a running instance, and a
+    # scratch cache directory makes every run render its icons from scratch, as on a first launch
+    cache_dir = tempfile.mkdtemp(dir=tmp)
+    env = dict(os.environ, XDG_RUNTIME_DIR=tmp, XDG_CACHE_HOME=cache_dir)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    started = time.perf_counter()
+    child = subprocess.Popen([sys.executable, '-c', _CHILDREN[mode], os.path.join(tmp, "bench.db")], cwd=REPO_ROOT, env=env,
+                             stdout=subprocess.PIPE, text=True)
+    line = child.stdout.readline()
+    ready_ms = (time.perf_counter() - started) * 1000
+    child.communicate(timeout=30)
+    if not line:
+        raise RuntimeError(f"The {mode} startup run failed (exit code {child.returncode}).")
+    result = json.loads(line)
+    result['ready_ms'] = ready_ms
+    return result
+
+
+def _median(samples, key):
+    values = [sample[key] for sample in samples if sample.get(key) is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def bench_startup(mode, runs, tmp):
+    samples = [measure(mode, tmp) for _ in range(runs)]
+    result = {'runs': runs}
+    for key in ('import_ms', 'first_paint_ms', 'ready_ms', 'peak_rss_mb'):
+        if any(key in sample for sample in samples):
+            result[f'{key}_median' if key != 'peak_rss_mb' else key] = _median(samples, key)
+    result['ready_ms_min'] = round(min(sample['ready_ms'] for sample in samples), 1)
+    return result
+
+
+def check_budget(gui):
+    """Returns a message for every GUI startup figure over its budget."""
+    failures = []
+    for key, budget in STARTUP_BUDGET_MS.items():
+        value = gui.get(f'{key}_median')
+        if value is None:
+            failures.append(f"{key}: not measured")
+        elif value > budget:
+            failures.append(f"{key}: {value} ms is over the {budget} ms budget")
+    return failures
+
+
+class _IdleEngine:
+    """Stands in for the click worker of the running instance in the forwarding benchmark."""
+    is_armed = False
+    click_count = 0
+    missed_deadlines = 0
+
+    def arm(self, trigger_time=None):
+        pass
+
+    def disarm(self, release_time=None):
+        pass
+
+
+def _time_process(command, env):
+    started = time.perf_counter()
+    subprocess.run(command, cwd=REPO_ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_forward(runs, tmp):
+    """A second launch ('main.py --start') against a running control server, next to a bare interpreter start."""
+    env = dict(os.environ, XDG_RUNTIME_DIR=tmp)
+    server = ControlServer(None, None, _IdleEngine(), path=os.path.join(tmp, SOCKET_NAME), log=lambda message: None)
+    if not server.start():
+        raise RuntimeError("Could not start the control server for the forwarding benchmark.")
+    try:
+        forward = [_time_process([sys.executable, 'main.py', '--start'], env) for _ in range(runs)]
+    finally:
+        server.stop()
+    interpreter = [_time_process([sys.executable, '-c', 'pass'], env) for _ in range(runs)]
+    return {
+        'runs': runs,
+        'forward_ms_median': round(statistics.median(forward), 1),
+        'forward_ms_max': round(max(forward), 1),
+        'bare_interpreter_ms_median': round(statistics.median(interpreter), 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time and memory of the GUI and headless modes.")
+    parser.add_argument('--runs', type=int, default=5, help="Launches per mode.")
+    parser.add_argument('--modes', nargs='+', choices=sorted(_CHILDREN) + ['forward'], default=['gui', 'headless', 'forward'])
+    parser.add_argument('--check', action='store_true', help="Exit with status 1 if the GUI startup is over budget.")
+    args = parser.parse_args(argv)
+    if args.check and 'gui' not in args.modes:
+        parser.error("--check needs the gui mode")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Both modes use a scratch database, so the benchmark never touches autoclicker.db
+        results = {mode: bench_startup(mode, args.runs, tmp) for mode in args.modes if mode in _CHILDREN}
+        if 'forward' in args.modes:
+            results['forward'] = bench_forward(args.runs, tmp)
+    if 'gui' in results and 'headless' in results:
+        gui, headless = results['gui'], results['headless']
+        results['headless_vs_gui'] = {
+            'ready_time_ratio': round(headless['ready_ms_median'] / gui['ready_ms_median'], 3),
+            'memory_ratio': round(headless['peak_rss_mb'] / gui['peak_rss_mb'], 3) if gui['peak_rss_mb'] and headless['peak_rss_mb'] else None,
+        }
+    print(json.dumps(results, indent=2))
+    if args.check:
+        failures = check_budget(results['gui'])
+        for failure in failures:
+            print(f"Over budget: {failure}", file=sys.stderr)
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
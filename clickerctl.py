@@ -0,0 +1,14 @@
+"""
+Command line client for the control API of a running autoclicker (GUI or headless).
+
+    python clickerctl.py start
+    python clickerctl.py set cps 25
+    python clickerctl.py load-profile "My Profile"
+    python clickerctl.py status
+"""
+import sys
+
+from core.control_client import main
+
+if __name__ == "__main__":
+    sys.exit(main())
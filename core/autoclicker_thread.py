@@ -1,87 +1,105 @@
-import time
-import random
-from PyQt6.QtCore import QThread, pyqtSignal
-from pynput.mouse import Controller, Button
-import pygetwindow as gw
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
+
+from core.click_engine import ClickEngine
+from core.process_engine import ProcessClickEngine
 
 class AutoClickerThread(QThread):
+    """
+    A long-lived worker that hosts the ClickEngine. It is started once at launch
+    and then armed/disarmed for each session, so starting to click never pays
+    for thread or backend creation.
+
+    With the 'process_isolation' setting the engine runs in its own process
+    (ProcessClickEngine) and this thread only relays its events. Switching
+    between the two happens while no session is running.
+    """
     log_event = pyqtSignal(str)
-    update_clicks = pyqtSignal(int)
+    session_started = pyqtSignal()
     # --- NEW SIGNAL ---
     autoclicker_stopped = pyqtSignal()
 
-    def __init__(self, state_manager):
+    def __init__(self, state_manager, session_recorder=None):
         super().__init__()
         self.state_manager = state_manager
-        self.mouse = Controller()
-        self._running = False
-        self.click_count = 0
+        self.session_recorder = session_recorder
+        self._closing = False
+        self.engine = self._create_engine()
+        self.state_manager.settings_updated.connect(self._on_settings_updated)
+        self.autoclicker_stopped.connect(self._on_stopped)
+
+    def _wants_process(self):
+        return bool(self.state_manager.get_settings().get('process_isolation', False))
+
+    def _create_engine(self):
+        if self._wants_process():
+            try:
+                return ProcessClickEngine(self.state_manager, log=self.log_event.emit, recorder=self.session_recorder)
+            except Exception as e:
+                print(f"Warning: Could not start the click process ({e}), clicking in-process.")
+        return ClickEngine(self.state_manager, log=self.log_event.emit, recorder=self.session_recorder)
+
+    def _on_settings_updated(self):
+        if isinstance(self.engine, ProcessClickEngine):
+            self.engine.sync_settings()
+        else:
+            self.engine.settings_changed()
+        self._switch_engine_if_needed()
+
+    def _on_stopped(self):
+        # Queued behind the other autoclicker_stopped slots, so they still read the
+        # finished session (last_session, click_count) from the engine that ran it
+        QTimer.singleShot(0, self._switch_engine_if_needed)
+
+    def _switch_engine_if_needed(self):
+        # run() creates the replacement once the current engine's serve_forever() returns
+        if not self.engine.is_armed and self._wants_process() != isinstance(self.engine, ProcessClickEngine):
+            self.engine.shutdown()
+
+    @property
+    def is_armed(self):
+        return self.engine.is_armed
+
+    @property
+    def achieved_rate(self):
+        # Only the separate click process measures its own rate
+        return getattr(self.engine, 'achieved_rate', None)
+
+    @property
+    def click_count(self):
+        return self.engine.click_count
+
+    @property
+    def missed_deadlines(self):
+        return self.engine.missed_deadlines
 
     def run(self):
-        self._running = True
-        self.click_count = 0
-
-        while self._running:
-            settings = self.state_manager.get_settings()
-            cps = settings['cps']
-
-            target_window = None
-            if settings['window_targeting_enabled']:
-                window_title = settings.get('target_window')
-                if window_title:
-                    windows = gw.getWindowsWithTitle(window_title)
-                    if windows:
-                        target_window = windows[0]
-                    else:
-                        time.sleep(0.1)
-                        continue
-                else:
-                    time.sleep(0.1)
-                    continue
-
-            click_pos = None
-            if settings['target_mode'] == 'specific_pos':
-                click_pos = (settings['specific_pos_x'], settings['specific_pos_y'])
-            else:
-                click_pos = self.mouse.position
-
-            can_click = True
-            if target_window:
-                win_box = target_window.box
-                is_inside = (win_box.left <= click_pos[0] < win_box.left + win_box.width and
-                             win_box.top <= click_pos[1] < win_box.top + win_box.height)
-                if not is_inside:
-                    can_click = False
-
-            if can_click:
-                if settings['target_mode'] == 'specific_pos':
-                    self.mouse.position = click_pos
-
-                self.mouse.click(Button[settings['mouse_button']], settings['click_type'])
-                self.click_count += 1
-                self.update_clicks.emit(self.click_count)
-
-                # --- NEW LOGIC FOR CLICK LIMIT ---
-                if settings['click_limit_enabled']:
-                    if self.click_count >= settings['click_limit_count']:
-                        self.stop()
-                        # Use break to exit the loop immediately
-                        break
-
-            if cps > 0:
-                base_delay = 1.0 / cps
-                delay = base_delay
-                if settings['random_delay']:
-                    random_offset = (random.random() - 0.5) * base_delay * 0.5
-                    delay += random_offset
-                if delay > 0:
-                    time.sleep(delay)
-            else:
-                self.stop()
-        
-        # --- EMIT NEW SIGNAL ---
-        # This will run when the loop finishes for any reason (stopped or limit reached)
-        self.autoclicker_stopped.emit()
+        while True:
+            # This will emit autoclicker_stopped whenever a session finishes for any reason (stopped or limit reached)
+            try:
+                self.engine.serve_forever(self.session_started.emit, self.autoclicker_stopped.emit)
+            except Exception as e:
+                # e.g. the click process could not be relayed; carry on with a fresh engine
+                self.log_event.emit(f"Error: The click worker failed: {e!r}")
+                try: self.engine.shutdown()
+                except Exception: pass
+                self.autoclicker_stopped.emit()
+            if self._closing:
+                break
+            self.engine = self._create_engine()
+
+    def arm(self, trigger_time=None):
+        self.engine.arm(trigger_time)
+
+    def disarm(self, release_time=None):
+        self.engine.disarm(release_time)
+
+    def play_macro(self, macro, repeat=1, trigger_time=None):
+        return self.engine.play_macro(macro, repeat, trigger_time)
 
     def stop(self):
-        self._running = False
\ No newline at end of file
+        self.engine.disarm()
+
+    def shutdown(self):
+        self._closing = True
+        self.engine.shutdown()
+        self.wait()
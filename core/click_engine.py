@@ -0,0 +1,455 @@
+import random
+import threading
+import time
+from datetime import datetime
+
+from core.click_sequence import ClickSequence, sequence_problem
+from core.input_backends import create_backend
+from core.interval_histogram import IntervalHistogram
+from core.job_scheduler import ClickJob, MultiJobScheduler
+from core.realtime import RealtimeSettings
+from core.macro import ACTION_MASK, BUTTON_NAMES, BUTTON_SHIFT, MOVE, PRESS
+from core.timing import DeadlineScheduler, sleep_until
+from core.window_tracker import WindowTracker, WindowWaiter
+
+class ClickEngine:
+    """
+    The click loop itself, independent of Qt so it can also be driven headless
+    (benchmarks, tests). settings_source is anything with 'version' and
+    'snapshot' attributes, normally the StateManager.
+
+    The engine is meant to live for the whole application: serve_forever() runs
+    on one long-lived thread with the input backend already open, and arm()/
+    disarm() start and end sessions from any thread. Every wait inside a session
+    is woken by disarm(), so clicking stops within about a millisecond instead of
+    after the current click interval. run_session() runs a single session on the
+    calling thread.
+    """
+
+    def __init__(self, settings_source, backend=None, window_tracker=None, log=print, recorder=None):
+        self.settings_source = settings_source
+        # Optional SessionRecorder that persists each session in the background
+        self.recorder = recorder
+        self.backend = backend or create_backend(settings_source.snapshot.input_backend)
+        # The backend the settings asked for; differs from backend.name after a fallback, which
+        # must not make every session rebuild the backend
+        self._requested_backend = self.backend.name if backend else settings_source.snapshot.input_backend
+        self.log = log
+        self._running = False
+        self._shutdown = False
+        self._trigger_time = None
+        self._release_time = None
+        # (Macro, repeat) to replay in the next session instead of clicking, see play_macro()
+        self._macro = None
+        self._lock = threading.Lock()
+        # Set while a session is wanted; serve_forever() sleeps on it between sessions
+        self._armed = threading.Event()
+        # Set by disarm() to cut every wait in the current session short
+        self._wake = threading.Event()
+        # Only ever written by the clicking thread. Rebinding an int attribute is atomic,
+        # so the UI samples it on a timer instead of receiving a signal per click.
+        self.click_count = 0
+        self.missed_deadlines = 0
+        self.interval_histogram = IntervalHistogram()
+        # Summary of the last finished session, see _finish_session()
+        self.last_session = None
+        # Scheduling options of the thread that runs the sessions
+        self.realtime = RealtimeSettings()
+        self.window_tracker = window_tracker or WindowTracker(None)
+        self.window_waiter = WindowWaiter(self.window_tracker)
+
+    def arm(self, trigger_time=None):
+        """
+        Starts a session on the serving thread, or keeps the current one running.
+        trigger_time is the time.perf_counter() of the input that asked for it
+        (e.g. a hotkey press) and is used to measure activation latency.
+        """
+        with self._lock:
+            if not self._running:
+                self._trigger_time = trigger_time
+                self._release_time = None
+            self._running = True
+            self._wake.clear()
+            self._armed.set()
+
+    def disarm(self, release_time=None):
+        """Ends the current session as soon as possible. release_time works like arm()'s trigger_time."""
+        with self._lock:
+            if self._running:
+                self._release_time = release_time
+            self._running = False
+            self._armed.clear()
+            self._wake.set()
+        self.window_waiter.wake()
+
+    stop = disarm
+
+    def play_macro(self, macro, repeat=1, trigger_time=None):
+        """
+        Starts a session that replays a recorded Macro repeat times (0 repeats until
+        stopped). Returns False if a session is already running.
+        """
+        with self._lock:
+            if self._running:
+                return False
+            self._macro = (macro, repeat)
+        self.arm(trigger_time)
+        return True
+
+    @property
+    def is_armed(self):
+        return self._running
+
+    def settings_changed(self):
+        """Called after the settings source publishes a new snapshot, so a window wait re-checks it at once."""
+        self.window_waiter.wake()
+
+    def shutdown(self):
+        """Ends any session and makes serve_forever() return."""
+        self._shutdown = True
+        self.disarm()
+        self._armed.set()
+
+    def serve_forever(self, on_started=None, on_stopped=None):
+        """Runs a session every time the engine is armed, until shutdown()."""
+        while True:
+            self._armed.wait()
+            if self._shutdown:
+                break
+            if on_started:
+                on_started()
+            try:
+                self._run()
+            except Exception as e:
+                # A failed session must not end the worker; it waits for the next arm like any other
+                self.log(f"Error: Clicking stopped: {e!r}")
+                with self._lock:
+                    self._running = False
+                    self._armed.clear()
+            finally:
+                with self._lock:
+                    # A re-arm that raced with the end of the session keeps the engine armed
+                    if not self._running and not self._shutdown:
+                        self._armed.clear()
+                if on_stopped:
+                    on_stopped()
+        self.backend.close()
+
+    def run_session(self):
+        """Clicks on the calling thread until stopped or the click limit is reached."""
+        self._running = True
+        self._wake.clear()
+        self._run()
+
+    def _run(self):
+        self.click_count = 0
+        self.missed_deadlines = 0
+        self.interval_histogram.reset()
+        clock = time.perf_counter
+        started_at = datetime.now()
+        self._session_started = started = clock()
+        recorder = self.recorder
+        if recorder:
+            self._session_token = recorder.begin(started_at.strftime('%Y-%m-%d %H:%M:%S'), self.settings_source.snapshot.profile)
+            self._next_checkpoint = started + recorder.checkpoint_interval
+
+        first_click = final_click = None
+        missed = 0
+        macro, self._macro = self._macro, None
+        try:
+            snapshot = self.settings_source.snapshot
+            # The backend is chosen per profile; switching only takes effect between sessions
+            if snapshot.input_backend != self._requested_backend:
+                self.backend.close()
+                self.backend = create_backend(snapshot.input_backend)
+                self._requested_backend = snapshot.input_backend
+            # Only does any work when the options have changed since the last session
+            for problem in self.realtime.apply(*snapshot.realtime):
+                self.log(f"Warning: {problem}")
+            # Always resolve the window afresh when a session starts
+            self.window_tracker.set_title(snapshot.target_window)
+            self.window_tracker.invalidate()
+
+            if macro is not None:
+                first_click, final_click, missed = self._run_macro(*macro)
+            elif snapshot.jobs:
+                first_click, final_click, missed = self._run_jobs(snapshot)
+            else:
+                first_click, final_click, missed = self._run_single(snapshot)
+        finally:
+            # Also when the session failed, so its log row is completed with what was clicked
+            self.window_waiter.close()
+            self.missed_deadlines = missed
+            if self.missed_deadlines:
+                self.log(f"Missed {self.missed_deadlines} click deadline(s) this session.")
+            self._finish_session(started_at, clock() - started, first_click, final_click)
+            if recorder:
+                recorder.finish(self._session_token, self.last_session)
+
+    def _checkpoint(self, now):
+        self._next_checkpoint = now + self.recorder.checkpoint_interval
+        self.recorder.checkpoint(self._session_token, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), now - self._session_started, self.click_count)
+
+    def _wait_for_window(self, snapshot):
+        self.log(f"Waiting for window '{snapshot.target_window}'...")
+        settings_source = self.settings_source
+        # Returns early if stopped or if the target window setting changes
+        self.window_waiter.wait(lambda: self._running and settings_source.version == snapshot.version)
+
+    def _sequence_usable(self, snapshot):
+        """In sequence mode, ends the session with an error if its points cannot be clicked."""
+        if snapshot.target_sequence is None:
+            return True
+        problem = sequence_problem(snapshot.target_sequence, snapshot.window_targeting and bool(snapshot.target_window))
+        if problem is None:
+            return True
+        self.log(f"Error: {problem}")
+        self._end_from_limit()
+        return False
+
+    def _run_single(self, snapshot):
+        """The loop for the main click settings. Returns (first_click, final_click, missed deadlines)."""
+        histogram = self.interval_histogram
+        clock = time.perf_counter
+        last_click = None
+        first_click = final_click = None
+        recorder = self.recorder
+        settings_source = self.settings_source
+        tracker = self.window_tracker
+        backend = self.backend
+        button = backend.resolve_button(snapshot.mouse_button)
+        sequence = ClickSequence(snapshot.target_sequence) if snapshot.target_sequence else None
+        # The tracker geometry the sequence positions were computed for
+        placed_geometry = None
+        scheduler = DeadlineScheduler(snapshot.period or 1.0, snapshot.overrun_policy)
+        scheduler.start()
+
+        if not self._sequence_usable(snapshot):
+            return first_click, final_click, 0
+
+        while self._running:
+            if settings_source.version != snapshot.version:
+                previous, snapshot = snapshot, settings_source.snapshot
+                if not self._sequence_usable(snapshot):
+                    break
+                if snapshot.jobs and not previous.jobs:
+                    self.log("Click jobs take effect from the next session.")
+                scheduler.set_period(snapshot.period)
+                scheduler.policy = snapshot.overrun_policy
+                tracker.set_title(snapshot.target_window)
+                button = backend.resolve_button(snapshot.mouse_button)
+                if snapshot.target_sequence != previous.target_sequence:
+                    sequence = ClickSequence(snapshot.target_sequence) if snapshot.target_sequence else None
+                    placed_geometry = None
+            if snapshot.cps <= 0:
+                self._end_from_limit()
+                break
+
+            if snapshot.window_targeting and not tracker.is_available():
+                self._wait_for_window(snapshot)
+                # Time spent waiting for the window is not a missed deadline,
+                # nor part of the click cadence
+                scheduler.start()
+                last_click = None
+                continue
+
+            if not scheduler.wait(self._wake) or not self._running:
+                break
+
+            target_pos = snapshot.target_pos
+            if sequence is not None:
+                # Window-relative points are only re-placed when the window has moved
+                if sequence.has_relative and placed_geometry != tracker.geometry_version:
+                    placed_geometry = tracker.geometry_version
+                    sequence.place(tracker.bounds if snapshot.window_targeting else None)
+                target_pos = sequence.next()
+
+            can_click = True
+            if snapshot.window_targeting:
+                # The cursor position only matters when it has to be checked against the window
+                click_pos = target_pos or backend.position()
+                can_click = tracker.contains(click_pos[0], click_pos[1])
+
+            if can_click:
+                if target_pos:
+                    backend.click_at(target_pos[0], target_pos[1], button, snapshot.click_count)
+                else:
+                    backend.click(button, snapshot.click_count)
+                now = clock()
+                if last_click is not None:
+                    histogram.record(now - last_click)
+                elif first_click is None:
+                    first_click = now
+                last_click = final_click = now
+                self.click_count += 1
+                if recorder and now >= self._next_checkpoint:
+                    self._checkpoint(now)
+
+                if snapshot.click_limit and self.click_count >= snapshot.click_limit:
+                    self._end_from_limit()
+                    break
+
+            # Randomization shifts each click within its slot instead of
+            # stretching the period, so the average rate stays at the target.
+            if snapshot.random_delay:
+                scheduler.advance((random.random() - 0.5) * scheduler.period * 0.5)
+            else:
+                scheduler.advance()
+
+        return first_click, final_click, scheduler.missed
+
+    def _run_jobs(self, snapshot):
+        """
+        The loop for multi-job sessions: every job in snapshot.jobs clicks on its own
+        grid, all from this thread. The job list is fixed for the session; window
+        targeting, jitter and the overall click limit follow the live settings.
+        """
+        histogram = self.interval_histogram
+        clock = time.perf_counter
+        first_click = final_click = None
+        recorder = self.recorder
+        settings_source = self.settings_source
+        tracker = self.window_tracker
+        backend = self.backend
+        jobs = MultiJobScheduler([ClickJob(i, spec, backend.resolve_button(spec.mouse_button), snapshot.overrun_policy)
+                                  for i, spec in enumerate(snapshot.jobs)])
+        jobs.start()
+
+        while self._running:
+            if settings_source.version != snapshot.version:
+                snapshot = settings_source.snapshot
+                tracker.set_title(snapshot.target_window)
+            if not jobs:
+                # Every job reached its own limit
+                self._end_from_limit()
+                break
+
+            if snapshot.window_targeting and not tracker.is_available():
+                self._wait_for_window(snapshot)
+                jobs.start()
+                continue
+
+            job = jobs.wait(self._wake)
+            if job is None or not self._running:
+                break
+
+            pos = job.pos
+            can_click = True
+            if snapshot.window_targeting:
+                click_pos = pos or backend.position()
+                can_click = tracker.contains(click_pos[0], click_pos[1])
+
+            if can_click:
+                if pos:
+                    backend.click_at(pos[0], pos[1], job.button, job.click_count)
+                else:
+                    backend.click(job.button, job.click_count)
+                now = clock()
+                # Intervals are measured per job, so the histogram shows each job's cadence
+                if job.last_click is not None:
+                    histogram.record(now - job.last_click)
+                if first_click is None:
+                    first_click = now
+                job.last_click = final_click = now
+                job.clicks += 1
+                self.click_count += 1
+                if recorder and now >= self._next_checkpoint:
+                    self._checkpoint(now)
+
+                if snapshot.click_limit and self.click_count >= snapshot.click_limit:
+                    self._end_from_limit()
+                    break
+
+            if snapshot.random_delay:
+                jobs.reschedule(job, (random.random() - 0.5) * job.scheduler.period * 0.5)
+            else:
+                jobs.reschedule(job)
+
+        return first_click, final_click, jobs.missed
+
+    def _run_macro(self, macro, repeat):
+        """
+        Replays a macro on absolute deadlines, like the click loop, so timing errors
+        never accumulate over a long recording. Events are read straight from the
+        macro's columns. Any button still held when the replay stops is released.
+        """
+        histogram = self.interval_histogram
+        clock = time.perf_counter
+        recorder = self.recorder
+        backend = self.backend
+        wake = self._wake
+        buttons = {code: backend.resolve_button(name) for code, name in BUTTON_NAMES.items()}
+        held = set()
+        last_press = first_click = final_click = None
+        plays = 0
+        if not len(macro):
+            self._end_from_limit()
+            return None, None, 0
+        deadline = clock()
+
+        while self._running and (not repeat or plays < repeat):
+            for delta, x, y, code in zip(macro.deltas, macro.xs, macro.ys, macro.codes):
+                deadline += delta * 1e-6
+                if not sleep_until(deadline, wake) or not self._running:
+                    break
+                backend.move(x, y)
+                action = code & ACTION_MASK
+                if action == MOVE:
+                    continue
+                button = buttons[code >> BUTTON_SHIFT]
+                if action != PRESS:
+                    backend.release(button)
+                    held.discard(button)
+                    continue
+                backend.press(button)
+                held.add(button)
+                now = clock()
+                if last_press is not None:
+                    histogram.record(now - last_press)
+                else:
+                    first_click = now
+                last_press = final_click = now
+                self.click_count += 1
+                if recorder and now >= self._next_checkpoint:
+                    self._checkpoint(now)
+            else:
+                plays += 1
+                continue
+            break
+        else:
+            if self._running:
+                self._end_from_limit()
+
+        for button in held:
+            backend.release(button)
+        return first_click, final_click, 0
+
+    def _finish_session(self, started_at, duration, first_click, final_click):
+        histogram = self.interval_histogram
+        # Press-to-first-click, and release-to-last-click (negative when nothing was clicked after the release)
+        activation_latency = release_latency = None
+        if self._trigger_time is not None and first_click is not None:
+            activation_latency = (first_click - self._trigger_time) * 1000.0
+        if self._release_time is not None and final_click is not None:
+            release_latency = (final_click - self._release_time) * 1000.0
+        self.last_session = {
+            'start_time': started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'end_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'duration': duration,
+            'clicks': self.click_count,
+            'missed_deadlines': self.missed_deadlines,
+            'interval_stats': histogram.summary_ms(),
+            'interval_histogram': histogram.to_json() if histogram.count else None,
+            'activation_latency_ms': activation_latency,
+            'release_latency_ms': release_latency,
+        }
+        if activation_latency is not None:
+            self.log(f"Hotkey to first click: {activation_latency:.2f} ms")
+        if release_latency is not None:
+            self.log(f"Release to last click: {release_latency:.2f} ms")
+
+    def _end_from_limit(self):
+        # The session ended by itself, so it should not restart until armed again
+        with self._lock:
+            self._running = False
+            self._armed.clear()
@@ -0,0 +1,51 @@
+def sequence_points_from_settings(points):
+    """Converts the 'click_sequence' setting (a list of dicts) to a tuple of (x, y, relative) points."""
+    return tuple((point['x'], point['y'], bool(point.get('relative', False))) for point in points or ())
+
+
+def sequence_problem(points, has_window):
+    """
+    Why a sequence-mode session cannot click these (x, y, relative) points, or
+    None. Relative points need a target window to be placed against.
+    """
+    if not points:
+        return "The click sequence is empty; add points on the Targeting page."
+    if not has_window and any(relative for x, y, relative in points):
+        return "The click sequence has window-relative points, but no target window is set."
+    return None
+
+
+class ClickSequence:
+    """
+    An ordered list of click points that the engine cycles through, one point per
+    click. Points can be absolute screen coordinates or relative to the target
+    window's top-left corner. Absolute positions are computed by place() only when
+    the window moves, so taking the next point is just an index step.
+    """
+    __slots__ = ('points', 'positions', 'has_relative', '_index')
+
+    def __init__(self, points):
+        self.points = tuple(points)
+        self.has_relative = any(relative for x, y, relative in self.points)
+        self.positions = ()
+        self._index = 0
+        self.place(None)
+
+    def __len__(self):
+        return len(self.points)
+
+    def place(self, bounds):
+        """Recomputes the screen positions for a window at bounds (left, top, right, bottom), or none."""
+        left, top = (bounds[0], bounds[1]) if bounds else (0, 0)
+        self.positions = tuple((x + left, y + top) if relative else (x, y) for x, y, relative in self.points)
+
+    def next(self):
+        """Returns the next (x, y) screen position, wrapping around at the end."""
+        index = self._index
+        position = self.positions[index]
+        index += 1
+        self._index = 0 if index == len(self.positions) else index
+        return position
+
+    def reset(self):
+        self._index = 0
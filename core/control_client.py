@@ -0,0 +1,126 @@
+import argparse
+import json
+import sys
+
+from core.control_server import default_socket_path, open_connection
+
+
+class ControlError(Exception):
+    """The running clicker rejected a request, or could not be reached."""
+
+
+class ControlClient:
+    """
+    Talks to a running clicker's ControlServer. The connection is opened on
+    first use and kept, so each request costs one round trip on the socket.
+    """
+
+    def __init__(self, path=None, timeout=2.0):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._socket = None
+        self._lines = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def connect(self):
+        if self._socket is None:
+            try:
+                sock = open_connection(self.path, self.timeout)
+            except OSError as e:
+                raise ControlError(f"No clicker is listening on {self.path} ({e.strerror or e}).") from e
+            self._socket = sock
+            self._lines = sock.makefile('rb')
+
+    def close(self):
+        if self._socket is not None:
+            self._lines.close()
+            self._socket.close()
+            self._socket = None
+            self._lines = None
+
+    def request(self, cmd, **arguments):
+        """Sends one request and returns its result, raising ControlError if it failed."""
+        self.connect()
+        try:
+            self._socket.sendall(json.dumps(dict(arguments, cmd=cmd), separators=(',', ':')).encode() + b"\n")
+            line = self._lines.readline()
+        except OSError as e:
+            self.close()
+            raise ControlError(f"Lost the connection to the clicker: {e}") from e
+        if not line:
+            self.close()
+            raise ControlError("The clicker closed the connection.")
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise ControlError(response.get('error', "Request failed."))
+        return response.get('result')
+
+    def ping(self):
+        return self.request('ping')
+
+    def start(self):
+        return self.request('start')
+
+    def stop(self):
+        return self.request('stop')
+
+    def status(self):
+        return self.request('status')
+
+    def get(self, key=None):
+        return self.request('get', key=key) if key is not None else self.request('get')
+
+    def set(self, key, value):
+        return self.request('set', key=key, value=value)
+
+    def load_profile(self, name):
+        return self.request('load_profile', name=name)
+
+    def list_profiles(self):
+        return self.request('list_profiles')
+
+
+def _parse_value(text):
+    # "20", "true" and "null" become JSON values; anything else is taken as a string
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Control a running autoclicker.")
+    parser.add_argument('--socket', help="Path of the control socket.")
+    commands = parser.add_subparsers(dest='cmd', required=True)
+    for name, help_text in (('ping', "Check that the clicker is running."), ('start', "Start clicking."),
+                            ('stop', "Stop clicking."), ('status', "Show the live counters."),
+                            ('list-profiles', "List the saved profiles.")):
+        commands.add_parser(name, help=help_text)
+    get_parser = commands.add_parser('get', help="Show all settings, or one.")
+    get_parser.add_argument('key', nargs='?')
+    set_parser = commands.add_parser('set', help="Change one setting; the value is parsed as JSON when possible.")
+    set_parser.add_argument('key')
+    set_parser.add_argument('value', type=_parse_value)
+    profile_parser = commands.add_parser('load-profile', help="Load a saved profile by name.")
+    profile_parser.add_argument('name')
+    args = parser.parse_args(argv)
+
+    arguments = {name: getattr(args, name) for name in ('key', 'value', 'name') if hasattr(args, name)}
+    try:
+        with ControlClient(args.socket) as client:
+            result = client.request(args.cmd.replace('-', '_'), **arguments)
+    except ControlError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if result is not None:
+        print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+import contextlib
+import hmac
+import json
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+SOCKET_NAME = "smite-autoclicker.sock"
+# Without Unix domain sockets (Windows), the server listens on a loopback TCP port instead
+# and the socket path holds a small file with that port and a per-run token
+HAS_UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+LOOPBACK = '127.0.0.1'
+
+
+def default_socket_path():
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    # The temp directory is shared between users, so keep one socket per user
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(tempfile.gettempdir(), f"smite-autoclicker-{uid}.sock")
+
+
+def _read_address(path):
+    """(port, token) from the address file of a loopback TCP server."""
+    with open(path, 'r') as f:
+        text = f.read()
+    try:
+        address = json.loads(text)
+        return int(address['port']), str(address['token'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise OSError(f"unreadable address file ({e})") from e
+
+
+def open_connection(path, timeout=None):
+    """Connects to the control server at path and returns the socket. Raises OSError."""
+    if HAS_UNIX_SOCKETS:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    port, token = _read_address(path)
+    sock = socket.create_connection((LOOPBACK, port), timeout)
+    try:
+        # The port is reachable by every local user; the token, readable only by ours, proves the caller
+        sock.sendall(json.dumps({'token': token}).encode() + b"\n")
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def is_listening(path):
+    """True if something accepts connections on the socket at path."""
+    try:
+        open_connection(path, timeout=1.0).close()
+        return True
+    except OSError:
+        return False
+
+
+@contextlib.contextmanager
+def _startup_lock(path):
+    """
+    Held while checking for, removing and re-creating the socket at path, so two
+    instances starting together cannot each remove the other's socket. The lock
+    file is left in place; deleting it would reopen the race.
+    """
+    try:
+        lock_file = open(path + ".lock", 'a+b')
+    except OSError:
+        yield
+        return
+    try:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        elif msvcrt:
+            lock_file.seek(0)
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            except OSError:
+                pass
+        lock_file.close()
+
+
+def _argument(request, name):
+    if name not in request:
+        raise ValueError(f"'{request['cmd']}' needs a '{name}' argument.")
+    return request[name]
+
+
+class _Call:
+    __slots__ = ('fn', 'result', 'error')
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.result = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.result = self.fn()
+        except Exception as e:
+            self.error = e
+
+
+def qt_invoker():
+    """
+    Returns an invoke function that runs a callable on the Qt thread this is
+    called from and waits for its result. Settings and profiles must only be
+    changed on the GUI thread, since changing them updates widgets.
+    """
+    from PyQt6.QtCore import QObject, Qt, pyqtSignal, pyqtSlot
+
+    class Invoker(QObject):
+        requested = pyqtSignal(object)
+
+        @pyqtSlot(object)
+        def run(self, call):
+            call.run()
+
+    invoker = Invoker()
+    invoker.requested.connect(invoker.run, Qt.ConnectionType.BlockingQueuedConnection)
+
+    def invoke(fn):
+        call = _Call(fn)
+        invoker.requested.emit(call)
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    invoke.invoker = invoker
+    return invoke
+
+
+class ControlServer:
+    """
+    A local control API on a Unix domain socket (a loopback TCP port with a
+    token where there are none), so scripts can drive the clicker without
+    synthetic key presses. Each request is one line of JSON,
+    {"cmd": "start"} or {"cmd": "set", "key": "cps", "value": 20}, answered by
+    one line {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+    A connection can send any number of requests.
+
+    start and stop arm the engine straight from the connection's thread, like
+    direct hotkey arming; everything that touches settings or the database goes
+    through invoke(), which runs it on the thread that owns them.
+    """
+
+    def __init__(self, state_manager, db_manager, engine, path=None, invoke=None, log=print, on_activate=None):
+        self.state_manager = state_manager
+        self.db_manager = db_manager
+        # Anything with arm/disarm/is_armed/click_count/missed_deadlines, e.g. the AutoClickerThread
+        self.engine = engine
+        self.path = path or default_socket_path()
+        self.invoke = invoke or (lambda fn: fn())
+        self.log = log
+        # Called on the GUI thread when another launch of the application is forwarded here
+        self.on_activate = on_activate
+        self._socket = None
+        # Set when listening on TCP; the first line of each connection must carry it
+        self._token = None
+        self._commands = {
+            'ping': self._ping,
+            'activate': self._activate,
+            'start': self._start,
+            'stop': self._stop,
+            'status': self._status,
+            'get': self._get,
+            'set': self._set,
+            'load_profile': self._load_profile,
+            'list_profiles': self._list_profiles,
+        }
+
+    @property
+    def listening(self):
+        return self._socket is not None
+
+    def add_command(self, name, handler):
+        """Registers handler(request, received) for requests with this 'cmd'; received is the arrival time."""
+        self._commands[name] = handler
+
+    def start(self):
+        """Starts listening. Returns False, after logging why, if the socket cannot be used."""
+        with _startup_lock(self.path):
+            if os.path.exists(self.path):
+                if is_listening(self.path):
+                    self.log(f"Warning: Another instance is already listening on {self.path}; the control API is disabled.")
+                    return False
+                # Left behind by an instance that did not shut down cleanly
+                try:
+                    os.unlink(self.path)
+                except OSError:
+                    pass
+            try:
+                server = self._listen()
+            except OSError as e:
+                self.log(f"Warning: Could not open the control socket {self.path}: {e.strerror or e}")
+                return False
+        self._socket = server
+        threading.Thread(target=self._accept_loop, args=(server,), name="ControlServer", daemon=True).start()
+        return True
+
+    def _listen(self):
+        if HAS_UNIX_SOCKETS:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            # Created owner-only: a chmod after bind() would leave a moment in which other users can connect
+            old_umask = os.umask(0o077)
+            try:
+                server.bind(self.path)
+                server.listen(8)
+            except OSError:
+                server.close()
+                raise
+            finally:
+                os.umask(old_umask)
+            return server
+        server = socket.create_server((LOOPBACK, 0), backlog=8)
+        token = secrets.token_hex(16)
+        try:
+            # Written whole and then renamed into place, so a client never reads half an address
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or None)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'port': server.getsockname()[1], 'token': token, 'pid': os.getpid()}, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            server.close()
+            raise
+        self._token = token
+        return server
+
+    def stop(self):
+        server, self._socket = self._socket, None
+        if server is None:
+            return
+        try:
+            # Wakes the accept() call; close() alone does not on every platform
+            server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _accept_loop(self, server):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_connection, args=(conn,), name="ControlConnection", daemon=True).start()
+
+    def _serve_connection(self, conn):
+        with conn, conn.makefile('rb') as lines:
+            if self._token is not None and not self._authenticate(lines.readline()):
+                return
+            for line in lines:
+                if not line.strip():
+                    continue
+                response = self.handle_line(line)
+                try:
+                    conn.sendall(json.dumps(response, separators=(',', ':')).encode() + b"\n")
+                except OSError:
+                    return
+
+    def _authenticate(self, line):
+        try:
+            token = json.loads(line).get('token')
+        except (ValueError, AttributeError):
+            return False
+        return isinstance(token, str) and hmac.compare_digest(token, self._token)
+
+    def handle_line(self, line):
+        """Parses and executes one request line and returns the response dict."""
+        received = time.perf_counter()
+        try:
+            request = json.loads(line)
+            handler = self._commands.get(request.get('cmd')) if isinstance(request, dict) else None
+            if handler is None:
+                raise ValueError(f"Unknown command {request.get('cmd')!r}." if isinstance(request, dict) else "A request must be a JSON object.")
+            return {'ok': True, 'result': handler(request, received)}
+        except KeyError as e:
+            return {'ok': False, 'error': e.args[0] if e.args else "Missing key."}
+        except (ValueError, TypeError) as e:
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            print(f"Error handling control request: {e}")
+            return {'ok': False, 'error': f"Internal error: {e}"}
+
+    # --- Commands. Each takes the request and its arrival time and returns a JSON-compatible result. ---
+    def _ping(self, request, received):
+        return {'pid': os.getpid()}
+
+    def _activate(self, request, received):
+        if self.on_activate:
+            self.invoke(self.on_activate)
+        return None
+
+    def _start(self, request, received):
+        self.engine.arm(received)
+        return self._status(request, received)
+
+    def _stop(self, request, received):
+        self.engine.disarm(received)
+        return self._status(request, received)
+
+    def _status(self, request, received):
+        engine = self.engine
+        return {
+            'armed': engine.is_armed,
+            'clicks': engine.click_count,
+            'missed_deadlines': engine.missed_deadlines,
+            'achieved_rate': getattr(engine, 'achieved_rate', None),
+        }
+
+    def _get(self, request, received):
+        settings = self.invoke(self.state_manager.get_settings)
+        key = request.get('key')
+        if key is None:
+            return settings
+        if key not in settings:
+            raise KeyError(f"Setting '{key}' is not a valid setting.")
+        return settings[key]
+
+    def _set(self, request, received):
+        key, value = _argument(request, 'key'), _argument(request, 'value')
+        self.invoke(lambda: self.state_manager.update_setting(key, value))
+        return None
+
+    def _load_profile(self, request, received):
+        name = _argument(request, 'name')
+        settings = self.invoke(lambda: self.db_manager.get_profile_by_name(name))
+        if settings is None:
+            raise ValueError(f"No profile named '{name}'.")
+        self.invoke(lambda: self.state_manager.load_profile(settings, name))
+        return None
+
+    def _list_profiles(self, request, received):
+        return [name for profile_id, name in self.invoke(self.db_manager.get_all_profiles)]
@@ -1,17 +1,29 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
+import time
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, Qt
 from pynput import keyboard
 
+from core.hotkey_matcher import HotkeyMatcher, START, TOGGLE
+
 class HotkeyListener(QObject):
-    start_hotkey_triggered = pyqtSignal()
-    stop_hotkey_triggered = pyqtSignal()
+    # Carry the time.perf_counter() of the key event, for latency measurement
+    start_hotkey_triggered = pyqtSignal(float)
+    stop_hotkey_triggered = pyqtSignal(float)
 
     def __init__(self, state_manager):
         super().__init__()
         self.state_manager = state_manager
+        # When set and 'direct_hotkey_arm' is on, hotkeys arm the engine (anything with
+        # arm/disarm, e.g. the AutoClickerThread) from the listener thread; the GUI
+        # learns about it afterwards from the engine's own signals.
+        self.engine = None
         self.listener = None
         self.listener_thread = None
-        # --- NEW: Internal state for Hold mode ---
-        self.hold_mode_active = False
+        # The hook callbacks run for every key on the system, so all the
+        # per-settings work is done up front whenever the settings change.
+        self.matcher = HotkeyMatcher()
+        self.matcher.rebuild(state_manager.get_settings())
+        # Direct, because this object lives on a thread that never runs a Qt event loop
+        self.state_manager.settings_updated.connect(self._rebuild_matcher, Qt.ConnectionType.DirectConnection)
 
     def start(self):
         if self.listener is None:
@@ -25,59 +37,40 @@ class HotkeyListener(QObject):
         with keyboard.Listener(on_press=self.on_press, on_release=self.on_release) as self.listener:
             self.listener.join()
 
-    def _key_to_str(self, key):
-        """Helper method to convert a key event to a string."""
-        if hasattr(key, 'name'):
-            # This handles special keys like F6, Ctrl, etc.
-            return f"Key.{key.name}"
-        elif hasattr(key, 'char'):
-            # This handles normal character keys
-            return key.char
-        return None
+    def _rebuild_matcher(self):
+        self.matcher.rebuild(self.state_manager.get_settings())
+
+    def set_engine(self, engine):
+        self.engine = engine
+
+    def _dispatch(self, action, timestamp):
+        if action == TOGGLE:
+            action = STOP if self.engine is not None and self.engine.is_armed else START
+        if self.engine is not None and self.matcher.direct_arm:
+            if action == START:
+                self.engine.arm(timestamp)
+            else:
+                self.engine.disarm(timestamp)
+        elif action == START:
+            self.start_hotkey_triggered.emit(timestamp)
+        else:
+            self.stop_hotkey_triggered.emit(timestamp)
 
     def on_press(self, key):
-        settings = self.state_manager.get_settings()
-        hotkey_mode = settings.get('hotkey_mode', 'Toggle')
-        start_hotkey_str = settings.get('start_hotkey', 'Key.f6')
-        
+        timestamp = time.perf_counter()
         try:
-            key_str = self._key_to_str(key)
-            if not key_str: return
-
-            if hotkey_mode == 'Toggle':
-                stop_hotkey_str = settings.get('stop_hotkey', 'Key.f7')
-                if key_str == start_hotkey_str:
-                    self.start_hotkey_triggered.emit()
-                elif key_str == stop_hotkey_str:
-                    self.stop_hotkey_triggered.emit()
-            
-            elif hotkey_mode == 'Hold':
-                # Start clicking only if it's the start key and not already active
-                if key_str == start_hotkey_str and not self.hold_mode_active:
-                    self.hold_mode_active = True
-                    self.start_hotkey_triggered.emit()
-        
+            action = self.matcher.press(key, timestamp)
+            if action is not None:
+                self._dispatch(action, timestamp)
         except Exception as e:
             print(f"Error processing hotkey press: {e}")
 
     def on_release(self, key):
-        settings = self.state_manager.get_settings()
-        hotkey_mode = settings.get('hotkey_mode', 'Toggle')
-        start_hotkey_str = settings.get('start_hotkey', 'Key.f6')
-
-        # Release events only matter in Hold mode
-        if hotkey_mode != 'Hold':
-            return
-            
+        timestamp = time.perf_counter()
         try:
-            key_str = self._key_to_str(key)
-            if not key_str: return
-            
-            # Stop clicking if the start key is released and it was active
-            if key_str == start_hotkey_str and self.hold_mode_active:
-                self.hold_mode_active = False
-                self.stop_hotkey_triggered.emit()
-
+            action = self.matcher.release(key)
+            if action is not None:
+                self._dispatch(action, timestamp)
         except Exception as e:
             print(f"Error processing hotkey release: {e}")
 
@@ -86,4 +79,4 @@ class HotkeyListener(QObject):
             self.listener.stop()
         if self.listener_thread:
             self.listener_thread.quit()
-            self.listener_thread.wait()
\ No newline at end of file
+            self.listener_thread.wait()
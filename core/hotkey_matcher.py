@@ -0,0 +1,249 @@
+import functools
+
+# Actions produced by the matcher
+START = 'start'
+STOP = 'stop'
+# Start and stop share one hotkey in Toggle mode
+TOGGLE = 'toggle'
+
+# Hotkey strings: keys in a chord are joined with '+', steps of a sequence with ','.
+# e.g. 'Key.f6', 'Key.ctrl+Key.shift+Key.f6', 'Key.ctrl+k,c'
+CHORD_SEPARATOR = '+'
+STEP_SEPARATOR = ','
+# The separators themselves are written by name, e.g. 'Key.ctrl+plus'
+CHAR_NAMES = {CHORD_SEPARATOR: 'plus', STEP_SEPARATOR: 'comma'}
+NAMED_CHARS = {name: char for char, name in CHAR_NAMES.items()}
+# How long a partially typed sequence waits for its next step
+SEQUENCE_TIMEOUT = 1.0
+
+CTRL, SHIFT, ALT, CMD = 1, 2, 4, 8
+# Any of these turns a character key into a shortcut, whose character may be
+# reported as a control code or in either case depending on the platform
+SHORTCUT_MODIFIERS = CTRL | ALT | CMD
+
+def default_keys():
+    """The pynput Key enum. Imported on first use: pynput needs a display on some platforms."""
+    from pynput import keyboard
+    return keyboard.Key
+
+@functools.lru_cache(maxsize=None)
+def _modifier_keys(keys):
+    """For a Key enum, maps left/right variants onto one key, and each modifier onto its mask bit."""
+    groups = ((CTRL, ('ctrl', 'ctrl_l', 'ctrl_r')), (SHIFT, ('shift', 'shift_l', 'shift_r')),
+              (ALT, ('alt', 'alt_l', 'alt_r', 'alt_gr')), (CMD, ('cmd', 'cmd_l', 'cmd_r')))
+    canonical, bits = {}, {}
+    for bit, names in groups:
+        main = getattr(keys, names[0])
+        for name in names:
+            key = getattr(keys, name, None)
+            if key is not None:
+                canonical[key] = main
+                bits[key] = bit
+    return canonical, bits
+
+
+def _char_token(char, mask):
+    """Normalizes a character key so that the same shortcut matches on every platform."""
+    if mask & SHORTCUT_MODIFIERS:
+        if len(char) == 1 and ord(char) < 32:
+            # Ctrl+letter reported as a control code
+            char = chr(ord(char) + 96)
+        return char.lower(), mask
+    # Plain characters already carry Shift in their case or symbol
+    return char, mask & ~SHIFT
+
+
+def parse_chord(chord_str, keys=None):
+    """Converts one chord such as 'Key.ctrl+Key.shift+Key.f6' to a (mask, token) lookup entry."""
+    keys = keys or default_keys()
+    canonical, bits = _modifier_keys(keys)
+    mask, trigger, last_modifier = 0, None, None
+    for part in chord_str.split(CHORD_SEPARATOR):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.startswith('Key.'):
+            trigger = NAMED_CHARS.get(part, part)
+            continue
+        key = getattr(keys, part[4:], None)
+        if key is None:
+            return None
+        key = canonical.get(key, key)
+        if key in bits:
+            mask |= bits[key]
+            last_modifier = key
+        else:
+            trigger = key
+    if trigger is None:
+        if last_modifier is None:
+            return None
+        # A chord of modifiers only fires on its last one, matched before that bit is set
+        return mask & ~bits[last_modifier], last_modifier
+    if isinstance(trigger, str):
+        token, mask = _char_token(trigger, mask)
+        return mask, token
+    return mask, trigger
+
+
+def parse_hotkey(hotkey_str, keys=None):
+    """Converts a stored hotkey string to a list of (mask, token) steps, or None if invalid."""
+    if not hotkey_str:
+        return None
+    steps = [parse_chord(step, keys) for step in hotkey_str.split(STEP_SEPARATOR)]
+    if not steps or any(step is None for step in steps):
+        return None
+    return steps
+
+
+def migrate_hotkey(hotkey_str):
+    """Older versions stored a single character as is; a bare '+' or ',' is now written by name."""
+    return CHAR_NAMES.get(hotkey_str, hotkey_str)
+
+
+class _Node:
+    __slots__ = ('press_action', 'release_action', 'children')
+
+    def __init__(self):
+        self.press_action = None
+        self.release_action = None
+        self.children = {}
+
+
+class HotkeyMatcher:
+    """
+    An incremental state machine over a trie of hotkey bindings. Each binding is
+    a sequence of chords; a chord is a modifier mask plus one trigger key. The
+    currently held modifiers are tracked as a bit mask, so every key event costs
+    one or two dictionary lookups however many bindings exist.
+
+    keys is the Key enum of the events fed in, pynput's by default.
+
+    The trie is rebuilt only when the settings change. Held keys are remembered
+    so that OS autorepeat presses are ignored; they, and the actions due on
+    their release, survive a rebuild, so a Hold-mode key pressed before a
+    settings change still stops clicking when it is let go.
+    """
+
+    def __init__(self, keys=None):
+        self.keys = keys or default_keys()
+        self._canonical, self._bits = _modifier_keys(self.keys)
+        self.root = {}
+        self.direct_arm = False
+        self._modifier_triggers = frozenset()
+        self._mask = 0
+        self._down = set()
+        # Held trigger key -> action to run when it is released (Hold mode)
+        self._held = {}
+        self._reset_state()
+
+    def _reset_state(self):
+        self._state = self.root
+        self._state_deadline = 0.0
+
+    def rebuild(self, settings):
+        bindings = []
+        start = parse_hotkey(settings.get('start_hotkey', 'Key.f6'), self.keys)
+        if settings.get('hotkey_mode', 'Toggle') == 'Hold':
+            if start:
+                bindings.append((start, START, STOP))
+        else:
+            stop = parse_hotkey(settings.get('stop_hotkey', 'Key.f7'), self.keys)
+            if start and start == stop:
+                bindings.append((start, TOGGLE, None))
+            elif start:
+                bindings.append((start, START, None))
+                if stop:
+                    bindings.append((stop, STOP, None))
+
+        root = {}
+        modifier_triggers = set()
+        for steps, press_action, release_action in bindings:
+            children = root
+            for step in steps:
+                node = children.get(step)
+                if node is None:
+                    node = children[step] = _Node()
+                if step[1] in self._bits:
+                    modifier_triggers.add(step[1])
+                children = node.children
+            node.press_action = press_action
+            node.release_action = release_action
+        # Swap the trie in whole; the hook thread may be reading the old one
+        self.root = root
+        self._modifier_triggers = frozenset(modifier_triggers)
+        self.direct_arm = settings.get('direct_hotkey_arm', False)
+        self._reset_state()
+
+    def _step(self, entry, now):
+        """Advances the sequence state with one chord. Returns the matched node or None."""
+        state = self._state
+        if state is not self.root and now > self._state_deadline:
+            state = self._state = self.root
+        node = state.get(entry)
+        if node is None and state is not self.root:
+            # The sequence broke off; the key may start a new one
+            node = self.root.get(entry)
+        if node is None or not node.children:
+            self._state = self.root
+        else:
+            self._state = node.children
+            self._state_deadline = now + SEQUENCE_TIMEOUT
+        return node
+
+    def press(self, key, now=0.0):
+        """Returns the action bound to this key press, or None. now is a time in seconds."""
+        key = self._canonical.get(key, key)
+        bit = self._bits.get(key)
+        if bit is not None:
+            mask = self._mask
+            if mask & bit:
+                return None
+            self._mask = mask | bit
+            if key not in self._modifier_triggers:
+                return None
+            entry, held_id = (mask, key), key
+        elif key.__class__ is self.keys:
+            entry, held_id = (self._mask, key), key
+        else:
+            char = getattr(key, 'char', None)
+            if char is None:
+                return None
+            token, mask = _char_token(char, self._mask)
+            entry, held_id = (mask, token), token.lower()
+
+        if held_id in self._down:
+            # Autorepeat while the key is held
+            return None
+        self._down.add(held_id)
+        node = self._step(entry, now)
+        if node is None:
+            return None
+        if node.release_action is not None:
+            self._held[held_id] = node.release_action
+        return node.press_action
+
+    def release(self, key):
+        """Returns the action bound to this key release, or None."""
+        key = self._canonical.get(key, key)
+        bit = self._bits.get(key)
+        if bit is not None:
+            self._mask &= ~bit
+            held_id = key
+        elif key.__class__ is self.keys:
+            held_id = key
+        else:
+            char = getattr(key, 'char', None)
+            if char is None:
+                return None
+            held_id = _char_token(char, self._mask)[0].lower()
+        self._down.discard(held_id)
+        return self._held.pop(held_id, None)
+
+
+def hotkeys_conflict(first, second):
+    """True if two hotkey strings match the same keys, or one is the start of the other's sequence."""
+    first, second = parse_hotkey(first), parse_hotkey(second)
+    if not first or not second:
+        return False
+    shorter = min(len(first), len(second))
+    return first[:shorter] == second[:shorter]
@@ -1,28 +1,190 @@
+import hashlib
+import json
 import os
-from PyQt6.QtGui import QIcon, QPixmap, QPainter
+import struct
+import sys
+import tempfile
+import threading
+from PyQt6.QtGui import QIcon, QPixmap, QPainter, QImage, QGuiApplication
 from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtCore import QSize, Qt
 
+# On-disk cache of rendered icons: a header with the cache's generation (bumped on every
+# write), then per entry a JSON variant descriptor, the key it was rendered under, the
+# generation it was last used in and the raw premultiplied ARGB32 pixels
+_HEADER = struct.Struct('<4sBII')
+_ENTRY = struct.Struct('<H20sHHII')
+_MAGIC = b'ICN2'
+_LITTLE_ENDIAN = 1 if sys.byteorder == 'little' else 0
+CACHE_FILE_NAME = "icons.bin"
+# Entries not used in this many writes of the cache (e.g. an old color or display scale) are dropped
+MAX_IDLE_GENERATIONS = 10
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or (os.environ.get('LOCALAPPDATA') if sys.platform == 'win32' else None)
+    return os.path.join(base or os.path.join(os.path.expanduser('~'), '.cache'), 'smite-autoclicker')
+
 class IconManager:
+    """
+    Renders the recolored SVG icons and keeps them across launches. Every
+    variant (category, name, color, width, height, device pixel ratio) is
+    rendered once to a QImage, which is safe off the GUI thread. All images
+    are stored in one cache file that is read in a single pass at startup.
+    Each entry's key is a hash of the SVG content and the variant. An entry
+    whose SVG has changed no longer matches its key and is dropped on load,
+    and one that has gone unused for MAX_IDLE_GENERATIONS writes is dropped on
+    save. prewarm() renders missing variants on a single worker thread.
+    """
     _instance = None
     def __new__(cls, *args, **kwargs):
-        if not cls._instance: cls._instance = super(IconManager, cls).__new__(cls, *args, **kwargs)
+        if not cls._instance: cls._instance = super(IconManager, cls).__new__(cls)
         return cls._instance
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         if not hasattr(self, '_initialized'):
             self.base_path = os.path.join(os.path.dirname(__file__), '..', 'resources', 'icons'); self.icon_cache = {}; self._initialized = True
-    def get_icon(self, category, name, color="#FFFFFF", size=QSize(22, 22)):
-        cache_key = f"{category}_{name}_{color}_{size.width()}x{size.height()}"
-        if cache_key in self.icon_cache: return self.icon_cache[cache_key]
+            self.cache_path = os.path.join(cache_dir or default_cache_dir(), CACHE_FILE_NAME)
+            self._lock = threading.Lock()
+            self._images = {}; self._svg_data = {}; self._dirty = False; self._device_pixel_ratio = None
+            # Variant -> generation it was last used in; this launch writes generation self._generation
+            self._last_used = {}; self._generation = 1
+            self._save_lock = threading.Lock()
+            self._prewarm_thread = None; self._prewarm_pending = []
+            self.load_cache()
+
+    @property
+    def device_pixel_ratio(self):
+        if self._device_pixel_ratio is None:
+            screen = QGuiApplication.primaryScreen()
+            self._device_pixel_ratio = round(screen.devicePixelRatio(), 2) if screen else 1.0
+        return self._device_pixel_ratio
+
+    def _read_svg(self, category, name):
+        """The SVG's bytes, read once per launch; None if the file does not exist."""
         file_path = os.path.join(self.base_path, category, f"{name}.svg")
-        if not os.path.exists(file_path): print(f"Warning: Icon not found at {file_path}"); return QIcon()
-        with open(file_path, 'r') as f: svg_data = f.read()
-        colored_svg_data = svg_data.replace('currentColor', color)
-        renderer = QSvgRenderer(colored_svg_data.encode('utf-8'))
-        pixmap = QPixmap(size); pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(pixmap)
+        with self._lock:
+            if file_path in self._svg_data: return self._svg_data[file_path]
+        try:
+            with open(file_path, 'rb') as f: svg_data = f.read()
+        except FileNotFoundError:
+            svg_data = None
+        with self._lock: return self._svg_data.setdefault(file_path, svg_data)
+
+    def _variant_key(self, variant):
+        svg_data = self._read_svg(variant[0], variant[1])
+        if svg_data is None: return None
+        return hashlib.sha1(svg_data + json.dumps(variant[2:]).encode()).digest()
+
+    def _render(self, variant):
+        category, name, color, width, height, ratio = variant
+        svg_data = self._read_svg(category, name)
+        if svg_data is None: return None
+        renderer = QSvgRenderer(svg_data.replace(b'currentColor', color.encode()))
+        image = QImage(round(width * ratio), round(height * ratio), QImage.Format.Format_ARGB32_Premultiplied); image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
         # --- THE FIX ---
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         renderer.render(painter); painter.end()
-        icon = QIcon(pixmap); self.icon_cache[cache_key] = icon
-        return icon
\ No newline at end of file
+        image.setDevicePixelRatio(ratio)
+        return image
+
+    def _image(self, variant):
+        with self._lock:
+            image = self._images.get(variant)
+            if image is not None: self._mark_used(variant)
+        if image is None:
+            image = self._render(variant)
+            if image is not None:
+                with self._lock: self._images[variant] = image; self._last_used[variant] = self._generation; self._dirty = True
+        return image
+
+    def _mark_used(self, variant):
+        # Only rewrite the cache for usage once an entry is halfway to being dropped
+        if self._generation - self._last_used.get(variant, 0) >= MAX_IDLE_GENERATIONS // 2: self._dirty = True
+        self._last_used[variant] = self._generation
+
+    def get_icon(self, category, name, color="#FFFFFF", size=QSize(22, 22)):
+        variant = (category, name, color, size.width(), size.height(), self.device_pixel_ratio)
+        if variant in self.icon_cache: return self.icon_cache[variant]
+        image = self._image(variant)
+        if image is None: print(f"Warning: Icon not found at {os.path.join(self.base_path, category, f'{name}.svg')}"); return QIcon()
+        icon = QIcon(QPixmap.fromImage(image)); self.icon_cache[variant] = icon
+        return icon
+
+    def prewarm(self, icons):
+        """Renders those of the given (category, name, color, size) icons that are not cached yet, on a worker thread."""
+        ratio = self.device_pixel_ratio
+        variants = [(category, name, color, size.width(), size.height(), ratio) for category, name, color, size in icons]
+        with self._lock:
+            for variant in dict.fromkeys(variants):
+                if variant in self._images: self._mark_used(variant)
+                else: self._prewarm_pending.append(variant)
+            # One worker at a time; a running one picks up what was just queued
+            if self._prewarm_pending and self._prewarm_thread is None:
+                self._prewarm_thread = threading.Thread(target=self._prewarm, name="IconPrewarm", daemon=True)
+                self._prewarm_thread.start()
+
+    def _prewarm(self):
+        while True:
+            with self._lock: variants, self._prewarm_pending = self._prewarm_pending, []
+            if variants:
+                for variant in variants: self._image(variant)
+                continue
+            self.save_cache()
+            # The thread only counts as finished once its save is done, so close() waits for it
+            with self._lock:
+                if not self._prewarm_pending: self._prewarm_thread = None; return
+
+    def load_cache(self):
+        try:
+            with open(self.cache_path, 'rb') as f: data = f.read()
+        except OSError:
+            return
+        try:
+            magic, little_endian, generation, count = _HEADER.unpack_from(data)
+            if magic != _MAGIC or little_endian != _LITTLE_ENDIAN: return
+            offset = _HEADER.size; images = {}; last_used = {}
+            for _ in range(count):
+                descriptor_size, key, width, height, last_generation, size = _ENTRY.unpack_from(data, offset); offset += _ENTRY.size
+                variant = tuple(json.loads(data[offset:offset + descriptor_size])); offset += descriptor_size
+                pixels = data[offset:offset + size]; offset += size
+                if len(pixels) != size or size != width * height * 4: raise ValueError("truncated entry")
+                # Entries whose SVG changed or disappeared are simply not loaded
+                if self._variant_key(variant) != key: self._dirty = True; continue
+                image = QImage(pixels, width, height, width * 4, QImage.Format.Format_ARGB32_Premultiplied).copy()
+                image.setDevicePixelRatio(variant[5]); images[variant] = image; last_used[variant] = last_generation
+        except (struct.error, ValueError, TypeError, IndexError) as e:
+            print(f"Warning: Ignoring the damaged icon cache {self.cache_path} ({e})")
+            self._dirty = True
+            return
+        with self._lock: self._images.update(images); self._last_used.update(last_used); self._generation = generation + 1
+
+    def save_cache(self):
+        """Writes the recently used variants to the cache file if anything changed since it was loaded."""
+        # Saves from the prewarm worker and from close() must not interleave
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty: return
+                generation = self._generation; self._dirty = False
+                images = {variant: image for variant, image in self._images.items() if generation - self._last_used.get(variant, 0) <= MAX_IDLE_GENERATIONS}
+                last_used = {variant: self._last_used.get(variant, generation) for variant in images}
+            chunks = [_HEADER.pack(_MAGIC, _LITTLE_ENDIAN, generation, len(images))]
+            for variant, image in images.items():
+                descriptor = json.dumps(variant).encode()
+                chunks.append(_ENTRY.pack(len(descriptor), self._variant_key(variant), image.width(), image.height(), last_used[variant], image.sizeInBytes()))
+                chunks.append(descriptor); chunks.append(image.constBits().asstring(image.sizeInBytes()))
+            temp_path = None
+            try:
+                cache_dir = os.path.dirname(self.cache_path)
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(prefix=CACHE_FILE_NAME + ".", suffix=".tmp", dir=cache_dir)
+                with os.fdopen(fd, 'wb') as f: f.write(b''.join(chunks))
+                os.replace(temp_path, self.cache_path)
+            except OSError as e:
+                print(f"Warning: Could not write the icon cache {self.cache_path}: {e}")
+                if temp_path and os.path.exists(temp_path): os.unlink(temp_path)
+
+    def close(self):
+        """Waits for a running prewarm and saves the cache. Called when the application closes."""
+        with self._lock: thread = self._prewarm_thread
+        if thread: thread.join()
+        self.save_cache()
@@ -0,0 +1,184 @@
+import time
+from array import array
+
+class InputBackend:
+    """
+    Base class for the ways the click engine can inject mouse input. A backend
+    is created once and reused for every click, so any connection it needs
+    should be opened in __init__. Buttons are resolved once per settings change
+    with resolve_button(), and the resolved value is passed back to click().
+    """
+    name = None
+    label = None
+
+    def resolve_button(self, button_name):
+        return button_name
+
+    def position(self):
+        raise NotImplementedError
+
+    def move(self, x, y):
+        raise NotImplementedError
+
+    def click(self, button, count=1):
+        raise NotImplementedError
+
+    # Separate press and release, used to replay recorded macros
+    def press(self, button):
+        raise NotImplementedError
+
+    def release(self, button):
+        raise NotImplementedError
+
+    def click_at(self, x, y, button, count=1):
+        self.move(x, y)
+        self.click(button, count)
+
+    def close(self):
+        pass
+
+
+class PynputBackend(InputBackend):
+    name = 'pynput'
+    label = "pynput (Default)"
+
+    def __init__(self):
+        from pynput.mouse import Controller, Button
+        self._controller = Controller()
+        self._buttons = Button
+
+    def resolve_button(self, button_name):
+        return self._buttons[button_name]
+
+    def position(self):
+        return self._controller.position
+
+    def move(self, x, y):
+        self._controller.position = (x, y)
+
+    def click(self, button, count=1):
+        self._controller.click(button, count)
+
+    def press(self, button):
+        self._controller.press(button)
+
+    def release(self, button):
+        self._controller.release(button)
+
+
+class XTestBackend(InputBackend):
+    """Injects events straight through the X11 XTest extension, flushing once per click."""
+    name = 'xtest'
+    label = "X11 XTest"
+    BUTTONS = {'left': 1, 'middle': 2, 'right': 3}
+
+    def __init__(self):
+        from Xlib import X, display
+        from Xlib.ext import xtest
+        self._display = display.Display()
+        if not self._display.has_extension('XTEST'):
+            self._display.close()
+            raise RuntimeError("The X server does not support the XTEST extension.")
+        self._root = self._display.screen().root
+        self._fake_input = xtest.fake_input
+        self._press, self._release, self._motion = X.ButtonPress, X.ButtonRelease, X.MotionNotify
+
+    def resolve_button(self, button_name):
+        return self.BUTTONS[button_name]
+
+    def position(self):
+        pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def _queue_click(self, button, count):
+        for _ in range(count):
+            self._fake_input(self._display, self._press, button)
+            self._fake_input(self._display, self._release, button)
+
+    def move(self, x, y):
+        self._fake_input(self._display, self._motion, x=x, y=y)
+        self._display.flush()
+
+    def click(self, button, count=1):
+        self._queue_click(button, count)
+        self._display.flush()
+
+    def press(self, button):
+        self._fake_input(self._display, self._press, button)
+        self._display.flush()
+
+    def release(self, button):
+        self._fake_input(self._display, self._release, button)
+        self._display.flush()
+
+    def click_at(self, x, y, button, count=1):
+        # Motion and all press/release pairs go out in a single flush
+        self._fake_input(self._display, self._motion, x=x, y=y)
+        self._queue_click(button, count)
+        self._display.flush()
+
+    def close(self):
+        self._display.close()
+
+
+class NullBackend(InputBackend):
+    """
+    Injects nothing and records when each click would have happened, and how many
+    button clicks it was (2 for a double-click). Needs no display.
+    """
+    name = 'null'
+    label = "None (Dry Run)"
+
+    def __init__(self, clock=time.perf_counter):
+        self._clock = clock
+        self._position = (0, 0)
+        self.timestamps = array('d')
+        self.xs = array('i')
+        self.ys = array('i')
+        self.counts = array('B')
+        # Button clicks in total, counting a double-click as two like the real backends send
+        self.button_clicks = 0
+
+    def position(self):
+        return self._position
+
+    def move(self, x, y):
+        self._position = (x, y)
+
+    def click(self, button, count=1):
+        self.timestamps.append(self._clock())
+        self.xs.append(self._position[0])
+        self.ys.append(self._position[1])
+        self.counts.append(count)
+        self.button_clicks += count
+
+    def click_at(self, x, y, button, count=1):
+        self._position = (x, y)
+        self.click(button, count)
+
+    def press(self, button):
+        # A press is where a click lands
+        self.click(button)
+
+    def release(self, button):
+        pass
+
+    def clear(self):
+        del self.timestamps[:], self.xs[:], self.ys[:], self.counts[:]
+        self.button_clicks = 0
+
+
+BACKENDS = {backend.name: backend for backend in (PynputBackend, XTestBackend, NullBackend)}
+DEFAULT_BACKEND = PynputBackend.name
+
+
+def create_backend(name):
+    """Creates the named backend, falling back to the default one if it cannot be opened."""
+    backend_class = BACKENDS.get(name, BACKENDS[DEFAULT_BACKEND])
+    try:
+        return backend_class()
+    except Exception as e:
+        if backend_class.name == DEFAULT_BACKEND:
+            raise
+        print(f"Warning: Input backend '{name}' is unavailable ({e}), using '{DEFAULT_BACKEND}'.")
+        return BACKENDS[DEFAULT_BACKEND]()
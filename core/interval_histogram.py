@@ -0,0 +1,88 @@
+import json
+import math
+from array import array
+
+class IntervalHistogram:
+    """
+    A fixed-size, log-bucketed histogram of time intervals in seconds.
+
+    Each power of two is split into SUB_BUCKETS buckets, giving a relative
+    error of about 2% on reported percentiles from 1 us up to about two
+    minutes. Recording is O(1) and never allocates, so it can sit in the
+    click loop.
+    """
+    SUB_BUCKETS = 16
+    MIN_EXP = -20   # 2**-20 s ~= 0.95 us
+    MAX_EXP = 7     # 2**7 s = 128 s
+    BUCKETS = (MAX_EXP - MIN_EXP) * SUB_BUCKETS
+
+    def __init__(self):
+        self.counts = array('L', bytes(array('L').itemsize * self.BUCKETS))
+        self.reset()
+
+    def reset(self):
+        for i in range(self.BUCKETS):
+            self.counts[i] = 0
+        self.count = 0
+        self.max = 0.0
+
+    def _index(self, seconds):
+        if seconds <= 0:
+            return 0
+        index = int((math.log2(seconds) - self.MIN_EXP) * self.SUB_BUCKETS)
+        if index < 0:
+            return 0
+        if index >= self.BUCKETS:
+            return self.BUCKETS - 1
+        return index
+
+    def _bucket_value(self, index):
+        # Geometric midpoint of the bucket
+        return 2.0 ** (self.MIN_EXP + (index + 0.5) / self.SUB_BUCKETS)
+
+    def record(self, seconds):
+        self.counts[self._index(seconds)] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct):
+        """Returns the interval in seconds below which pct percent of the recorded intervals fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._bucket_value(index), self.max)
+        return self.max
+
+    def summary_ms(self):
+        """Returns p50/p90/p99/max in milliseconds, or None if nothing was recorded."""
+        if not self.count:
+            return None
+        return {
+            'p50': self.percentile(50) * 1000.0,
+            'p90': self.percentile(90) * 1000.0,
+            'p99': self.percentile(99) * 1000.0,
+            'max': self.max * 1000.0,
+        }
+
+    def to_json(self):
+        """Serializes the non-empty buckets compactly for storage."""
+        buckets = [[index, bucket_count] for index, bucket_count in enumerate(self.counts) if bucket_count]
+        return json.dumps({'sub': self.SUB_BUCKETS, 'min_exp': self.MIN_EXP, 'max': self.max, 'buckets': buckets},
+                          separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        if data.get('sub') != cls.SUB_BUCKETS or data.get('min_exp') != cls.MIN_EXP:
+            raise ValueError("Histogram was stored with a different bucket layout.")
+        histogram = cls()
+        for index, bucket_count in data['buckets']:
+            histogram.counts[index] = bucket_count
+            histogram.count += bucket_count
+        histogram.max = data['max']
+        return histogram
@@ -0,0 +1,100 @@
+import heapq
+import time
+from collections import namedtuple
+
+from core.timing import DeadlineScheduler
+
+# One entry of the 'click_jobs' setting, frozen for the click thread.
+# pos is an (x, y) tuple or None for the cursor position; limit 0 means no limit.
+JobSpec = namedtuple('JobSpec', 'mouse_button cps pos click_count limit')
+
+
+def job_specs_from_settings(jobs):
+    """Converts the 'click_jobs' setting (a list of dicts) to a tuple of JobSpecs, skipping disabled jobs."""
+    specs = []
+    for job in jobs or ():
+        if not job.get('enabled', True) or job.get('cps', 0) <= 0:
+            continue
+        pos = None
+        if job.get('x') is not None and job.get('y') is not None:
+            pos = (job['x'], job['y'])
+        specs.append(JobSpec(job.get('mouse_button', 'left'), job['cps'], pos,
+                             job.get('click_type', 1), job.get('click_limit', 0) or 0))
+    return tuple(specs)
+
+
+class ClickJob:
+    """The live state of one job during a session."""
+    __slots__ = ('index', 'spec', 'button', 'pos', 'click_count', 'limit', 'scheduler', 'clicks', 'last_click')
+
+    def __init__(self, index, spec, button, policy='skip', clock=time.perf_counter):
+        self.index = index
+        self.spec = spec
+        # Already resolved by the backend
+        self.button = button
+        self.pos = spec.pos
+        self.click_count = spec.click_count
+        self.limit = spec.limit
+        self.scheduler = DeadlineScheduler(1.0 / spec.cps, policy, clock=clock)
+        self.clicks = 0
+        self.last_click = None
+
+
+class MultiJobScheduler:
+    """
+    Runs any number of click jobs, each on its own deadline grid, from a single
+    thread. Jobs sit in a heap keyed by their next deadline, so picking the next
+    one to fire is O(log n) and the thread only ever sleeps until the earliest
+    deadline. Each job keeps its own DeadlineScheduler, so overrun handling and
+    jitter work exactly as for a single job.
+    """
+
+    def __init__(self, jobs, clock=time.perf_counter):
+        self.jobs = list(jobs)
+        self._clock = clock
+        self._heap = []
+
+    def start(self, now=None):
+        """Puts the first deadline of every job at the current time."""
+        if now is None:
+            now = self._clock()
+        self._heap = []
+        for job in self.jobs:
+            job.scheduler.start(now)
+            job.last_click = None
+            if not job.limit or job.clicks < job.limit:
+                self._heap.append((now, job.index, job))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def missed(self):
+        return sum(job.scheduler.missed for job in self.jobs)
+
+    def wait(self, cancel=None):
+        """
+        Takes the job with the earliest deadline off the queue and waits for that deadline.
+        Returns the job, or None if there are no jobs left or the wait was cancelled.
+        The job must be handed back with reschedule() once it has clicked.
+        """
+        if not self._heap:
+            return None
+        job = heapq.heappop(self._heap)[2]
+        if not job.scheduler.wait(cancel):
+            # Put it back so a later start() or wait() still sees it
+            heapq.heappush(self._heap, (job.scheduler.next_deadline, job.index, job))
+            return None
+        return job
+
+    def reschedule(self, job, jitter=0.0):
+        """Moves the job to its next slot, or retires it once it has reached its limit."""
+        if job.limit and job.clicks >= job.limit:
+            return
+        job.scheduler.advance(jitter)
+        heapq.heappush(self._heap, (job.scheduler.next_deadline, job.index, job))
+
+    def next_deadline(self):
+        return self._heap[0][0] if self._heap else None
+
@@ -0,0 +1,160 @@
+import struct
+import sys
+import threading
+import time
+from array import array
+
+# Event codes: the action in the low four bits, the button in the high four
+MOVE, PRESS, RELEASE = 0, 1, 2
+ACTION_MASK = 0x0F
+BUTTON_SHIFT = 4
+BUTTON_CODES = {'left': 1, 'right': 2, 'middle': 3}
+BUTTON_NAMES = {code: name for name, code in BUTTON_CODES.items()}
+
+# A delta is stored in whole microseconds as an unsigned 32-bit value (about 71 minutes)
+MAX_DELTA_US = 0xFFFFFFFF
+
+_HEADER = struct.Struct('<4sHI')
+_MAGIC = b'MCR1'
+_VERSION = 1
+
+
+def event_code(action, button_name=None):
+    return action | (BUTTON_CODES.get(button_name, 0) << BUTTON_SHIFT)
+
+
+class Macro:
+    """
+    A recorded input sequence held as four parallel typed arrays instead of one
+    object per event: microseconds since the previous event, x, y and an event
+    code. Each event takes 13 bytes in memory and in the database, so even very
+    long recordings stay small, and replay can walk the columns without creating
+    per-event objects.
+    """
+    __slots__ = ('deltas', 'xs', 'ys', 'codes')
+
+    def __init__(self):
+        self.deltas = array('I')
+        self.xs = array('i')
+        self.ys = array('i')
+        self.codes = array('B')
+
+    def __len__(self):
+        return len(self.codes)
+
+    def append(self, delta_us, x, y, code):
+        self.deltas.append(min(max(int(delta_us), 0), MAX_DELTA_US))
+        self.xs.append(int(x))
+        self.ys.append(int(y))
+        self.codes.append(code)
+
+    @property
+    def duration(self):
+        """Length of one playthrough in seconds."""
+        return sum(self.deltas) / 1e6
+
+    @property
+    def click_count(self):
+        return sum(1 for code in self.codes if code & ACTION_MASK == PRESS)
+
+    @property
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.deltas, self.xs, self.ys, self.codes))
+
+    def to_bytes(self):
+        """Serializes the macro as a small header followed by each column, little-endian."""
+        columns = [self.deltas, self.xs, self.ys]
+        if sys.byteorder == 'big':
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        return b''.join([_HEADER.pack(_MAGIC, _VERSION, len(self))] + [column.tobytes() for column in columns] + [self.codes.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a recognised macro recording.")
+        macro = cls()
+        offset = _HEADER.size
+        for column in (macro.deltas, macro.xs, macro.ys, macro.codes):
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            offset += size
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column.byteswap()
+        if len(macro.codes) != count:
+            raise ValueError("Macro recording is truncated.")
+        return macro
+
+
+class MacroRecorder:
+    """
+    Records mouse clicks (and optionally movement) through pynput listeners until
+    stop() is called or the stop key is pressed. Timestamps come from
+    time.perf_counter() and are stored as deltas. Movement is thinned to at most
+    one event per move_interval seconds.
+    """
+
+    def __init__(self, record_moves=False, move_interval=0.01, stop_key='esc', on_finished=None, clock=time.perf_counter):
+        self.record_moves = record_moves
+        self.move_interval = move_interval
+        self.stop_key = stop_key
+        # Called with the Macro from a listener thread when the stop key ends the recording
+        self.on_finished = on_finished
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.macro = Macro()
+        self._last_event = None
+        self._mouse_listener = None
+        self._keyboard_listener = None
+        self._finished = False
+
+    def start(self):
+        from pynput import keyboard, mouse
+        self.macro = Macro()
+        self._last_event = self._clock()
+        self._finished = False
+        self._stop_key = getattr(keyboard.Key, self.stop_key, None)
+        self._mouse_listener = mouse.Listener(on_click=self._on_click, on_move=self._on_move if self.record_moves else None)
+        self._keyboard_listener = keyboard.Listener(on_press=self._on_key)
+        self._mouse_listener.start()
+        self._keyboard_listener.start()
+
+    def _record(self, x, y, code, min_gap=0.0):
+        now = self._clock()
+        with self._lock:
+            if self._finished:
+                return
+            gap = now - self._last_event
+            if gap < min_gap:
+                return
+            self.macro.append(gap * 1e6, x, y, code)
+            self._last_event = now
+
+    def _on_click(self, x, y, button, pressed):
+        name = getattr(button, 'name', None)
+        if name in BUTTON_CODES:
+            self._record(x, y, event_code(PRESS if pressed else RELEASE, name))
+
+    def _on_move(self, x, y):
+        self._record(x, y, MOVE, self.move_interval)
+
+    def _on_key(self, key):
+        if key == self._stop_key:
+            macro = self.stop()
+            if self.on_finished:
+                self.on_finished(macro)
+            return False
+
+    def stop(self):
+        """Stops listening and returns the recording."""
+        with self._lock:
+            self._finished = True
+        if self._mouse_listener:
+            self._mouse_listener.stop()
+            self._mouse_listener = None
+        if self._keyboard_listener:
+            self._keyboard_listener.stop()
+            self._keyboard_listener = None
+        return self.macro
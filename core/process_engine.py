@@ -0,0 +1,312 @@
+import itertools
+import multiprocessing
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from core.click_engine import ClickEngine
+from core.rate_gauge import RateGauge
+
+# Engine states published in SharedStatus
+IDLE, RUNNING, EXITED = 0, 1, 2
+
+
+class SharedStatus:
+    """
+    A small shared-memory record the click process writes and the GUI polls:
+    click count, missed deadlines, achieved rate and state. A sequence counter
+    around each write (odd while writing) lets readers retry instead of seeing a
+    half-written record, so neither side ever takes a lock.
+    """
+    _LAYOUT = struct.Struct('<IxxxxQQdB')
+    _SEQ = struct.Struct('<I')
+
+    def __init__(self, name=None):
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=self._LAYOUT.size)
+            self._owner = True
+            self._LAYOUT.pack_into(self._shm.buf, 0, 0, 0, 0, 0.0, IDLE)
+        else:
+            try:
+                # Only the creator should unlink the segment (track is Python 3.13+)
+                self._shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self.name = self._shm.name
+        self._seq = 0
+
+    def publish(self, clicks, missed, rate, state):
+        """Writes a new record. Only one process may publish."""
+        buf = self._shm.buf
+        self._seq += 1
+        self._SEQ.pack_into(buf, 0, self._seq)
+        self._LAYOUT.pack_into(buf, 0, self._seq, clicks, missed, rate, state)
+        self._seq += 1
+        self._SEQ.pack_into(buf, 0, self._seq)
+
+    def read(self):
+        """Returns (clicks, missed, rate, state) from a consistent record."""
+        buf = self._shm.buf
+        while True:
+            seq, clicks, missed, rate, state = self._LAYOUT.unpack_from(buf, 0)
+            if not seq & 1 and self._SEQ.unpack_from(buf, 0)[0] == seq:
+                return clicks, missed, rate, state
+            time.sleep(0)
+
+    def close(self):
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class _SnapshotSource:
+    """The settings source of the engine inside the click process, updated from the pipe."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+
+    def publish(self, snapshot):
+        self.snapshot = snapshot
+        self.version = snapshot.version
+
+
+class _RecorderProxy:
+    """Forwards SessionRecorder calls from the click process to the real recorder in the GUI process."""
+
+    def __init__(self, send, checkpoint_interval):
+        self._send = send
+        self.checkpoint_interval = checkpoint_interval
+        self._tokens = itertools.count(1)
+
+    def begin(self, start_time, profile=None):
+        token = next(self._tokens)
+        self._send(('rec_begin', token, start_time, profile))
+        return token
+
+    def checkpoint(self, token, end_time, duration, clicks):
+        self._send(('rec_checkpoint', token, end_time, duration, clicks))
+
+    def finish(self, token, session):
+        self._send(('rec_finish', token, session))
+
+
+def _click_process_main(conn, status_name, snapshot, checkpoint_interval, publish_interval):
+    """Entry point of the click process."""
+    from core.macro import Macro
+
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            try:
+                conn.send(message)
+            except (OSError, EOFError):
+                pass
+
+    settings = _SnapshotSource(snapshot)
+    recorder = _RecorderProxy(send, checkpoint_interval) if checkpoint_interval else None
+    engine = ClickEngine(settings, log=lambda message: send(('log', message)), recorder=recorder)
+    status = SharedStatus(status_name)
+    done = threading.Event()
+    # Sequence number of the last session command applied; 'stopped' reports it with the
+    # armed state, so the GUI process can tell a state its later commands have overtaken
+    command_lock = threading.Lock()
+    applied_command = 0
+
+    def control():
+        nonlocal applied_command
+        while True:
+            try:
+                message = conn.recv()
+            except (OSError, EOFError):
+                # The GUI process went away
+                engine.shutdown()
+                return
+            kind = message[0]
+            if kind == 'settings':
+                settings.publish(message[1])
+                engine.settings_changed()
+            elif kind in ('arm', 'disarm', 'macro'):
+                with command_lock:
+                    if kind == 'arm':
+                        engine.arm(message[1])
+                    elif kind == 'disarm':
+                        engine.disarm(message[1])
+                    else:
+                        engine.play_macro(Macro.from_bytes(message[1]), message[2], message[3])
+                    applied_command = message[-1]
+            elif kind == 'shutdown':
+                engine.shutdown()
+                return
+
+    def publisher():
+        gauge = RateGauge()
+        was_running = False
+        while not done.wait(publish_interval):
+            running = engine.is_armed
+            if running and not was_running:
+                gauge.reset()
+            was_running = running
+            clicks = engine.click_count
+            status.publish(clicks, engine.missed_deadlines, gauge.sample(clicks) if running else gauge.rate, RUNNING if running else IDLE)
+
+    def stopped():
+        with command_lock:
+            send(('stopped', engine.last_session, engine.click_count, engine.missed_deadlines, engine.is_armed, applied_command))
+
+    threading.Thread(target=control, daemon=True).start()
+    publisher_thread = threading.Thread(target=publisher, daemon=True)
+    publisher_thread.start()
+    try:
+        engine.serve_forever(lambda: send(('started',)), stopped)
+    finally:
+        done.set()
+        publisher_thread.join(1.0)
+        status.publish(engine.click_count, engine.missed_deadlines, 0.0, EXITED)
+        status.close()
+        send(('exit',))
+        conn.close()
+
+
+class ProcessClickEngine:
+    """
+    Runs a ClickEngine in a separate process so that the GUI's GIL, repaints and
+    animations cannot delay clicks. It has the same interface as ClickEngine:
+    commands and settings snapshots go to the process over a pipe, while the
+    live click count, rate and state are read from a SharedStatus record.
+    serve_forever() relays the process's session events on the calling thread.
+    This needs a spare CPU core to help: on a single core the click process
+    still waits for whatever the GUI is running.
+    """
+
+    def __init__(self, settings_source, log=print, recorder=None, publish_interval=0.02):
+        self.settings_source = settings_source
+        self.log = log
+        self.recorder = recorder
+        self.last_session = None
+        self._armed = False
+        # Session commands are numbered; _armed only takes the click process's state
+        # once it has applied the latest one
+        self._command_seq = 0
+        self._final_counts = (0, 0)
+        self._send_lock = threading.Lock()
+        # Recorder tokens of the click process -> tokens of the real recorder
+        self._record_tokens = {}
+        self.status = SharedStatus()
+        # Spawn, so the child never inherits the GUI's threads or Qt state
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self._sent_version = settings_source.version
+        checkpoint_interval = recorder.checkpoint_interval if recorder else None
+        self._process = context.Process(target=_click_process_main, name="click-engine", daemon=True,
+                                        args=(child_conn, self.status.name, settings_source.snapshot, checkpoint_interval, publish_interval))
+        # A spawned child first re-runs the parent's script as __mp_main__; main.py and
+        # headless.py import Qt only inside their entry points, so the child stays Qt-free
+        self._process.start()
+        child_conn.close()
+
+    def _send(self, message):
+        with self._send_lock:
+            try:
+                self._conn.send(message)
+            except (OSError, EOFError):
+                pass
+
+    def _command(self, armed, *message):
+        """Sends a session command tagged with the next sequence number, and the armed state it leads to."""
+        with self._send_lock:
+            self._armed = armed
+            self._command_seq += 1
+            try:
+                self._conn.send(message + (self._command_seq,))
+            except (OSError, EOFError):
+                pass
+
+    def sync_settings(self):
+        """Sends the current settings snapshot to the click process if it has changed."""
+        snapshot = self.settings_source.snapshot
+        if snapshot.version != self._sent_version:
+            self._sent_version = snapshot.version
+            self._send(('settings', snapshot))
+
+    def arm(self, trigger_time=None):
+        self.sync_settings()
+        self._command(True, 'arm', trigger_time)
+
+    def disarm(self, release_time=None):
+        self._command(False, 'disarm', release_time)
+
+    stop = disarm
+
+    def play_macro(self, macro, repeat=1, trigger_time=None):
+        if self._armed:
+            return False
+        self.sync_settings()
+        self._command(True, 'macro', macro.to_bytes(), repeat, trigger_time)
+        return True
+
+    @property
+    def is_armed(self):
+        return self._armed
+
+    # Between sessions the exact totals reported with the last 'stopped' event are used,
+    # since the shared record is only refreshed every publish_interval
+    @property
+    def click_count(self):
+        if not self._armed or not self._process.is_alive():
+            return self._final_counts[0]
+        return self.status.read()[0]
+
+    @property
+    def missed_deadlines(self):
+        if not self._armed or not self._process.is_alive():
+            return self._final_counts[1]
+        return self.status.read()[1]
+
+    @property
+    def achieved_rate(self):
+        """The click process's own smoothed clicks per second."""
+        return self.status.read()[2] if self._process.is_alive() else 0.0
+
+    def shutdown(self):
+        self._armed = False
+        self._send(('shutdown',))
+
+    def serve_forever(self, on_started=None, on_stopped=None):
+        """Relays events from the click process until it exits."""
+        recorder = self.recorder
+        while True:
+            try:
+                message = self._conn.recv()
+            except (OSError, EOFError):
+                break
+            kind = message[0]
+            if kind == 'started':
+                if on_started:
+                    on_started()
+            elif kind == 'stopped':
+                self.last_session = message[1]
+                self._final_counts = (message[2], message[3])
+                with self._send_lock:
+                    if message[5] == self._command_seq:
+                        self._armed = message[4]
+                if on_stopped:
+                    on_stopped()
+            elif kind == 'log':
+                self.log(message[1])
+            elif kind == 'rec_begin' and recorder:
+                self._record_tokens[message[1]] = recorder.begin(message[2], message[3])
+            elif kind == 'rec_checkpoint' and recorder:
+                recorder.checkpoint(self._record_tokens[message[1]], *message[2:])
+            elif kind == 'rec_finish' and recorder:
+                recorder.finish(self._record_tokens.pop(message[1]), message[2])
+            elif kind == 'exit':
+                break
+        self._process.join(2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self.status.close()
@@ -0,0 +1,37 @@
+import math
+import time
+
+class RateGauge:
+    """
+    Turns periodic samples of a monotonically increasing counter into an
+    exponentially weighted moving average of its rate per second. The weight of
+    each sample depends on the time since the previous one, so the smoothing is
+    the same whatever the sampling rate.
+    """
+
+    def __init__(self, time_constant=1.0, clock=time.perf_counter):
+        self.time_constant = time_constant
+        self._clock = clock
+        self.rate = 0.0
+        self._last_count = 0
+        self._last_time = None
+
+    def reset(self, count=0):
+        self.rate = 0.0
+        self._last_count = count
+        self._last_time = self._clock()
+
+    def sample(self, count):
+        """Records the current counter value and returns the smoothed rate."""
+        now = self._clock()
+        if self._last_time is None:
+            self._last_count, self._last_time = count, now
+            return self.rate
+        dt = now - self._last_time
+        if dt <= 0:
+            return self.rate
+        instant = (count - self._last_count) / dt
+        alpha = 1.0 - math.exp(-dt / self.time_constant)
+        self.rate += alpha * (instant - self.rate)
+        self._last_count, self._last_time = count, now
+        return self.rate
@@ -0,0 +1,97 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+
+# Scheduling options for the click thread. All of them act on the calling thread only.
+PRIORITIES = ('normal', 'high', 'realtime')
+HIGH_NICE = -10
+# Well below the kernel's own threads (up to 99) but above any normal process
+FIFO_PRIORITY = 10
+# Linux prctl() option; 0 restores the thread's default slack (normally 50 us)
+PR_SET_TIMERSLACK = 29
+LOW_TIMER_SLACK_NS = 1
+
+_libc = None
+
+
+def is_supported():
+    return sys.platform.startswith('linux')
+
+
+def _prctl(option, value):
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    if _libc.prctl(option, ctypes.c_ulong(value), 0, 0, 0) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _set_priority(priority):
+    if priority == 'realtime':
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(FIFO_PRIORITY))
+        return
+    # Leaving SCHED_FIFO (or never having entered it) is always permitted
+    if os.sched_getscheduler(0) != os.SCHED_OTHER:
+        os.sched_setscheduler(0, os.SCHED_OTHER, os.sched_param(0))
+    # On Linux each thread has its own nice value, addressed by its thread id
+    os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), HIGH_NICE if priority == 'high' else 0)
+
+
+class RealtimeSettings:
+    """
+    Applies and reverts scheduling options on the thread that calls apply():
+    priority ('normal', 'high' = nice -10, 'realtime' = SCHED_FIFO), pinning to
+    one CPU, and minimal timer slack so sleeps wake up on time. Each option is
+    applied separately; failures (usually missing privileges) are returned as
+    messages rather than raised, and the option stays at its previous value.
+    """
+
+    def __init__(self):
+        # What is currently in effect on the thread, as (priority, cpu, low_timer_slack)
+        self.applied = ('normal', -1, False)
+        # The last request, so a request that failed is not retried (and reported) every session
+        self.requested = self.applied
+        self._default_affinity = None
+
+    def apply(self, priority='normal', cpu=-1, low_timer_slack=False):
+        """Returns a list of human readable problems; empty if everything was applied."""
+        wanted = (priority, cpu, low_timer_slack)
+        if wanted == self.requested:
+            return []
+        self.requested = wanted
+        if not is_supported():
+            if wanted == ('normal', -1, False):
+                self.applied = wanted
+                return []
+            return [f"Real-time options are only available on Linux, not {sys.platform}."]
+
+        problems = []
+        current_priority, current_cpu, current_slack = self.applied
+        if priority != current_priority:
+            try:
+                _set_priority(priority)
+                current_priority = priority
+            except (OSError, ValueError) as e:
+                problems.append(f"Could not set '{priority}' priority: {e.strerror if isinstance(e, OSError) else e}")
+
+        if cpu != current_cpu:
+            try:
+                if self._default_affinity is None:
+                    self._default_affinity = os.sched_getaffinity(0)
+                os.sched_setaffinity(0, self._default_affinity if cpu < 0 else {cpu})
+                current_cpu = cpu
+            except (OSError, ValueError) as e:
+                problems.append(f"Could not pin to CPU {cpu}: {e.strerror if isinstance(e, OSError) else e}")
+
+        if low_timer_slack != current_slack:
+            try:
+                _prctl(PR_SET_TIMERSLACK, LOW_TIMER_SLACK_NS if low_timer_slack else 0)
+                current_slack = low_timer_slack
+            except OSError as e:
+                problems.append(f"Could not change the timer slack: {e.strerror}")
+
+        self.applied = (current_priority, current_cpu, current_slack)
+        return problems
@@ -0,0 +1,91 @@
+import itertools
+import queue
+import threading
+
+from database.database_manager import DatabaseManager
+
+class SessionRecorder:
+    """
+    Writes session logs from a background thread so that neither the click
+    engine nor the GUI ever waits on SQLite. The engine feeds begin/checkpoint/
+    finish messages through a queue; the writer drains whatever is queued and
+    applies it in a single transaction. A session's row is created as soon as it
+    begins and updated at every checkpoint, so a crash loses at most one
+    checkpoint interval of clicks.
+    """
+    _STOP = object()
+
+    def __init__(self, db_name="autoclicker.db", checkpoint_interval=3.0):
+        self.db_name = db_name
+        self.checkpoint_interval = checkpoint_interval
+        self._queue = queue.Queue()
+        self._tokens = itertools.count(1)
+        self._listeners = []
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    def add_listener(self, callback):
+        """callback(log_ids) is called from the writer thread after sessions are finished and committed."""
+        self._listeners.append(callback)
+
+    def begin(self, start_time, profile=None):
+        """Returns a token identifying the new session in later calls."""
+        token = next(self._tokens)
+        self._queue.put(('begin', token, (start_time, profile)))
+        return token
+
+    def checkpoint(self, token, end_time, duration, clicks):
+        self._queue.put(('checkpoint', token, (end_time, duration, clicks)))
+
+    def finish(self, token, session):
+        self._queue.put(('finish', token, session))
+
+    def close(self):
+        """Flushes everything still queued and stops the writer."""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def _run(self):
+        db = DatabaseManager(self.db_name)
+        log_ids = {}
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            finished = []
+            try:
+                # Only the newest checkpoint of each session needs to be written
+                checkpoints = {}
+                for message in batch:
+                    if message is self._STOP:
+                        running = False
+                        continue
+                    kind, token, payload = message
+                    if kind == 'begin':
+                        log_ids[token] = db.begin_log(*payload)
+                    elif kind == 'checkpoint':
+                        checkpoints[token] = payload
+                    else:
+                        checkpoints.pop(token, None)
+                        log_id = log_ids.pop(token, None)
+                        if log_id is None:
+                            continue
+                        db.update_log(log_id, payload['end_time'], payload['duration'], payload['clicks'],
+                                      payload['interval_stats'] or {}, payload['interval_histogram'])
+                        finished.append(log_id)
+                for token, (end_time, duration, clicks) in checkpoints.items():
+                    if token in log_ids:
+                        db.update_log(log_ids[token], end_time, duration, clicks)
+                db.commit()
+            except Exception as e:
+                print(f"Error writing session logs: {e}")
+                continue
+            if finished:
+                for callback in self._listeners:
+                    callback(finished)
+        db.close()
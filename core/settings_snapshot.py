@@ -0,0 +1,63 @@
+from core.click_sequence import sequence_points_from_settings
+from core.job_scheduler import job_specs_from_settings
+
+class SettingsSnapshot:
+    """
+    An immutable, pre-resolved view of the settings that the click loop needs.
+    StateManager publishes a new one (with a higher version) whenever a setting
+    changes, so the loop only has to compare versions on each iteration.
+    """
+    __slots__ = ('version', 'cps', 'period', 'random_delay', 'mouse_button', 'click_count',
+                 'target_pos', 'window_targeting', 'target_window', 'click_limit',
+                 'overrun_policy', 'input_backend', 'jobs', 'target_sequence', 'realtime', 'profile')
+
+    def __init__(self, version, settings, profile=None):
+        cps = settings['cps']
+        target_pos = None
+        if settings['target_mode'] == 'specific_pos':
+            target_pos = (settings['specific_pos_x'], settings['specific_pos_y'])
+        # (x, y, relative) points, clicked in order; None unless in sequence mode
+        target_sequence = None
+        if settings['target_mode'] == 'sequence':
+            target_sequence = sequence_points_from_settings(settings.get('click_sequence'))
+        window_title = settings.get('target_window')
+
+        _set = object.__setattr__
+        _set(self, 'version', version)
+        _set(self, 'cps', cps)
+        _set(self, 'period', 1.0 / cps if cps > 0 else 0.0)
+        _set(self, 'random_delay', bool(settings['random_delay']))
+        # Resolved to the backend's own button value by the engine
+        _set(self, 'mouse_button', settings['mouse_button'])
+        _set(self, 'click_count', settings['click_type'])
+        _set(self, 'target_pos', target_pos)
+        _set(self, 'target_sequence', target_sequence)
+        _set(self, 'window_targeting', bool(settings['window_targeting_enabled']))
+        _set(self, 'target_window', window_title)
+        # 0 means no limit
+        _set(self, 'click_limit', settings['click_limit_count'] if settings['click_limit_enabled'] else 0)
+        _set(self, 'overrun_policy', settings.get('overrun_policy', 'skip'))
+        _set(self, 'input_backend', settings.get('input_backend', 'pynput'))
+        # (priority, cpu, low_timer_slack) for the click thread, see core.realtime
+        _set(self, 'realtime', (settings.get('engine_priority', 'normal'), settings.get('engine_cpu', -1), bool(settings.get('low_timer_slack', False))))
+        # The loaded profile's name, stored with the session log
+        _set(self, 'profile', profile)
+        # Empty unless multi-job mode is on, in which case the jobs replace the main click settings
+        _set(self, 'jobs', job_specs_from_settings(settings.get('click_jobs')) if settings.get('multi_job_enabled') else ())
+
+    def __reduce__(self):
+        # Sent to the click process by ProcessClickEngine; __setattr__ is blocked, so rebuild from the slots
+        return (_restore_snapshot, (tuple(getattr(self, name) for name in self.__slots__),))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SettingsSnapshot is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("SettingsSnapshot is immutable.")
+
+
+def _restore_snapshot(values):
+    snapshot = SettingsSnapshot.__new__(SettingsSnapshot)
+    for name, value in zip(SettingsSnapshot.__slots__, values):
+        object.__setattr__(snapshot, name, value)
+    return snapshot
@@ -0,0 +1,40 @@
+import argparse
+
+from core.control_client import ControlClient, ControlError
+
+
+def parse_launch_args(argv):
+    """Parses the options main.py accepts. Unknown arguments are left for Qt."""
+    parser = argparse.ArgumentParser(description="Smite AutoClicker")
+    parser.add_argument('--profile', help="Load the saved profile with this name.")
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument('--start', action='store_true', help="Start clicking once launched.")
+    actions.add_argument('--stop', action='store_true', help="Stop clicking in the running instance.")
+    return parser.parse_known_args(argv)[0]
+
+
+def forward_to_running_instance(args, path=None, timeout=0.5):
+    """
+    Hands the launch options to an instance that is already running, through
+    its control socket. Returns True if one was running (the caller should then
+    exit) and False if this launch should start the application. This only
+    imports the standard library, so a second launch never loads Qt.
+    """
+    client = ControlClient(path, timeout)
+    try:
+        client.connect()
+    except ControlError:
+        return False
+    try:
+        client.request('activate')
+        if args.profile:
+            client.load_profile(args.profile)
+        if args.start:
+            client.start()
+        elif args.stop:
+            client.stop()
+    except ControlError as e:
+        print(f"Error: The running instance could not apply the launch options: {e}")
+    finally:
+        client.close()
+    return True
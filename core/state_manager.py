@@ -1,5 +1,74 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from core.hotkey_matcher import migrate_hotkey
+from core.realtime import PRIORITIES
+from core.settings_snapshot import SettingsSnapshot
+from core.timing import OVERRUN_POLICIES
+
+# Settings that hold hotkey strings; a pynput key passed in is stored as its string form,
+# and a value saved by an older version is migrated
+HOTKEY_SETTINGS = frozenset({'start_hotkey', 'stop_hotkey'})
+
+def coerce_setting(key, value):
+    if key in HOTKEY_SETTINGS:
+        return migrate_hotkey(str(value))
+    if key == 'direct_hotkey_arm' and value in ('True', 'False'):
+        # Profiles saved by older versions may hold 'True'/'False'
+        return value == 'True'
+    return value
+
+def _is_int(value): return isinstance(value, int) and not isinstance(value, bool)
+def _is_number(value): return isinstance(value, (int, float)) and not isinstance(value, bool)
+def _is_bool(value): return isinstance(value, bool)
+
+def _is_sequence(points):
+    return isinstance(points, list) and all(isinstance(point, dict) and _is_int(point.get('x')) and _is_int(point.get('y')) for point in points)
+
+def _is_job_list(jobs):
+    def is_job(job):
+        return (isinstance(job, dict) and _is_number(job.get('cps', 0)) and job.get('mouse_button', 'left') in ('left', 'right', 'middle')
+                and job.get('click_type', 1) in (1, 2) and _is_int(job.get('click_limit', 0) or 0)
+                and all(job.get(axis) is None or _is_int(job.get(axis)) for axis in ('x', 'y')))
+    return isinstance(jobs, list) and all(is_job(job) for job in jobs)
+
+# The values update_setting() accepts for each setting: a tuple of choices or a predicate
+SETTING_RULES = {
+    'cps': lambda value: _is_number(value) and value > 0,
+    'cps_mode': ('Normal', 'Fast', 'Extreme', 'Insane'),
+    'random_delay': _is_bool,
+    'mouse_button': ('left', 'right', 'middle'),
+    'click_type': (1, 2),
+    'target_mode': ('current_pos', 'specific_pos', 'sequence'),
+    'specific_pos_x': _is_int,
+    'specific_pos_y': _is_int,
+    'click_sequence': _is_sequence,
+    'window_targeting_enabled': _is_bool,
+    'target_window': lambda value: value is None or isinstance(value, str),
+    'click_limit_enabled': _is_bool,
+    'click_limit_count': lambda value: _is_int(value) and value > 0,
+    'overrun_policy': OVERRUN_POLICIES,
+    'input_backend': ('pynput', 'xtest', 'null'),
+    'process_isolation': _is_bool,
+    'engine_priority': PRIORITIES,
+    'engine_cpu': lambda value: _is_int(value) and value >= -1,
+    'low_timer_slack': _is_bool,
+    'multi_job_enabled': _is_bool,
+    'click_jobs': _is_job_list,
+    'hotkey_mode': ('Toggle', 'Hold'),
+    'start_hotkey': lambda value: isinstance(value, str) and bool(value),
+    'direct_hotkey_arm': _is_bool,
+    'stop_hotkey': lambda value: isinstance(value, str) and bool(value),
+}
+
+def validate_setting(key, value):
+    """Raises ValueError if value is not allowed for the setting key."""
+    rule = SETTING_RULES.get(key)
+    if rule is None:
+        return
+    valid = (not isinstance(value, bool) and value in rule) if isinstance(rule, tuple) else rule(value)
+    if not valid:
+        raise ValueError(f"Invalid value {value!r} for setting '{key}'.")
+
 class StateManager(QObject):
     settings_updated = pyqtSignal()
 
@@ -11,36 +80,68 @@ class StateManager(QObject):
             'random_delay': False,
             'mouse_button': 'left',
             'click_type': 1,
-            'target_mode': 'current_pos',
+            'target_mode': 'current_pos', # Options: 'current_pos', 'specific_pos', 'sequence'
             'specific_pos_x': 100,
             'specific_pos_y': 100,
+            # Each point: {'x', 'y', 'relative'}; relative points are offsets from the target window's top-left corner
+            'click_sequence': [],
             'window_targeting_enabled': False,
             'target_window': None,
             'click_limit_enabled': False,
             'click_limit_count': 1000,
+            'overrun_policy': 'skip', # Options: 'skip', 'catch_up', 'stretch'
+            'input_backend': 'pynput', # Options: 'pynput', 'xtest', 'null'
+            'process_isolation': False, # Run the click engine in a separate process
+            'engine_priority': 'normal', # Options: 'normal', 'high', 'realtime' (Linux)
+            'engine_cpu': -1, # CPU to pin the click thread to, -1 for any
+            'low_timer_slack': False,
+            'multi_job_enabled': False,
+            # Each job: {'mouse_button', 'cps', 'x', 'y' (None for the cursor), 'click_type', 'click_limit', 'enabled'}
+            'click_jobs': [],
             
             # --- NEW SETTING ADDED ---
             'hotkey_mode': 'Toggle', # Options: 'Toggle', 'Hold'
             
             'start_hotkey': 'Key.f6',
+            'direct_hotkey_arm': False, # Arm the engine from the hotkey thread, bypassing the GUI thread
             'stop_hotkey': 'Key.f7'
         }
+        # The click thread reads these two attributes without locking; each
+        # publish swaps in a complete snapshot, so readers never see a partial update.
+        self.version = 0
+        self.snapshot = None
+        # Name of the last loaded profile, recorded with each session; None until one is loaded
+        self.profile_name = None
+        self._publish(self._settings, None)
+
+    def _publish(self, settings, profile_name):
+        """
+        Builds the snapshot first and only then makes settings current, so a
+        value the snapshot cannot be built from leaves the state unchanged.
+        """
+        snapshot = SettingsSnapshot(self.version + 1, settings, profile=profile_name)
+        self._settings = settings
+        self.profile_name = profile_name
+        self.snapshot = snapshot
+        self.version = snapshot.version
 
     def get_settings(self):
         return self._settings.copy()
 
     def update_setting(self, key, value):
-        if key in self._settings:
-            if 'hotkey' in key and not isinstance(value, str):
-                value = str(value)
-
-            self._settings[key] = value
-            self.settings_updated.emit()
-        else:
+        if key not in self._settings:
             raise KeyError(f"Setting '{key}' is not a valid setting.")
+        value = coerce_setting(key, value)
+        validate_setting(key, value)
+        settings = self._settings.copy()
+        settings[key] = value
+        self._publish(settings, self.profile_name)
+        self.settings_updated.emit()
 
-    def load_profile(self, profile_data):
+    def load_profile(self, profile_data, name=None):
+        settings = self._settings.copy()
         for key, value in profile_data.items():
-            if key in self._settings:
-                self._settings[key] = value
-        self.settings_updated.emit()
\ No newline at end of file
+            if key in settings:
+                settings[key] = coerce_setting(key, value)
+        self._publish(settings, name)
+        self.settings_updated.emit()
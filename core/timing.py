@@ -0,0 +1,107 @@
+import time
+
+# The last stretch before a deadline is spun instead of slept, because OS sleeps
+# routinely overshoot by a millisecond or more.
+SPIN_THRESHOLD = 0.002
+
+OVERRUN_POLICIES = ('skip', 'catch_up', 'stretch')
+
+
+def sleep_until(deadline, cancel=None, spin_threshold=SPIN_THRESHOLD):
+    """
+    Blocks until time.perf_counter() reaches the deadline (coarse sleep, then spin).
+    If a threading.Event is given as cancel, setting it ends the wait immediately
+    and the function returns False; otherwise it returns True.
+    """
+    remaining = deadline - time.perf_counter()
+    if remaining > spin_threshold:
+        if cancel is None:
+            time.sleep(remaining - spin_threshold)
+        elif cancel.wait(remaining - spin_threshold):
+            return False
+    if cancel is None:
+        while time.perf_counter() < deadline:
+            pass
+        return True
+    is_cancelled = cancel.is_set
+    while time.perf_counter() < deadline:
+        if is_cancelled():
+            return False
+    return True
+
+
+class DeadlineScheduler:
+    """
+    Paces a loop on absolute deadlines so that time spent doing work between
+    waits does not accumulate into drift. Deadlines sit on a fixed grid
+    (start + n * period); a random jitter can be applied per slot without
+    moving the grid, so randomization never changes the average rate.
+
+    When the loop falls a full period or more behind, the overrun policy decides
+    what happens to the slots that were missed:
+      - 'skip':     drop them and continue on the original grid.
+      - 'catch_up': fire them back to back (at most max_burst) to restore the count.
+      - 'stretch':  re-anchor the grid at the current time.
+    """
+
+    def __init__(self, period, policy='skip', max_burst=5, clock=time.perf_counter):
+        if policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy '{policy}'.")
+        self.period = period
+        self.policy = policy
+        self.max_burst = max_burst
+        self._clock = clock
+        self._anchor = 0.0
+        self._burst = 0
+        self.next_deadline = 0.0
+        self.missed = 0
+
+    def start(self, now=None):
+        """Places the first deadline at the current time."""
+        if now is None:
+            now = self._clock()
+        self._anchor = now
+        self._burst = 0
+        self.next_deadline = now
+
+    def set_period(self, period):
+        self.period = period
+
+    def overdue(self):
+        """Applies the overrun policy if needed. Returns True if the current slot is already due."""
+        if self._burst:
+            self._burst -= 1
+            return True
+        now = self._clock()
+        lateness = now - self.next_deadline
+        if lateness < 0:
+            return False
+        if lateness >= self.period:
+            missed = int(lateness // self.period)
+            self.missed += missed
+            if self.policy == 'skip':
+                self._anchor += missed * self.period
+                self.next_deadline += missed * self.period
+            elif self.policy == 'stretch':
+                self._anchor = now
+                self.next_deadline = now
+            else:
+                self._burst = min(missed, self.max_burst)
+                skipped = missed - self._burst
+                self._anchor += skipped * self.period
+                self.next_deadline += skipped * self.period
+        return True
+
+    def wait(self, cancel=None):
+        """
+        Waits for the next deadline, applying the overrun policy if it has already passed.
+        Returns False if the wait was cut short by the cancel event.
+        """
+        if self.overdue():
+            return True
+        return sleep_until(self.next_deadline, cancel)
+
+    def advance(self, jitter=0.0):
+        """Moves to the next slot on the grid, optionally offset by a jitter in seconds."""
+        self._anchor += self.period
+        self.next_deadline = self._anchor + jitter
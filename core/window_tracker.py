@@ -0,0 +1,197 @@
+import sys
+import time
+import threading
+
+class WindowTracker:
+    """
+    Resolves the target window by title once and caches its handle and bounds,
+    so the click loop can test a point against the window without enumerating
+    every top-level window on each click. The cached bounds are refreshed from
+    the handle at most every refresh_interval seconds; if the handle has gone
+    away the window is looked up by title again.
+    """
+
+    def __init__(self, title, refresh_interval=0.25, lookup=None, clock=time.monotonic):
+        self.title = title
+        self.refresh_interval = refresh_interval
+        # pygetwindow is imported on first use so the engine can run where it is unavailable
+        self._lookup = lookup
+        self._clock = clock
+        self.window = None
+        # (left, top, right, bottom), right/bottom exclusive
+        self.bounds = None
+        # Incremented whenever bounds changes, so callers can cache positions derived from it
+        self.geometry_version = 0
+        self._next_refresh = 0.0
+
+    def set_title(self, title):
+        if title != self.title:
+            self.title = title
+            self.invalidate()
+
+    def invalidate(self):
+        """Forgets the cached window so the next check resolves it by title again."""
+        self.window = None
+        self._set_bounds(None)
+        self._next_refresh = 0.0
+
+    def _set_bounds(self, bounds):
+        if bounds != self.bounds:
+            self.bounds = bounds
+            self.geometry_version += 1
+
+    def resolve(self):
+        """Looks the window up by title. Returns True if it was found."""
+        if not self.title:
+            windows = []
+        else:
+            if self._lookup is None:
+                import pygetwindow as gw
+                self._lookup = gw.getWindowsWithTitle
+            windows = self._lookup(self.title)
+        self.window = windows[0] if windows else None
+        return self._read_bounds()
+
+    def _read_bounds(self):
+        self._next_refresh = self._clock() + self.refresh_interval
+        if self.window is None:
+            self._set_bounds(None)
+            return False
+        try:
+            box = self.window.box
+        except Exception:
+            # The handle no longer refers to a live window
+            self.window = None
+            self._set_bounds(None)
+            return False
+        self._set_bounds((box.left, box.top, box.left + box.width, box.top + box.height))
+        return True
+
+    def refresh(self):
+        """Re-reads the bounds of the cached window, falling back to a title lookup."""
+        if self.window is not None and self._read_bounds():
+            return True
+        return self.resolve()
+
+    def is_available(self):
+        """Returns True if the window exists, refreshing the cache when it is stale."""
+        if self.bounds is None or self._clock() >= self._next_refresh:
+            return self.refresh()
+        return True
+
+    def contains(self, x, y):
+        bounds = self.bounds
+        if bounds is None:
+            return False
+        return bounds[0] <= x < bounds[2] and bounds[1] <= y < bounds[3]
+
+
+class _WinEventNotifier(threading.Thread):
+    """Calls back whenever a top-level window is created, shown, renamed or activated (Windows only)."""
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_CREATE = 0x8000
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    def __init__(self, callback):
+        super().__init__(daemon=True)
+        self.callback = callback
+        self._thread_id = None
+        self._ready = threading.Event()
+
+    def run(self):
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        self._thread_id = kernel32.GetCurrentThreadId()
+
+        WinEventProc = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                          wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+
+        def on_event(hook, event, hwnd, id_object, id_child, event_thread, event_time):
+            if id_object == self.OBJID_WINDOW and id_child == 0:
+                self.callback()
+
+        # Keep a reference so the callback is not garbage collected while hooked
+        self._proc = WinEventProc(on_event)
+        flags = self.WINEVENT_OUTOFCONTEXT | self.WINEVENT_SKIPOWNPROCESS
+        ranges = ((self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND),
+                  (self.EVENT_OBJECT_CREATE, self.EVENT_OBJECT_SHOW),
+                  (self.EVENT_OBJECT_NAMECHANGE, self.EVENT_OBJECT_NAMECHANGE))
+        hooks = [user32.SetWinEventHook(low, high, None, self._proc, 0, 0, flags) for low, high in ranges]
+        self._ready.set()
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in hooks:
+            if hook:
+                user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        self._ready.wait(1.0)
+        if self._thread_id is not None:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+
+
+class WindowWaiter:
+    """
+    Blocks until a tracker's window exists without spinning. On Windows the wait
+    is woken by window create/show/rename/activate notifications, so clicking
+    resumes within milliseconds of the window appearing; elsewhere it falls back
+    to polling with an exponential backoff. wake() interrupts the wait at once.
+    """
+
+    # With notifications the wait only times out as a safety net for missed events
+    NOTIFIED_INTERVAL = 1.0
+
+    # Polling tops out here, so a window that appears is found within about 10 ms;
+    # enumerating windows this often only happens while an armed session waits
+    def __init__(self, tracker, min_interval=0.002, max_interval=0.01, use_notifications=True):
+        self.tracker = tracker
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.use_notifications = use_notifications and sys.platform == 'win32'
+        self._event = threading.Event()
+        self._notifier = None
+
+    def wake(self):
+        self._event.set()
+
+    def _start_notifier(self):
+        if self._notifier is None and self.use_notifications:
+            try:
+                self._notifier = _WinEventNotifier(self._event.set)
+                self._notifier.start()
+            except Exception as e:
+                print(f"Warning: Window notifications unavailable, polling instead: {e}")
+                self.use_notifications = False
+                self._notifier = None
+
+    def wait(self, should_continue):
+        """Waits until the window exists or should_continue() returns False. Returns True if found."""
+        self._start_notifier()
+        interval = self.NOTIFIED_INTERVAL if self._notifier else self.min_interval
+        while True:
+            # Cleared before the checks, so a wake() or notification arriving during them is not lost
+            self._event.clear()
+            if not should_continue():
+                return False
+            if self.tracker.resolve():
+                return True
+            self._event.wait(interval)
+            if not self._notifier:
+                interval = min(interval * 2, self.max_interval)
+
+    def close(self):
+        if self._notifier:
+            self._notifier.stop()
+            self._notifier = None
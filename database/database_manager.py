@@ -1,8 +1,59 @@
 import sqlite3
 import json
 
+# Columns added to the logs table after its first release, created on demand
+LOG_INTERVAL_COLUMNS = {
+    'interval_p50_ms': 'REAL',
+    'interval_p90_ms': 'REAL',
+    'interval_p99_ms': 'REAL',
+    'interval_max_ms': 'REAL',
+    'interval_histogram': 'TEXT',
+}
+
+# Real timestamps (Unix seconds) and the active profile of each session, for statistics.
+# start_time/end_time stay as the local-time text shown in the Session Logs table.
+LOG_STATS_COLUMNS = {
+    'started_at': 'INTEGER',
+    'ended_at': 'INTEGER',
+    'profile': 'TEXT',
+}
+# Converts a local 'YYYY-MM-DD HH:MM:SS' parameter to Unix seconds
+_EPOCH_SQL = "CAST(strftime('%s', ?, 'utc') AS INTEGER)"
+
+# Rollups of the logs table per local day / week (starting Monday) and profile ('' for none),
+# kept up to date by triggers so a summary never scans the logs
+LOG_STATS_TABLES = {
+    'log_stats_daily': "date({row}.started_at, 'unixepoch', 'localtime')",
+    'log_stats_weekly': "date({row}.started_at, 'unixepoch', 'localtime', 'weekday 0', '-6 days')",
+}
+# The current day / week, in the same form as the rollup periods
+_CURRENT_PERIOD_SQL = {
+    'log_stats_daily': "date('now', 'localtime')",
+    'log_stats_weekly': "date('now', 'localtime', 'weekday 0', '-6 days')",
+}
+STATS_PERIODS = {'day': 'log_stats_daily', 'week': 'log_stats_weekly'}
+
+def _stats_trigger_sql(table, period, row, sign):
+    """Statements that add (sign '+') or remove (sign '-') a logs row in a rollup table."""
+    period = period.format(row=row)
+    profile = f"COALESCE({row}.profile, '')"
+    match = f"period = {period} AND profile = {profile}"
+    statements = []
+    if sign == '+':
+        # A NULL period (no started_at) violates NOT NULL and is skipped by OR IGNORE
+        statements.append(f"INSERT OR IGNORE INTO {table} (period, profile) VALUES ({period}, {profile});")
+    statements.append(f"""UPDATE {table} SET sessions = sessions {sign} 1, clicks = clicks {sign} COALESCE({row}.total_clicks, 0),
+                   active_seconds = active_seconds {sign} COALESCE({row}.duration_seconds, 0) WHERE {match};""")
+    if sign == '-':
+        statements.append(f"DELETE FROM {table} WHERE {match} AND sessions <= 0;")
+    return "\n".join(statements)
+
+# The columns of a log row as shown in the Session Logs table
+LOG_ROW_COLUMNS = "id, start_time, end_time, duration_seconds, total_clicks, interval_p50_ms, interval_p90_ms, interval_p99_ms, interval_max_ms"
+
 class DatabaseManager:
     def __init__(self, db_name="autoclicker.db"):
+        self.db_name = db_name
         self.conn = sqlite3.connect(db_name, check_same_thread=False)
         self.cursor = self.conn.cursor()
         self.create_tables()
@@ -24,8 +75,83 @@ class DatabaseManager:
                 total_clicks INTEGER
             )
         """)
+        self._ensure_columns('logs', LOG_INTERVAL_COLUMNS)
+        if 'started_at' in self._ensure_columns('logs', LOG_STATS_COLUMNS):
+            # Logs written before the timestamp columns existed
+            self.cursor.execute("UPDATE logs SET started_at = CAST(strftime('%s', start_time, 'utc') AS INTEGER), "
+                                "ended_at = CAST(strftime('%s', end_time, 'utc') AS INTEGER)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_started_at ON logs (started_at)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_profile_started_at ON logs (profile, started_at)")
+        self._create_stats_tables()
+        # Recorded macros; data is the compact binary form produced by Macro.to_bytes()
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS macros (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                event_count INTEGER NOT NULL,
+                duration_seconds REAL NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
         self.conn.commit()
 
+    def _ensure_columns(self, table, columns):
+        """Adds the missing columns and returns their names."""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in self.cursor.fetchall()}
+        added = set()
+        for name, column_type in columns.items():
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+                added.add(name)
+        return added
+
+    def _create_stats_tables(self):
+        for table, period in LOG_STATS_TABLES.items():
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            is_new = self.cursor.fetchone() is None
+            self.cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    period TEXT NOT NULL,
+                    profile TEXT NOT NULL,
+                    sessions INTEGER NOT NULL DEFAULT 0,
+                    clicks INTEGER NOT NULL DEFAULT 0,
+                    active_seconds REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (period, profile)
+                ) WITHOUT ROWID
+            """)
+            self._create_stats_triggers(table, period)
+            if is_new:
+                self._rebuild_stats_table(table, period)
+
+    def _create_stats_triggers(self, table, period):
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON logs BEGIN
+                {_stats_trigger_sql(table, period, 'NEW', '+')}
+            END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_update
+            AFTER UPDATE OF started_at, profile, total_clicks, duration_seconds ON logs BEGIN
+                {_stats_trigger_sql(table, period, 'OLD', '-')}
+                {_stats_trigger_sql(table, period, 'NEW', '+')}
+            END
+        """)
+        self.cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON logs BEGIN
+                {_stats_trigger_sql(table, period, 'OLD', '-')}
+            END
+        """)
+
+    def _rebuild_stats_table(self, table, period):
+        """Recomputes a rollup table from the whole logs table. Only needed when the rollup is first created."""
+        self.cursor.execute(f"DELETE FROM {table}")
+        self.cursor.execute(f"""
+            INSERT INTO {table} (period, profile, sessions, clicks, active_seconds)
+            SELECT {period.format(row='logs')}, COALESCE(profile, ''), COUNT(*), COALESCE(SUM(total_clicks), 0), COALESCE(SUM(duration_seconds), 0)
+            FROM logs WHERE started_at IS NOT NULL GROUP BY 1, 2
+        """)
+
     def save_profile(self, name, settings_dict):
         settings_json = json.dumps(settings_dict)
         try:
@@ -47,23 +173,127 @@ class DatabaseManager:
             return name, json.loads(settings_json)
         return None, None
 
+    def get_profile_by_name(self, name):
+        self.cursor.execute("SELECT settings FROM profiles WHERE name = ?", (name,))
+        row = self.cursor.fetchone()
+        return json.loads(row[0]) if row else None
+
     def delete_profile(self, profile_id):
         self.cursor.execute("DELETE FROM profiles WHERE id = ?", (profile_id,))
         self.conn.commit()
 
-    def add_log(self, start_time, end_time, duration, clicks):
+    def save_macro(self, name, data, event_count, duration):
+        try:
+            self.cursor.execute("INSERT INTO macros (name, event_count, duration_seconds, data) VALUES (?, ?, ?, ?)",
+                                (name, event_count, duration, sqlite3.Binary(data)))
+            self.conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def get_all_macros(self):
+        self.cursor.execute("SELECT id, name, event_count, duration_seconds FROM macros")
+        return self.cursor.fetchall()
+
+    def get_macro(self, macro_id):
+        self.cursor.execute("SELECT name, data FROM macros WHERE id = ?", (macro_id,))
+        row = self.cursor.fetchone()
+        if row:
+            return row[0], bytes(row[1])
+        return None, None
+
+    def delete_macro(self, macro_id):
+        self.cursor.execute("DELETE FROM macros WHERE id = ?", (macro_id,))
+        self.conn.commit()
+
+    def add_log(self, start_time, end_time, duration, clicks, interval_stats=None, interval_histogram=None, profile=None):
+        stats = interval_stats or {}
         self.cursor.execute(
-            "INSERT INTO logs (start_time, end_time, duration_seconds, total_clicks) VALUES (?, ?, ?, ?)",
-            (start_time, end_time, duration, clicks)
+            f"""INSERT INTO logs (start_time, end_time, duration_seconds, total_clicks,
+                                  interval_p50_ms, interval_p90_ms, interval_p99_ms, interval_max_ms, interval_histogram,
+                                  started_at, ended_at, profile)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, {_EPOCH_SQL}, {_EPOCH_SQL}, ?)""",
+            (start_time, end_time, duration, clicks,
+             stats.get('p50'), stats.get('p90'), stats.get('p99'), stats.get('max'), interval_histogram,
+             start_time, end_time, profile)
         )
         self.conn.commit()
 
+    # --- Incremental session logging, used by SessionRecorder. These do not commit. ---
+    def begin_log(self, start_time, profile=None):
+        self.cursor.execute(
+            f"""INSERT INTO logs (start_time, end_time, duration_seconds, total_clicks, started_at, ended_at, profile)
+               VALUES (?, ?, 0, 0, {_EPOCH_SQL}, {_EPOCH_SQL}, ?)""",
+            (start_time, start_time, start_time, start_time, profile)
+        )
+        return self.cursor.lastrowid
+
+    def update_log(self, log_id, end_time, duration, clicks, interval_stats=None, interval_histogram=None):
+        if interval_stats is None:
+            self.cursor.execute(
+                f"UPDATE logs SET end_time = ?, ended_at = {_EPOCH_SQL}, duration_seconds = ?, total_clicks = ? WHERE id = ?",
+                (end_time, end_time, duration, clicks, log_id)
+            )
+            return
+        self.cursor.execute(
+            f"""UPDATE logs SET end_time = ?, ended_at = {_EPOCH_SQL}, duration_seconds = ?, total_clicks = ?,
+                                interval_p50_ms = ?, interval_p90_ms = ?, interval_p99_ms = ?, interval_max_ms = ?,
+                                interval_histogram = ?
+               WHERE id = ?""",
+            (end_time, end_time, duration, clicks, interval_stats.get('p50'), interval_stats.get('p90'),
+             interval_stats.get('p99'), interval_stats.get('max'), interval_histogram, log_id)
+        )
+
+    def commit(self):
+        self.conn.commit()
+
+    # Keyset paging: each page continues below the smallest id already shown, so it costs
+    # the same however deep the user has scrolled
+    def get_logs_page(self, before_id=None, limit=200):
+        """The next 'limit' logs with an id below before_id (or the newest ones), newest first."""
+        if before_id is None:
+            self.cursor.execute(f"SELECT {LOG_ROW_COLUMNS} FROM logs ORDER BY id DESC LIMIT ?", (limit,))
+        else:
+            self.cursor.execute(f"SELECT {LOG_ROW_COLUMNS} FROM logs WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+        return self.cursor.fetchall()
+
+    def get_logs_after(self, after_id):
+        """Logs newer than after_id, newest first."""
+        self.cursor.execute(f"SELECT {LOG_ROW_COLUMNS} FROM logs WHERE id > ? ORDER BY id DESC", (after_id,))
+        return self.cursor.fetchall()
+
     def get_all_logs(self):
-        self.cursor.execute("SELECT id, start_time, end_time, duration_seconds, total_clicks FROM logs ORDER BY id DESC")
+        self.cursor.execute(f"SELECT {LOG_ROW_COLUMNS} FROM logs ORDER BY id DESC")
+        return self.cursor.fetchall()
+
+    def get_log_stats(self, period='day'):
+        """
+        (profile, sessions, clicks, active_seconds) for the current 'day' or 'week',
+        one row per profile ('' for sessions without one). Reads only the rollup table.
+        """
+        table = STATS_PERIODS[period]
+        self.cursor.execute(f"SELECT profile, sessions, clicks, active_seconds FROM {table} WHERE period = {_CURRENT_PERIOD_SQL[table]} ORDER BY clicks DESC")
         return self.cursor.fetchall()
 
     def clear_logs(self):
-        self.cursor.execute("DELETE FROM logs")
+        # Without the per-row rollup triggers SQLite can empty the table in one step instead of
+        # updating the rollups once per log. DDL does not open a transaction by itself, so one is
+        # begun explicitly: other connections never see the triggers missing, and a failure
+        # restores them.
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for table in LOG_STATS_TABLES:
+                for event in ('insert', 'update', 'delete'):
+                    self.cursor.execute(f"DROP TRIGGER IF EXISTS {table}_{event}")
+            self.cursor.execute("DELETE FROM logs")
+            for table, period in LOG_STATS_TABLES.items():
+                self.cursor.execute(f"DELETE FROM {table}")
+                self._create_stats_triggers(table, period)
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
         self.conn.commit()
 
     def delete_log(self, log_id):
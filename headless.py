@@ -0,0 +1,128 @@
+"""
+Runs the autoclicker without any widgets: only QtCore is loaded (no fonts,
+icons or stylesheet), a saved profile is applied and the clicker is driven by
+its hotkeys until Ctrl+C.
+
+    python headless.py --profile "My Profile"
+    python headless.py --list-profiles
+"""
+import time
+_LAUNCHED = time.perf_counter()
+
+import argparse
+import signal
+import sys
+
+# Qt and the rest of the application are imported where they are used: the click
+# process re-runs this script as __mp_main__ and only needs core.process_engine
+from database.database_manager import DatabaseManager
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class HeadlessClicker:
+    """
+    The non-GUI parts of the application wired together the same way MainWindow
+    does: settings, the click worker, session logging and the global hotkeys.
+    """
+
+    def __init__(self, db_name="autoclicker.db", log=print):
+        from core.autoclicker_thread import AutoClickerThread
+        from core.control_server import ControlServer, qt_invoker
+        from core.hotkey_listener import HotkeyListener
+        from core.session_recorder import SessionRecorder
+        from core.state_manager import StateManager
+
+        self.log = log
+        self.db_manager = DatabaseManager(db_name)
+        self.state_manager = StateManager()
+        self.session_recorder = SessionRecorder(self.db_manager.db_name)
+        self.autoclicker_thread = AutoClickerThread(self.state_manager, self.session_recorder)
+        self.autoclicker_thread.log_event.connect(log)
+        self.autoclicker_thread.session_started.connect(lambda: log("Clicking started."))
+        self.autoclicker_thread.autoclicker_stopped.connect(self.on_autoclicker_stopped)
+        self.hotkey_listener = HotkeyListener(self.state_manager)
+        self.hotkey_listener.start_hotkey_triggered.connect(self.autoclicker_thread.arm)
+        self.hotkey_listener.stop_hotkey_triggered.connect(self.autoclicker_thread.disarm)
+        self.hotkey_listener.set_engine(self.autoclicker_thread)
+        self.control_server = ControlServer(self.state_manager, self.db_manager, self.autoclicker_thread, invoke=qt_invoker(), log=log)
+
+    def load_profile(self, name):
+        settings = self.db_manager.get_profile_by_name(name)
+        if settings is None:
+            return False
+        self.state_manager.load_profile(settings, name)
+        return True
+
+    def start(self):
+        self.autoclicker_thread.start()
+        self.hotkey_listener.start()
+        self.control_server.start()
+
+    def on_autoclicker_stopped(self):
+        if not self.autoclicker_thread.engine.is_armed:
+            self.log(f"Clicking stopped after {self.autoclicker_thread.click_count:,} clicks.")
+
+    def shutdown(self):
+        self.control_server.stop()
+        self.hotkey_listener.stop()
+        self.autoclicker_thread.shutdown()
+        # Flush any session that is still queued for writing
+        self.session_recorder.close()
+        self.db_manager.close()
+
+
+def main(argv=None):
+    from PyQt6.QtCore import QCoreApplication, QTimer
+
+    parser = argparse.ArgumentParser(description="Run the autoclicker without its window, controlled by hotkeys.")
+    parser.add_argument('--profile', help="Name of a saved profile to load.")
+    parser.add_argument('--list-profiles', action='store_true', help="Print the saved profiles and exit.")
+    parser.add_argument('--db', default="autoclicker.db", help="Database file with the profiles and session logs.")
+    args = parser.parse_args(argv)
+
+    if args.list_profiles:
+        db_manager = DatabaseManager(args.db)
+        for profile_id, name in db_manager.get_all_profiles():
+            print(name)
+        db_manager.close()
+        return 0
+
+    app = QCoreApplication(sys.argv[:1])
+    app.setApplicationName("Smite AutoClicker")
+    clicker = HeadlessClicker(args.db)
+    if args.profile and not clicker.load_profile(args.profile):
+        print(f"Error: No profile named '{args.profile}'. Use --list-profiles to see the saved ones.", file=sys.stderr)
+        clicker.shutdown()
+        return 1
+    clicker.start()
+
+    # Qt's event loop does not return to Python on its own, so poll briefly to let signal handlers run
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    wakeup = QTimer(); wakeup.timeout.connect(lambda: None); wakeup.start(200)
+
+    settings = clicker.state_manager.get_settings()
+    memory = peak_memory_mb()
+    memory_text = f", {memory:.1f} MB resident" if memory is not None else ""
+    print(f"Ready in {(time.perf_counter() - _LAUNCHED) * 1000:.0f} ms{memory_text}. "
+          f"Start: {settings['start_hotkey']}, stop: {settings['stop_hotkey']}, Ctrl+C to quit.")
+    if clicker.control_server.listening:
+        print(f"Control API listening on {clicker.control_server.path}.")
+    app.exec()
+    clicker.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
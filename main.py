@@ -1,9 +1,15 @@
 import sys
+
+# A second launch hands its options to the running instance and exits before any Qt import
+from core.single_instance import forward_to_running_instance, parse_launch_args
+if __name__ == "__main__":
+    launch_args = parse_launch_args(sys.argv[1:])
+    if forward_to_running_instance(launch_args):
+        sys.exit(0)
+
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QFontDatabase, QFont
-from PyQt6.QtCore import Qt
-from main_window import MainWindow
+# Qt is imported where it is used: the click process re-runs this script as
+# __mp_main__ and should not load any of it
 
 class FontManager:
     """A singleton to hold the master, antialiased font."""
@@ -14,12 +20,14 @@ class FontManager:
         return cls._instance
 
     def __init__(self):
+        from PyQt6.QtGui import QFont
         if not hasattr(self, '_initialized'):
             self.antialiased_font = QFont() # Default fallback
             self._load_fonts()
             self._initialized = True
 
     def _load_fonts(self):
+        from PyQt6.QtGui import QFontDatabase, QFont
         fonts_path = os.path.join(os.path.dirname(__file__), 'resources', 'fonts')
         regular_font_path = os.path.join(fonts_path, 'Poppins-Regular.ttf')
         semibold_font_path = os.path.join(fonts_path, 'Poppins-SemiBold.ttf')
@@ -43,6 +51,9 @@ class FontManager:
                 self.antialiased_font.setStyleStrategy(QFont.StyleStrategy.PreferAntialias)
 
 if __name__ == "__main__":
+    from PyQt6.QtWidgets import QApplication
+    from main_window import MainWindow
+
     app = QApplication(sys.argv)
     app.setApplicationName("Smite AutoClicker")
     
@@ -50,5 +61,10 @@ if __name__ == "__main__":
     app.setFont(font_manager.antialiased_font)
 
     window = MainWindow(font_manager)
+    # Another launch may have finished starting up while this one was
+    if not window.control_server.listening and forward_to_running_instance(launch_args):
+        window.close()
+        sys.exit(0)
     window.show()
+    window.apply_launch_options(launch_args.profile, launch_args.start)
     sys.exit(app.exec())
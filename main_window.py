@@ -7,11 +7,10 @@ from PyQt6.QtCore import QSize, QPropertyAnimation, QEasingCurve, QPoint, Qt
 from core.icon_manager import IconManager
 from database.database_manager import DatabaseManager
 from core.state_manager import StateManager
+from core.session_recorder import SessionRecorder
+from core.control_server import ControlServer, qt_invoker
+from core.hotkey_listener import HotkeyListener
 from ui.views.general_view import GeneralView
-from ui.views.targeting_view import TargetingView
-from ui.views.profiles_view import ProfilesView
-from ui.views.logs_view import LogsView
-from ui.views.settings_view import SettingsView
 
 def apply_font_smoothing(widget, font):
     widget.setFont(font)
@@ -37,7 +36,7 @@ class UIManager:
         new_widget.setWindowOpacity(0.0); self.fade_in_animation = QPropertyAnimation(new_widget, b"windowOpacity"); self.fade_in_animation.setDuration(200); self.fade_in_animation.setStartValue(0.0); self.fade_in_animation.setEndValue(1.0); self.fade_in_animation.start()
 
 class MainWindow(QMainWindow):
-    def __init__(self, font_manager):
+    def __init__(self, font_manager, db_name="autoclicker.db"):
         super().__init__()
         self.font_manager = font_manager
         self.setWindowTitle("Smite Autoclicker")
@@ -45,11 +44,13 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(850, 435)
         self.icons = IconManager()
         self.setWindowIcon(self.icons.get_icon("sidebar", "dashboard", "#FFFFFF", size=QSize(64, 64)))
-        self.db_manager = DatabaseManager()
+        self.db_manager = DatabaseManager(db_name)
+        self.session_recorder = SessionRecorder(self.db_manager.db_name)
         self.state_manager = StateManager()
         self.init_ui()
         self.load_stylesheet("resources/styles/fluent_style.qss")
         self.init_status_bar()
+        self.prewarm_icons()
 
     def init_ui(self):
         central_widget = QWidget(); self.setCentralWidget(central_widget)
@@ -60,21 +61,69 @@ class MainWindow(QMainWindow):
         
         self.stacked_widget = QStackedWidget(); main_layout.addWidget(self.stacked_widget); self.ui_manager = UIManager(self.stacked_widget)
         
-        self.general_view = GeneralView(self.state_manager, self.db_manager, self.font_manager)
-        self.targeting_view = TargetingView(self.state_manager, self, self.font_manager)
-        self.profiles_view = ProfilesView(self.state_manager, self.db_manager, self.font_manager)
-        self.logs_view = LogsView(self.db_manager, self.font_manager)
-        self.settings_view = SettingsView(self.state_manager, self.font_manager)
-        
-        self.stacked_widget.addWidget(self.general_view); self.stacked_widget.addWidget(self.targeting_view); self.stacked_widget.addWidget(self.profiles_view); self.stacked_widget.addWidget(self.logs_view); self.stacked_widget.addWidget(self.settings_view)
+        # Only the dashboard is built at launch; every other page is built (and its module imported) on first selection
+        self.general_view = GeneralView(self.state_manager, self.db_manager, self.font_manager, self.session_recorder)
+        self.targeting_view = self.profiles_view = self.logs_view = self.settings_view = None
+        self.view_factories = {1: self.create_targeting_view, 2: self.create_profiles_view, 3: self.create_logs_view, 4: self.create_settings_view}
+        self.stacked_widget.addWidget(self.general_view)
+        for index in self.view_factories: self.stacked_widget.addWidget(QWidget())
         
         self.add_sidebar_item("dashboard", "Dashboard", 0); self.add_sidebar_item("target", "Click Targeting", 1); self.add_sidebar_item("profile", "Profiles", 2); self.add_sidebar_item("logs", "Session Logs", 3); self.add_sidebar_item("settings", "Settings", 4)
         
         self.sidebar.currentRowChanged.connect(self.on_sidebar_selection_change); self.sidebar.setCurrentRow(0); self.ui_manager.current_index = 0; self.on_sidebar_selection_change(0)
         
-        self.settings_view.hotkey_listener.start_hotkey_triggered.connect(self.general_view.start_autoclicker); self.settings_view.hotkey_listener.stop_hotkey_triggered.connect(self.general_view.stop_autoclicker)
+        self.hotkey_listener = HotkeyListener(self.state_manager)
+        self.hotkey_listener.start_hotkey_triggered.connect(self.general_view.start_autoclicker); self.hotkey_listener.stop_hotkey_triggered.connect(self.general_view.stop_autoclicker)
+        self.hotkey_listener.set_engine(self.general_view.autoclicker_thread)
+        self.hotkey_listener.start()
+
+        # Local control API for scripts; settings changes it requests are applied on this thread
+        self.control_server = ControlServer(self.state_manager, self.db_manager, self.general_view.autoclicker_thread,
+                                            invoke=qt_invoker(), on_activate=self.bring_to_front)
+        self.control_server.start()
+
+    def ensure_view(self, index):
+        """Builds the page at index in place of its placeholder, the first time it is shown."""
+        factory = self.view_factories.pop(index, None)
+        if factory is None: return
+        placeholder = self.stacked_widget.widget(index); view = factory()
+        self.stacked_widget.removeWidget(placeholder); placeholder.deleteLater(); self.stacked_widget.insertWidget(index, view)
+
+    def create_targeting_view(self):
+        from ui.views.targeting_view import TargetingView
+        self.targeting_view = TargetingView(self.state_manager, self, self.font_manager)
+        return self.targeting_view
+
+    def create_profiles_view(self):
+        from ui.views.profiles_view import ProfilesView
+        self.profiles_view = ProfilesView(self.state_manager, self.db_manager, self.font_manager, self.general_view.autoclicker_thread)
+        return self.profiles_view
+
+    def create_logs_view(self):
+        from ui.views.logs_view import LogsView
+        self.logs_view = LogsView(self.db_manager, self.font_manager)
+        self.general_view.session_logged.connect(self.logs_view.on_sessions_logged)
+        return self.logs_view
+
+    def create_settings_view(self):
+        from ui.views.settings_view import SettingsView
+        self.settings_view = SettingsView(self.state_manager, self.font_manager)
+        return self.settings_view
+
+    def apply_launch_options(self, profile=None, start=False):
+        if profile:
+            settings = self.db_manager.get_profile_by_name(profile)
+            if settings is None: print(f"Warning: No profile named '{profile}'.")
+            else: self.state_manager.load_profile(settings, profile)
+        if start: self.general_view.start_autoclicker()
+
+    def bring_to_front(self):
+        # A second launch was forwarded to this instance
+        if self.isMinimized(): self.showNormal()
+        self.show(); self.raise_(); self.activateWindow()
 
     def on_sidebar_selection_change(self, index):
+        self.ensure_view(index)
         self.ui_manager.fade_to_index(index)
         for i in range(self.sidebar.count()):
             item = self.sidebar.item(i); icon_name = item.data(Qt.ItemDataRole.UserRole)
@@ -83,6 +132,12 @@ class MainWindow(QMainWindow):
             else:
                 item.setIcon(self.icons.get_icon("sidebar", icon_name, "#8A95C1", size=QSize(20, 20)))
 
+    def prewarm_icons(self):
+        # Variants needed later (selected sidebar items, the logs table) are rendered off the GUI thread
+        sidebar = [("sidebar", name, color, QSize(20, 20)) for name in ("dashboard", "target", "profile", "logs", "settings") for color in ("#111111", "#8A95C1")]
+        logs = [("session-logs", "delete", color, QSize(22, 22)) for color in ("#111111", "#8A95C1", "#FFFFFF")]
+        self.icons.prewarm(sidebar + logs)
+
     def init_status_bar(self):
         # The status bar is no longer part of this design
         pass
@@ -97,7 +152,11 @@ class MainWindow(QMainWindow):
         except FileNotFoundError: print(f"Warning: Stylesheet not found at {path}")
     
     def closeEvent(self, event):
-        if hasattr(self.general_view, 'autoclicker_thread') and self.general_view.autoclicker_thread:
-            self.general_view.stop_autoclicker()
-        self.settings_view.hotkey_listener.stop()
+        self.control_server.stop()
+        self.general_view.shutdown_autoclicker()
+        self.hotkey_listener.stop()
+        if self.profiles_view and self.profiles_view.macro_recorder: self.profiles_view.macro_recorder.stop()
+        # Flush any session that is still queued for writing
+        self.session_recorder.close()
+        self.icons.close()
         event.accept()
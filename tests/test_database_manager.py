@@ -0,0 +1,116 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from database.database_manager import DatabaseManager, LOG_STATS_TABLES
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "test.db"))
+    yield manager
+    manager.close()
+
+
+def add_logs(db, count):
+    for i in range(count):
+        db.add_log('2024-01-01 12:00:00', '2024-01-01 12:00:10', 10.0, i)
+
+
+def ids(rows):
+    return [row[0] for row in rows]
+
+
+def test_first_page_is_the_newest_logs(db):
+    add_logs(db, 5)
+    assert ids(db.get_logs_page(limit=2)) == [5, 4]
+
+
+def test_pages_continue_below_the_last_id(db):
+    add_logs(db, 5)
+    first = db.get_logs_page(limit=2)
+    second = db.get_logs_page(before_id=first[-1][0], limit=2)
+    third = db.get_logs_page(before_id=second[-1][0], limit=2)
+    assert ids(second) == [3, 2]
+    assert ids(third) == [1]
+    assert db.get_logs_page(before_id=third[-1][0], limit=2) == []
+
+
+def test_pages_skip_deleted_logs(db):
+    add_logs(db, 5)
+    db.delete_log(3)
+    assert ids(db.get_logs_page(before_id=5, limit=2)) == [4, 2]
+
+
+def test_logs_after_an_id(db):
+    add_logs(db, 3)
+    newest = db.get_logs_page(limit=1)[0][0]
+    add_logs(db, 2)
+    assert ids(db.get_logs_after(newest)) == [5, 4]
+
+
+def now_text(offset=0):
+    return (datetime.now() + timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def stats(db, period='day'):
+    return {profile: (sessions, clicks, active) for profile, sessions, clicks, active in db.get_log_stats(period)}
+
+
+def test_rollups_add_up_sessions_per_profile(db):
+    db.add_log(now_text(), now_text(10), 10.0, 100, profile='Fast')
+    db.add_log(now_text(), now_text(5), 5.0, 50, profile='Fast')
+    db.add_log(now_text(), now_text(2), 2.0, 7)
+    assert stats(db) == {'Fast': (2, 150, 15.0), '': (1, 7, 2.0)}
+    assert stats(db, 'week') == stats(db)
+
+
+def test_rollups_follow_incremental_logging(db):
+    log_id = db.begin_log(now_text(), profile='Fast')
+    db.update_log(log_id, now_text(3), 3.0, 30)
+    db.update_log(log_id, now_text(6), 6.0, 60)
+    db.commit()
+    assert stats(db) == {'Fast': (1, 60, 6.0)}
+
+
+def test_deleting_the_last_log_removes_its_rollup_row(db):
+    db.add_log(now_text(), now_text(10), 10.0, 100, profile='Fast')
+    db.add_log(now_text(), now_text(10), 10.0, 20, profile='Slow')
+    db.delete_log(1)
+    assert stats(db) == {'Slow': (1, 20, 10.0)}
+
+
+def test_logs_from_other_days_are_not_in_the_current_day(db):
+    db.add_log('2001-02-03 04:05:06', '2001-02-03 04:05:16', 10.0, 100)
+    assert stats(db) == {}
+    assert db.cursor.execute("SELECT period, sessions FROM log_stats_daily").fetchall() == [('2001-02-03', 1)]
+
+
+def test_clear_logs_empties_rollups_and_keeps_triggers(db):
+    add_logs(db, 3)
+    db.clear_logs()
+    for table in LOG_STATS_TABLES:
+        assert db.cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone() == (0,)
+    db.add_log(now_text(), now_text(1), 1.0, 5)
+    assert stats(db) == {'': (1, 5, 1.0)}
+
+
+def test_rollups_are_rebuilt_for_an_existing_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = DatabaseManager(path)
+    db.add_log(now_text(), now_text(10), 10.0, 100, profile='Fast')
+    db.close()
+    # A database from before the rollups existed
+    conn = sqlite3.connect(path)
+    for table in LOG_STATS_TABLES:
+        for event in ('insert', 'update', 'delete'):
+            conn.execute(f"DROP TRIGGER {table}_{event}")
+        conn.execute(f"DROP TABLE {table}")
+    conn.commit()
+    conn.close()
+    db = DatabaseManager(path)
+    try:
+        assert stats(db) == {'Fast': (1, 100, 10.0)}
+    finally:
+        db.close()
@@ -0,0 +1,88 @@
+import enum
+
+from core.hotkey_matcher import HotkeyMatcher, START, STOP, TOGGLE, migrate_hotkey, parse_hotkey
+
+
+# Stand-ins for pynput's keyboard.Key and KeyCode, so the tests run without a display
+class Key(enum.Enum):
+    ctrl = 'ctrl'
+    ctrl_l = 'ctrl_l'
+    shift = 'shift'
+    alt = 'alt'
+    cmd = 'cmd'
+    f6 = 'f6'
+    f7 = 'f7'
+
+
+class KeyCode:
+    def __init__(self, char):
+        self.char = char
+
+
+def matcher_for(**settings):
+    matcher = HotkeyMatcher(Key)
+    matcher.rebuild(settings)
+    return matcher
+
+
+def hold_matcher():
+    return matcher_for(hotkey_mode='Hold', start_hotkey='Key.f6')
+
+
+def test_hold_press_and_release():
+    matcher = hold_matcher()
+    assert matcher.press(Key.f6) == START
+    assert matcher.release(Key.f6) == STOP
+
+
+def test_hold_release_after_rebuild_still_stops():
+    matcher = hold_matcher()
+    assert matcher.press(Key.f6) == START
+    # e.g. a profile load or a control API 'set' while the key is held
+    matcher.rebuild({'hotkey_mode': 'Hold', 'start_hotkey': 'Key.f6', 'cps': 20})
+    assert matcher.release(Key.f6) == STOP
+
+
+def test_autorepeat_after_rebuild_is_ignored():
+    matcher = hold_matcher()
+    assert matcher.press(Key.f6) == START
+    matcher.rebuild({'hotkey_mode': 'Hold', 'start_hotkey': 'Key.f6'})
+    assert matcher.press(Key.f6) is None
+
+
+def test_chord_with_left_modifier():
+    matcher = matcher_for(start_hotkey='Key.ctrl+Key.f6', stop_hotkey='Key.f7')
+    assert matcher.press(Key.f6) is None
+    matcher.release(Key.f6)
+    matcher.press(Key.ctrl_l)
+    assert matcher.press(Key.f6) == START
+
+
+def test_sequence_and_timeout():
+    matcher = matcher_for(start_hotkey='a,b', stop_hotkey='Key.f7')
+    assert matcher.press(KeyCode('a'), 0.0) is None
+    matcher.release(KeyCode('a'))
+    assert matcher.press(KeyCode('b'), 0.5) == START
+    matcher.release(KeyCode('b'))
+    matcher.press(KeyCode('a'), 1.0)
+    matcher.release(KeyCode('a'))
+    assert matcher.press(KeyCode('b'), 5.0) is None
+
+
+def test_separator_characters_are_written_by_name():
+    matcher = matcher_for(start_hotkey='plus', stop_hotkey='Key.ctrl+comma')
+    assert matcher.press(KeyCode('+')) == START
+    matcher.press(Key.ctrl)
+    assert matcher.press(KeyCode(',')) == STOP
+
+
+def test_legacy_separator_hotkeys_are_migrated():
+    assert migrate_hotkey('+') == 'plus'
+    assert migrate_hotkey(',') == 'comma'
+    assert migrate_hotkey('Key.f6') == 'Key.f6'
+    assert parse_hotkey(migrate_hotkey(','), Key) == [(0, ',')]
+
+
+def test_same_start_and_stop_toggles():
+    matcher = matcher_for(start_hotkey='Key.f6', stop_hotkey='Key.f6')
+    assert matcher.press(Key.f6) == TOGGLE
@@ -0,0 +1,59 @@
+import pytest
+
+from core.interval_histogram import IntervalHistogram
+
+
+def filled(intervals):
+    histogram = IntervalHistogram()
+    for seconds in intervals:
+        histogram.record(seconds)
+    return histogram
+
+
+def test_percentiles_are_within_bucket_error():
+    # 1 ms .. 100 ms in 1 ms steps
+    histogram = filled([i / 1000.0 for i in range(1, 101)])
+    assert histogram.count == 100
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.03)
+    assert histogram.percentile(90) == pytest.approx(0.090, rel=0.03)
+    assert histogram.percentile(99) == pytest.approx(0.099, rel=0.03)
+
+
+def test_percentile_never_exceeds_the_maximum():
+    # Values on both sides of a bucket midpoint
+    for seconds in (0.0100, 0.0101, 0.0102, 0.0103, 0.0104):
+        histogram = filled([seconds] * 10)
+        assert histogram.percentile(100) <= seconds
+        assert histogram.percentile(100) == pytest.approx(seconds, rel=0.03)
+
+
+def test_outliers_are_clamped_into_the_end_buckets():
+    histogram = filled([0.0, 1e-9, 1000.0])
+    assert histogram.count == 3
+    assert histogram.max == 1000.0
+    assert histogram.percentile(100) == pytest.approx(2.0 ** IntervalHistogram.MAX_EXP, rel=0.05)
+
+
+def test_empty_histogram():
+    histogram = IntervalHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.summary_ms() is None
+
+
+def test_summary_is_in_milliseconds():
+    summary = filled([0.01] * 100).summary_ms()
+    assert summary['p50'] == pytest.approx(10.0, rel=0.03)
+    assert summary['max'] == pytest.approx(10.0)
+
+
+def test_json_round_trip():
+    histogram = filled([0.001, 0.002, 0.002, 0.5])
+    restored = IntervalHistogram.from_json(histogram.to_json())
+    assert restored.count == histogram.count
+    assert restored.max == histogram.max
+    assert list(restored.counts) == list(histogram.counts)
+
+
+def test_json_with_another_layout_is_rejected():
+    with pytest.raises(ValueError):
+        IntervalHistogram.from_json('{"sub":8,"min_exp":-20,"max":0.0,"buckets":[]}')
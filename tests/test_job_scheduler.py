@@ -0,0 +1,61 @@
+from core.job_scheduler import ClickJob, JobSpec, MultiJobScheduler, job_specs_from_settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(*specs):
+    clock = FakeClock()
+    jobs = [ClickJob(index, spec, spec.mouse_button, clock=clock) for index, spec in enumerate(specs)]
+    scheduler = MultiJobScheduler(jobs, clock=clock)
+    scheduler.start()
+    return scheduler, clock
+
+
+def run(scheduler, clock, clicks):
+    """Steps the clock to each deadline in turn and returns (time, job index) for every click."""
+    fired = []
+    while len(fired) < clicks and len(scheduler):
+        clock.now = scheduler.next_deadline()
+        job = scheduler.wait()
+        job.clicks += 1
+        fired.append((round(clock.now, 3), job.index))
+        scheduler.reschedule(job)
+    return fired
+
+
+def test_jobs_fire_in_deadline_order():
+    scheduler, clock = make_scheduler(JobSpec('left', 10, None, 1, 0), JobSpec('right', 4, (5, 5), 1, 0))
+    assert run(scheduler, clock, 7) == [(0.0, 0), (0.0, 1), (0.1, 0), (0.2, 0), (0.25, 1), (0.3, 0), (0.4, 0)]
+
+
+def test_job_retires_at_its_limit():
+    scheduler, clock = make_scheduler(JobSpec('left', 10, None, 1, 2), JobSpec('right', 1, None, 1, 0))
+    fired = run(scheduler, clock, 5)
+    assert [index for _, index in fired].count(0) == 2
+    assert len(scheduler) == 1
+    assert scheduler.jobs[0].clicks == 2
+
+
+def test_job_that_already_reached_its_limit_is_not_started():
+    scheduler, clock = make_scheduler(JobSpec('left', 10, None, 1, 1))
+    scheduler.jobs[0].clicks = 1
+    scheduler.start()
+    assert len(scheduler) == 0
+    assert scheduler.wait() is None
+    assert scheduler.next_deadline() is None
+
+
+def test_specs_skip_disabled_and_stopped_jobs():
+    specs = job_specs_from_settings([
+        {'mouse_button': 'left', 'cps': 5, 'x': 10, 'y': 20, 'click_limit': 3},
+        {'mouse_button': 'right', 'cps': 5, 'enabled': False},
+        {'mouse_button': 'middle', 'cps': 0},
+        {'cps': 2, 'x': 10},
+    ])
+    assert specs == (JobSpec('left', 5, (10, 20), 1, 3), JobSpec('left', 2, None, 1, 0))
@@ -0,0 +1,53 @@
+import pytest
+
+from core.macro import MAX_DELTA_US, MOVE, PRESS, RELEASE, Macro, event_code
+
+
+def sample_macro():
+    macro = Macro()
+    macro.append(0, 10, 20, MOVE)
+    macro.append(1500, 10, 20, event_code(PRESS, 'left'))
+    macro.append(80_000, 10, 20, event_code(RELEASE, 'left'))
+    macro.append(250_000, -1920, 1080, event_code(PRESS, 'right'))
+    macro.append(60_000, -1920, 1080, event_code(RELEASE, 'right'))
+    return macro
+
+
+def columns(macro):
+    return list(macro.deltas), list(macro.xs), list(macro.ys), list(macro.codes)
+
+
+def test_round_trip():
+    macro = sample_macro()
+    restored = Macro.from_bytes(macro.to_bytes())
+    assert columns(restored) == columns(macro)
+    assert restored.click_count == 2
+    assert restored.duration == pytest.approx(0.3915)
+
+
+def test_empty_round_trip():
+    restored = Macro.from_bytes(Macro().to_bytes())
+    assert len(restored) == 0
+
+
+def test_deltas_are_clamped():
+    macro = Macro()
+    macro.append(-5, 0, 0, MOVE)
+    macro.append(MAX_DELTA_US * 2, 0, 0, MOVE)
+    assert list(Macro.from_bytes(macro.to_bytes()).deltas) == [0, MAX_DELTA_US]
+
+
+def test_stored_size_is_thirteen_bytes_per_event():
+    macro = sample_macro()
+    assert macro.nbytes == 13 * len(macro)
+    assert len(macro.to_bytes()) == 10 + macro.nbytes
+
+
+def test_truncated_recording_is_rejected():
+    with pytest.raises(ValueError):
+        Macro.from_bytes(sample_macro().to_bytes()[:-1])
+
+
+def test_foreign_data_is_rejected():
+    with pytest.raises(ValueError):
+        Macro.from_bytes(b'PNG\x00' + bytes(16))
@@ -0,0 +1,23 @@
+import tempfile
+
+import pytest
+
+from benchmarks.bench_startup import STARTUP_BUDGET_MS, bench_startup, check_budget
+
+RUNS = 3
+
+
+def test_check_budget_reports_figures_over_budget():
+    assert check_budget({f'{key}_median': budget for key, budget in STARTUP_BUDGET_MS.items()}) == []
+    failures = check_budget({'import_ms_median': STARTUP_BUDGET_MS['import_ms'] + 1, 'first_paint_ms_median': None})
+    assert len(failures) == 2
+
+
+def test_gui_cold_start_is_within_budget():
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            gui = bench_startup('gui', RUNS, tmp)
+        except RuntimeError as e:
+            # No display, or a dependency such as pynput cannot load here
+            pytest.skip(str(e))
+    assert check_budget(gui) == []
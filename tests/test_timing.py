@@ -0,0 +1,91 @@
+import pytest
+
+from core.timing import DeadlineScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def scheduler(policy, max_burst=5):
+    clock = FakeClock()
+    sched = DeadlineScheduler(0.1, policy, max_burst=max_burst, clock=clock)
+    sched.start()
+    return sched, clock
+
+
+def test_on_time_slot_is_not_overdue():
+    sched, clock = scheduler('skip')
+    sched.advance()
+    clock.now = 0.05
+    assert not sched.overdue()
+    assert sched.missed == 0
+
+
+def test_skip_drops_missed_slots_and_keeps_the_grid():
+    sched, clock = scheduler('skip')
+    sched.advance()
+    # 0.35 s late for the slot at 0.1: slots at 0.1, 0.2 and 0.3 were missed
+    clock.now = 0.45
+    assert sched.overdue()
+    assert sched.missed == 3
+    assert sched.next_deadline == pytest.approx(0.4)
+    sched.advance()
+    assert sched.next_deadline == pytest.approx(0.5)
+
+
+def test_catch_up_fires_missed_slots_back_to_back():
+    sched, clock = scheduler('catch_up')
+    sched.advance()
+    clock.now = 0.45
+    assert sched.overdue()
+    assert sched.missed == 3
+    # The late slot plus the three missed ones fire without waiting
+    for _ in range(3):
+        sched.advance()
+        assert sched.overdue()
+    sched.advance()
+    assert sched.next_deadline == pytest.approx(0.5)
+    assert not sched.overdue()
+
+
+def test_catch_up_is_capped_by_max_burst():
+    sched, clock = scheduler('catch_up', max_burst=2)
+    sched.advance()
+    clock.now = 1.05
+    assert sched.overdue()
+    assert sched.missed == 9
+    for _ in range(2):
+        sched.advance()
+        assert sched.overdue()
+    sched.advance()
+    assert sched.next_deadline == pytest.approx(1.1)
+    assert not sched.overdue()
+
+
+def test_stretch_reanchors_the_grid_at_the_current_time():
+    sched, clock = scheduler('stretch')
+    sched.advance()
+    clock.now = 0.45
+    assert sched.overdue()
+    assert sched.missed == 3
+    assert sched.next_deadline == pytest.approx(0.45)
+    sched.advance()
+    assert sched.next_deadline == pytest.approx(0.55)
+
+
+def test_jitter_does_not_move_the_grid():
+    sched, clock = scheduler('skip')
+    sched.advance(jitter=0.03)
+    assert sched.next_deadline == pytest.approx(0.13)
+    sched.advance(jitter=-0.02)
+    assert sched.next_deadline == pytest.approx(0.18)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        DeadlineScheduler(0.1, 'drop')
@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                              QFrame, QSpinBox) # Add QSpinBox
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 
+from core.autoclicker_thread import AutoClickerThread
+from core.rate_gauge import RateGauge
 from ui.custom_widgets import ToggleSwitch, CustomComboBox
 from ui.layout_widgets import GroupFrame, ValueSlider
 from ui.views.warning_dialog import CustomDialog
@@ -16,13 +18,23 @@ def create_setting_row(label_text, widget):
 
 class GeneralView(QWidget):
     status_changed = pyqtSignal(str, str)
-    def __init__(self, state_manager, db_manager, font_manager):
+    # The ids of the log rows that were just finished
+    session_logged = pyqtSignal(list)
+    def __init__(self, state_manager, db_manager, font_manager, session_recorder=None):
         super().__init__()
         self.state_manager = state_manager
         self.db_manager = db_manager
         self.font_manager = font_manager
-        self.autoclicker_thread = None
+        self.session_recorder = session_recorder
+        if session_recorder:
+            # Called from the recorder's writer thread; the signal queues it onto the GUI thread
+            session_recorder.add_listener(lambda log_ids: self.session_logged.emit(list(log_ids)))
         self.is_clicking = False
+        self.rate_gauge = RateGauge()
+        # Samples the engine's click counter at display rate while clicking
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(50)
+        self.stats_timer.timeout.connect(self.refresh_live_stats)
         
         self.CPS_MODES = {
             "Normal": {"min": 1, "max": 30, "warning": None},
@@ -35,6 +47,14 @@ class GeneralView(QWidget):
         self.state_manager.settings_updated.connect(self.update_ui_from_state)
         self.update_ui_from_state()
 
+        # One long-lived click worker for the whole application
+        self.autoclicker_thread = AutoClickerThread(self.state_manager, self.session_recorder)
+        # --- CONNECT NEW SIGNAL ---
+        # When a session stops for any reason, it will call on_autoclicker_stopped
+        self.autoclicker_thread.session_started.connect(self.on_autoclicker_started)
+        self.autoclicker_thread.autoclicker_stopped.connect(self.on_autoclicker_stopped)
+        self.autoclicker_thread.start()
+
     def init_ui(self):
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
@@ -46,10 +66,10 @@ class GeneralView(QWidget):
         
         self.start_button = QPushButton("Start Clicking")
         self.start_button.setObjectName("start_button")
-        self.start_button.clicked.connect(self.start_autoclicker)
+        self.start_button.clicked.connect(lambda: self.start_autoclicker())
         self.stop_button = QPushButton("Stop Clicking")
         self.stop_button.setEnabled(False)
-        self.stop_button.clicked.connect(self.stop_autoclicker)
+        self.stop_button.clicked.connect(lambda: self.stop_autoclicker())
         button_layout = QHBoxLayout()
         button_layout.addWidget(self.start_button)
         button_layout.addWidget(self.stop_button)
@@ -63,6 +83,23 @@ class GeneralView(QWidget):
         self.click_type_combo.currentTextChanged.connect(self.on_click_type_changed)
         left_column.content_layout.addLayout(create_setting_row("Click Type", self.click_type_combo))
 
+        # --- LIVE SESSION STATS ---
+        stats_separator = QFrame(); stats_separator.setFrameShape(QFrame.Shape.HLine); stats_separator.setObjectName("separator"); stats_separator.setStyleSheet("border-top: 1px solid rgba(255, 255, 255, 0.05); margin-top: 5px; margin-bottom: 5px;")
+        left_column.content_layout.addWidget(stats_separator)
+
+        self.clicks_label = QLabel("0")
+        self.clicks_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        left_column.content_layout.addLayout(create_setting_row("Session Clicks", self.clicks_label))
+
+        self.achieved_cps_label = QLabel()
+        self.achieved_cps_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        left_column.content_layout.addLayout(create_setting_row("Achieved CPS", self.achieved_cps_label))
+
+        self.latency_label = QLabel("-")
+        self.latency_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.latency_label.setToolTip("Hotkey press to first click / hotkey release to last click, for the last session.")
+        left_column.content_layout.addLayout(create_setting_row("Hotkey Latency", self.latency_label))
+
         # --- RIGHT COLUMN: REFINEMENTS ---
         right_column = GroupFrame("Refinements")
         main_layout.addWidget(right_column, 1)
@@ -94,6 +131,18 @@ class GeneralView(QWidget):
         
         apply_font_smoothing(self, self.font_manager.antialiased_font)
 
+    def refresh_live_stats(self):
+        configured_cps = self.state_manager.snapshot.cps
+        if self.is_clicking:
+            clicks = self.autoclicker_thread.click_count
+            self.clicks_label.setText(f"{clicks:,}")
+            achieved = self.rate_gauge.sample(clicks)
+            # A click process measures its own rate, free of this timer's jitter
+            achieved = getattr(self.autoclicker_thread.engine, 'achieved_rate', achieved)
+        else:
+            achieved = self.rate_gauge.rate
+        self.achieved_cps_label.setText(f"{achieved:.1f} / {configured_cps} CPS")
+
     def on_click_limit_toggled(self, checked):
         self.state_manager.update_setting('click_limit_enabled', checked)
         self.click_limit_spinbox.setEnabled(checked)
@@ -144,6 +193,9 @@ class GeneralView(QWidget):
         click_type_text = "Single" if settings['click_type'] == 1 else "Double"
         self.click_type_combo.setCurrentText(click_type_text)
 
+        if not self.is_clicking:
+            self.refresh_live_stats()
+
         # --- UPDATE CLICK LIMITER UI ---
         click_limit_enabled = settings.get('click_limit_enabled', False)
         self.click_limit_toggle.setChecked(click_limit_enabled)
@@ -159,32 +211,40 @@ class GeneralView(QWidget):
         self.click_limit_toggle.blockSignals(False)
         self.click_limit_spinbox.blockSignals(False)
 
-    def start_autoclicker(self):
-        from core.autoclicker_thread import AutoClickerThread
+    def start_autoclicker(self, trigger_time=None):
+        # The worker is already running with its backend open; arming it starts a session at once.
+        # The UI is updated when the engine reports the session has started.
+        self.autoclicker_thread.arm(trigger_time)
+        
+    def stop_autoclicker(self, release_time=None):
+        # The worker emits autoclicker_stopped when the session has ended,
+        # which will then call on_autoclicker_stopped to clean up the UI.
+        self.autoclicker_thread.disarm(release_time)
+
+    def on_autoclicker_started(self):
         if self.is_clicking: return
         self.is_clicking = True
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
-        self.autoclicker_thread = AutoClickerThread(self.state_manager)
-        
-        # --- CONNECT NEW SIGNAL ---
-        # When the thread stops for any reason, it will call on_autoclicker_stopped
-        self.autoclicker_thread.autoclicker_stopped.connect(self.on_autoclicker_stopped)
-        
-        self.autoclicker_thread.start()
-        
-    def stop_autoclicker(self):
-        if not self.is_clicking or not self.autoclicker_thread: return
-        # The thread will emit autoclicker_stopped when it finishes,
-        # which will then call on_autoclicker_stopped to clean up the UI.
-        self.autoclicker_thread.stop()
+        self.rate_gauge.reset()
+        self.stats_timer.start()
 
     def on_autoclicker_stopped(self):
         """This new method handles the UI changes when the thread stops."""
+        # A session that was re-armed before this notification arrived is still running
+        if self.autoclicker_thread.engine.is_armed: return
         self.is_clicking = False
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        # Wait for the thread to fully terminate before cleaning up
-        if self.autoclicker_thread:
-            self.autoclicker_thread.wait()
-            self.autoclicker_thread = None
\ No newline at end of file
+        self.stats_timer.stop()
+        self.clicks_label.setText(f"{self.autoclicker_thread.click_count:,}")
+        session = self.autoclicker_thread.engine.last_session
+        if session:
+            activation, release = session['activation_latency_ms'], session['release_latency_ms']
+            activation_text = f"{activation:.1f}" if activation is not None else "-"
+            release_text = f"{release:.1f}" if release is not None else "-"
+            self.latency_label.setText(f"{activation_text} / {release_text} ms")
+
+    def shutdown_autoclicker(self):
+        """Ends any session and stops the worker thread. Called when the application closes."""
+        self.autoclicker_thread.shutdown()
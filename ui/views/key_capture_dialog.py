@@ -1,5 +1,24 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+
+from core.hotkey_matcher import CHAR_NAMES, CHORD_SEPARATOR, STEP_SEPARATOR
+
+# Qt modifier flag -> pynput key name, in the order they are written in a chord
+MODIFIER_NAMES = ((Qt.KeyboardModifier.ControlModifier, 'Key.ctrl'), (Qt.KeyboardModifier.AltModifier, 'Key.alt'),
+                  (Qt.KeyboardModifier.MetaModifier, 'Key.cmd'), (Qt.KeyboardModifier.ShiftModifier, 'Key.shift'))
+MODIFIER_KEYS = {Qt.Key.Key_Control: 'Key.ctrl', Qt.Key.Key_Alt: 'Key.alt', Qt.Key.Key_AltGr: 'Key.alt',
+                 Qt.Key.Key_Meta: 'Key.cmd', Qt.Key.Key_Shift: 'Key.shift'}
+NAMED_KEYS = {Qt.Key.Key_Insert: 'Key.insert', Qt.Key.Key_Delete: 'Key.delete', Qt.Key.Key_Home: 'Key.home',
+              Qt.Key.Key_End: 'Key.end', Qt.Key.Key_PageUp: 'Key.page_up', Qt.Key.Key_PageDown: 'Key.page_down',
+              Qt.Key.Key_Pause: 'Key.pause', Qt.Key.Key_Space: 'Key.space', Qt.Key.Key_Tab: 'Key.tab',
+              Qt.Key.Key_Return: 'Key.enter', Qt.Key.Key_Enter: 'Key.enter', Qt.Key.Key_Backspace: 'Key.backspace',
+              Qt.Key.Key_Up: 'Key.up', Qt.Key.Key_Down: 'Key.down', Qt.Key.Key_Left: 'Key.left', Qt.Key.Key_Right: 'Key.right'}
+MAX_STEPS = 3
+# After a chord, how long to wait for another one before accepting the hotkey
+STEP_WAIT_MS = 900
+
+def format_hotkey(key_str):
+    return key_str.replace('Key.', '').replace(STEP_SEPARATOR, ', ')
 
 class KeyCaptureDialog(QDialog):
     key_captured = pyqtSignal(str)
@@ -9,36 +28,79 @@ class KeyCaptureDialog(QDialog):
         self.setWindowTitle("Set Hotkey")
         self.setFixedSize(300, 150)
         self.setModal(True)
-        
+
         self.setStyleSheet("background-color: #2d2d2d;")
-        
+
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        self.info_label = QLabel("Press any key to set it as the hotkey.\nPress 'Esc' to cancel.")
+
+        self.info_label = QLabel("Press a key or combination (e.g. Ctrl+Shift+F6)\nto set it as the hotkey.\nPress 'Esc' to cancel.")
         self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.info_label)
-        
+
         self.captured_key_str = None
+        self.steps = []
+        # A short pause after the last chord ends the sequence
+        self.accept_timer = QTimer(self); self.accept_timer.setSingleShot(True); self.accept_timer.setInterval(STEP_WAIT_MS)
+        self.accept_timer.timeout.connect(self.finish_capture)
+
+    def chord_from_event(self, event):
+        key = event.key()
+        if key in MODIFIER_KEYS: return None
+        modifiers = event.modifiers()
+        is_shortcut = bool(modifiers & (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.AltModifier | Qt.KeyboardModifier.MetaModifier))
+
+        if Qt.Key.Key_F1 <= key <= Qt.Key.Key_F24:
+            key_str = f"Key.f{key - Qt.Key.Key_F1 + 1}"
+        elif key in NAMED_KEYS:
+            key_str = NAMED_KEYS[key]
+        elif is_shortcut and (Qt.Key.Key_A <= key <= Qt.Key.Key_Z or Qt.Key.Key_0 <= key <= Qt.Key.Key_9):
+            # The text of a Ctrl/Alt combination is a control code or empty, so use the key itself
+            key_str = chr(key).lower()
+        else:
+            text = event.text()
+            if not text or not text.isprintable(): return ""
+            key_str = CHAR_NAMES.get(text, text)
+
+        parts = []
+        for flag, name in MODIFIER_NAMES:
+            # Shift is already part of a plain character ('A', '!')
+            if flag == Qt.KeyboardModifier.ShiftModifier and not is_shortcut and not key_str.startswith('Key.'): continue
+            if modifiers & flag: parts.append(name)
+        parts.append(key_str)
+        return CHORD_SEPARATOR.join(parts)
 
     def keyPressEvent(self, event):
         key = event.key()
-        
+
         if key == Qt.Key.Key_Escape:
+            self.accept_timer.stop()
             self.reject()
             return
+        if event.isAutoRepeat(): return
 
-        key_str = ""
-        if Qt.Key.Key_F1 <= key <= Qt.Key.Key_F12:
-            key_str = f"Key.f{key - Qt.Key.Key_F1 + 1}"
-        else:
-            text = event.text()
-            if text and text.isprintable():
-                key_str = text
-        
-        if key_str:
-            self.captured_key_str = key_str
-            self.info_label.setText(f"Hotkey set to: {self.captured_key_str}")
-            self.accept()
+        chord = self.chord_from_event(event)
+        if chord is None: return # A modifier on its own; wait for the rest of the chord
+
+        if chord:
+            self.steps.append(chord)
+            if len(self.steps) >= MAX_STEPS: self.finish_capture(); return
+            self.info_label.setText(f"Hotkey: {format_hotkey(STEP_SEPARATOR.join(self.steps))}\nPress another key to make a sequence.")
+            self.accept_timer.start()
         else:
-            self.info_label.setText("Invalid key. Please try another.")
\ No newline at end of file
+            self.info_label.setText("Invalid key. Please try another.")
+
+    def keyReleaseEvent(self, event):
+        # A modifier pressed and released on its own becomes the hotkey
+        if not event.isAutoRepeat() and event.key() in MODIFIER_KEYS and not self.steps and not event.modifiers():
+            self.steps.append(MODIFIER_KEYS[event.key()])
+            self.accept_timer.start()
+        super().keyReleaseEvent(event)
+
+    def finish_capture(self):
+        self.accept_timer.stop()
+        if not self.steps: return
+        self.captured_key_str = STEP_SEPARATOR.join(self.steps)
+        self.info_label.setText(f"Hotkey set to: {format_hotkey(self.captured_key_str)}")
+        self.key_captured.emit(self.captured_key_str)
+        self.accept()
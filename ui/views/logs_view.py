@@ -1,7 +1,7 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTableWidget, 
-                             QTableWidgetItem, QPushButton, QHBoxLayout, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QTableView, 
+                             QPushButton, QHBoxLayout, 
                              QHeaderView, QFrame, QStyledItemDelegate, QStyle)
-from PyQt6.QtCore import Qt, QSize, pyqtSignal, QEvent, QPoint, QRect
+from PyQt6.QtCore import Qt, QSize, pyqtSignal, QEvent, QPoint, QRect, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor, QBrush, QPainter, QPen
 from ui.views.warning_dialog import CustomDialog
 from core.icon_manager import IconManager
@@ -12,7 +12,116 @@ def apply_font_smoothing(widget, font):
     for child in widget.findChildren(QWidget):
         child.setFont(font)
 
-class LogsTableWidget(QTableWidget):
+ACTIONS_COLUMN = 5
+LOG_HEADERS = ["Start Time", "End Time", "Duration (s)", "Total Clicks", "Interval p50 / p90 / p99 (ms)", "Actions"]
+LOG_TEXT_COLOR = QColor("#8A95C1")
+ROW_HEIGHT = 40
+
+def format_interval_stats(p50, p90, p99):
+    if p50 is None: return "-"
+    return f"{p50:.1f} / {p90:.1f} / {p99:.1f}"
+
+# (label, period) of the summary panel above the table, see DatabaseManager.get_log_stats()
+STATS_PERIODS = [("Today", 'day'), ("This Week", 'week')]
+
+def format_active_time(seconds):
+    minutes, seconds = divmod(int(seconds), 60); hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {seconds:02d}s"
+
+def format_stats(sessions, clicks, active_seconds):
+    cps = f"{clicks / active_seconds:.1f} CPS" if active_seconds > 0 else "- CPS"
+    return f"{sessions:,} sessions  ·  {clicks:,} clicks  ·  {format_active_time(active_seconds)} active  ·  {cps}"
+
+class LogStatsPanel(QWidget):
+    """
+    Totals for today and this week, read from the rollup tables the database
+    keeps up to date on every write, so refreshing costs the same however long
+    the history is. The tooltip breaks each period down by profile.
+    """
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent); self.db_manager = db_manager; self.value_labels = {}
+        layout = QVBoxLayout(self); layout.setContentsMargins(0, 0, 0, 5); layout.setSpacing(6)
+        for title, period in STATS_PERIODS:
+            row_layout = QHBoxLayout(); row_layout.setSpacing(10); title_label = QLabel(title); row_layout.addWidget(title_label, 1)
+            value_label = QLabel("-"); value_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter); row_layout.addWidget(value_label); self.value_labels[period] = value_label
+            layout.addLayout(row_layout)
+        separator = QFrame(); separator.setFrameShape(QFrame.Shape.HLine); separator.setObjectName("separator"); separator.setStyleSheet("border-top: 1px solid rgba(255, 255, 255, 0.05); margin-top: 5px;")
+        layout.addWidget(separator)
+
+    def refresh(self):
+        for title, period in STATS_PERIODS:
+            rows = self.db_manager.get_log_stats(period); label = self.value_labels[period]
+            totals = [sum(row[column] for row in rows) for column in (1, 2, 3)]
+            label.setText(format_stats(*totals))
+            label.setToolTip("\n".join(f"{profile or 'No profile'}: {format_stats(sessions, clicks, active_seconds)}" for profile, sessions, clicks, active_seconds in rows))
+
+class LogsTableModel(QAbstractTableModel):
+    """
+    The session logs, read from the database a page at a time as the table is
+    scrolled (canFetchMore/fetchMore), continuing below the last loaded id.
+    Finished sessions are inserted at the top and deleted logs are removed one
+    row at a time, so the history is never reloaded as a whole.
+    """
+    def __init__(self, db_manager, page_size=200, parent=None):
+        super().__init__(parent); self.db_manager = db_manager; self.page_size = page_size
+        # Rows as returned by DatabaseManager.get_logs_page(), newest first
+        self.rows = []; self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self.rows)
+    def columnCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(LOG_HEADERS)
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole: return LOG_HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        log_id, start, end, duration, clicks, p50, p90, p99, interval_max = self.rows[index.row()]; column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0: return start
+            if column == 1: return end
+            if column == 2: return f"{duration:.2f}"
+            if column == 3: return str(clicks)
+            if column == 4: return format_interval_stats(p50, p90, p99)
+        elif role == Qt.ItemDataRole.ForegroundRole and column < ACTIONS_COLUMN: return LOG_TEXT_COLOR
+        elif role == Qt.ItemDataRole.ToolTipRole and column == 4 and interval_max is not None: return f"Longest interval: {interval_max:.1f} ms"
+        elif role == Qt.ItemDataRole.UserRole: return log_id
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()): return not parent.isValid() and not self._exhausted
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted: return
+        page = self.db_manager.get_logs_page(self.rows[-1][0] if self.rows else None, self.page_size)
+        if len(page) < self.page_size: self._exhausted = True
+        if page: self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1); self.rows.extend(page); self.endInsertRows()
+
+    def reload(self):
+        """Forgets every loaded row and starts again from the newest log."""
+        self.beginResetModel(); self.rows = []; self._exhausted = False; self.endResetModel()
+        self.fetchMore()
+
+    def log_id(self, row): return self.rows[row][0] if 0 <= row < len(self.rows) else None
+
+    def add_logs(self, log_ids):
+        """Shows the logs with these ids: newer ones are inserted at the top, loaded ones are refreshed."""
+        if not log_ids or (not self.rows and not self._exhausted): return
+        fresh = self.db_manager.get_logs_after(min(log_ids) - 1)
+        newest = self.rows[0][0] if self.rows else 0
+        new_rows = [row for row in fresh if row[0] > newest]
+        # Rows already loaded (e.g. a session that was still running when it was fetched) are near the top
+        updates = {row[0]: row for row in fresh if row[0] <= newest}
+        for position, row in enumerate(self.rows):
+            if not updates or row[0] < min(updates): break
+            if row[0] in updates:
+                self.rows[position] = updates.pop(row[0]); self.dataChanged.emit(self.index(position, 0), self.index(position, ACTIONS_COLUMN - 1))
+        if new_rows: self.beginInsertRows(QModelIndex(), 0, len(new_rows) - 1); self.rows[0:0] = new_rows; self.endInsertRows()
+
+    def remove_log(self, log_id, row_hint=-1):
+        """Removes the row of log_id; row_hint is where it was last seen, since rows may have been inserted above it."""
+        row = row_hint if self.log_id(row_hint) == log_id else next((i for i, row_data in enumerate(self.rows) if row_data[0] == log_id), None)
+        if row is None: return
+        self.beginRemoveRows(QModelIndex(), row, row); del self.rows[row]; self.endRemoveRows()
+
+class LogsTableView(QTableView):
     def __init__(self, parent=None):
         super().__init__(parent); self.setMouseTracking(True); self.hover_row = -1
     def mouseMoveEvent(self, event):
@@ -85,14 +194,22 @@ class LogsView(QWidget):
     def __init__(self, db_manager, font_manager):
         super().__init__(); self.db_manager = db_manager; self.font_manager = font_manager; self.icons = IconManager(); self.init_ui(); self.load_logs()
 
+    def on_sessions_logged(self, log_ids):
+        try: self.log_model.add_logs(log_ids); self.stats_panel.refresh()
+        except Exception as e: print(f"Warning: Could not show the new session logs: {e}")
+
     def init_ui(self):
         main_layout = QVBoxLayout(self); main_layout.setContentsMargins(0, 0, 0, 0); self.card_frame = GroupFrame("Session Logs"); main_layout.addWidget(self.card_frame)
-        self.log_table = LogsTableWidget(); self.log_table.setColumnCount(5); self.log_table.setHorizontalHeaderLabels(["Start Time", "End Time", "Duration (s)", "Total Clicks", "Actions"]); self.log_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); self.log_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows); self.log_table.setAlternatingRowColors(False); self.log_table.setShowGrid(False); self.log_table.verticalHeader().setVisible(False)
-        header = self.log_table.horizontalHeader(); header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch); header.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed); header.setStretchLastSection(False); self.log_table.setColumnWidth(4, 70)
+        self.stats_panel = LogStatsPanel(self.db_manager); self.card_frame.content_layout.addWidget(self.stats_panel)
+        self.log_model = LogsTableModel(self.db_manager, parent=self)
+        self.log_table = LogsTableView(); self.log_table.setModel(self.log_model); self.log_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers); self.log_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows); self.log_table.setAlternatingRowColors(False); self.log_table.setShowGrid(False); self.log_table.verticalHeader().setVisible(False)
+        # Fixed row heights let the view lay out any number of rows without measuring them
+        self.log_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed); self.log_table.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        header = self.log_table.horizontalHeader(); header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch); header.setSectionResizeMode(ACTIONS_COLUMN, QHeaderView.ResizeMode.Fixed); header.setStretchLastSection(False); self.log_table.setColumnWidth(ACTIONS_COLUMN, 70)
         
         # --- DELEGATE SETUP IS UNCHANGED ---
         self.delete_delegate = DeleteDelegate(self.log_table)
-        self.log_table.setItemDelegateForColumn(4, self.delete_delegate)
+        self.log_table.setItemDelegateForColumn(ACTIONS_COLUMN, self.delete_delegate)
         self.delete_delegate.delete_triggered.connect(self.delete_log_entry_by_row)
         
         self.card_frame.content_layout.addWidget(self.log_table)
@@ -109,33 +226,15 @@ class LogsView(QWidget):
 
     def clearSelection(self): self.log_table.clearSelection()
     def load_logs(self):
-        self.log_table.setRowCount(0)
-        try:
-            logs = self.db_manager.get_all_logs()
-            self.log_table.setRowCount(len(logs))
-            for row_idx, row_data in enumerate(logs):
-                log_id, start, end, duration, clicks = row_data
-                item_start = QTableWidgetItem(start); item_start.setData(Qt.ItemDataRole.UserRole, log_id); self.log_table.setItem(row_idx, 0, item_start)
-                item_end = QTableWidgetItem(end); self.log_table.setItem(row_idx, 1, item_end)
-                item_duration = QTableWidgetItem(f"{duration:.2f}"); self.log_table.setItem(row_idx, 2, item_duration)
-                item_clicks = QTableWidgetItem(str(clicks)); self.log_table.setItem(row_idx, 3, item_clicks)
-                # We also need to set an item in the delegate column for it to exist
-                self.log_table.setItem(row_idx, 4, QTableWidgetItem())
-                
-                # --- APPLY THEME COLOR TO TEXT ---
-                for col in range(4):
-                    item = self.log_table.item(row_idx, col)
-                    item.setForeground(QColor("#8A95C1"))
-
+        try: self.log_model.reload(); self.stats_panel.refresh()
         except Exception as e: dialog = CustomDialog("warning", "Database Error", f"Could not load logs.\nError: {e}", show_cancel=False, parent=self); dialog.exec()
     
     def delete_log_entry_by_row(self, row):
-        item = self.log_table.item(row, 0);
-        if not item: return
-        log_id = item.data(Qt.ItemDataRole.UserRole)
+        log_id = self.log_model.log_id(row)
+        if log_id is None: return
         dialog = CustomDialog("confirm", "Confirm Deletion", "Are you sure you want to delete this specific log entry?", parent=self)
         if dialog.exec():
-            try: self.db_manager.delete_log(log_id); self.load_logs()
+            try: self.db_manager.delete_log(log_id); self.log_model.remove_log(log_id, row); self.stats_panel.refresh()
             except Exception as e: error_dialog = CustomDialog("warning", "Database Error", f"Could not delete the log entry.\nError: {e}", show_cancel=False, parent=self); error_dialog.exec()
     
     def clear_logs(self):
@@ -1,7 +1,8 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout, 
                              QPushButton, QLineEdit, QFrame, QListWidgetItem,
-                             QListWidget)
+                             QListWidget, QSpinBox)
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
+from core.macro import Macro, MacroRecorder
 from ui.views.warning_dialog import CustomDialog
 
 # --- A dedicated widget for each item in the profile list ---
@@ -56,13 +57,21 @@ class ProfileItemWidget(QWidget):
 
 # --- Main Profiles View ---
 class ProfilesView(QWidget):
-    def __init__(self, state_manager, db_manager, font_manager):
+    # Emitted from the recorder's listener thread; queued onto the GUI thread
+    macro_recorded = pyqtSignal(object)
+
+    def __init__(self, state_manager, db_manager, font_manager, autoclicker_thread=None):
         super().__init__()
         self.state_manager = state_manager
         self.db_manager = db_manager
         self.font_manager = font_manager
+        # Used to replay macros on the running click engine
+        self.autoclicker_thread = autoclicker_thread
+        self.macro_recorder = None
+        self.macro_recorded.connect(self.on_macro_recorded)
         self.init_ui()
         self.load_profiles_list()
+        self.load_macros_list()
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -93,12 +102,41 @@ class ProfilesView(QWidget):
         self.profiles_list = QListWidget()
         self.profiles_list.setObjectName("profiles_list_widget")
         layout.addWidget(self.profiles_list, 1)
+
+        # --- MACROS: recorded click sequences, replayed by the click engine ---
+        macros_label = QLabel("Macros")
+        macros_label.setObjectName("title_label")
+        layout.addWidget(macros_label)
+
+        record_frame = QFrame()
+        record_frame.setObjectName("setting_row")
+        record_layout = QHBoxLayout(record_frame)
+        self.macro_name_input = QLineEdit()
+        self.macro_name_input.setPlaceholderText("Enter new macro name...")
+        self.macro_repeat_spinbox = QSpinBox()
+        self.macro_repeat_spinbox.setRange(0, 10000)
+        self.macro_repeat_spinbox.setValue(1)
+        self.macro_repeat_spinbox.setSpecialValueText("Loop")
+        self.macro_repeat_spinbox.setPrefix("x")
+        self.macro_repeat_spinbox.setToolTip("How many times Play repeats the macro.")
+        self.record_macro_btn = QPushButton("Record Macro")
+        self.record_macro_btn.setObjectName("primary_button")
+        self.record_macro_btn.clicked.connect(self.record_macro)
+        record_layout.addWidget(self.macro_name_input)
+        record_layout.addWidget(self.macro_repeat_spinbox)
+        record_layout.addWidget(self.record_macro_btn)
+        layout.addWidget(record_frame)
+
+        self.macros_list = QListWidget()
+        self.macros_list.setObjectName("profiles_list_widget")
+        layout.addWidget(self.macros_list, 1)
         
         main_layout.addWidget(self.card_frame)
         apply_font_smoothing(self, self.font_manager.antialiased_font)
 
     def clearSelection(self):
         self.profiles_list.clearSelection()
+        self.macros_list.clearSelection()
 
     def load_profiles_list(self):
         self.profiles_list.clear()
@@ -117,7 +155,7 @@ class ProfilesView(QWidget):
     def load_profile(self, profile_id):
         name, settings = self.db_manager.get_profile(profile_id)
         if settings:
-            self.state_manager.load_profile(settings)
+            self.state_manager.load_profile(settings, name)
             dialog = CustomDialog("info", "Success", f"Profile '{name}' loaded successfully.", show_cancel=False, parent=self)
             dialog.exec()
     
@@ -142,6 +180,76 @@ class ProfilesView(QWidget):
             dialog = CustomDialog("warning", "Error", "A profile with this name already exists.", show_cancel=False, parent=self)
             dialog.exec()
 
+    def load_macros_list(self):
+        self.macros_list.clear()
+        for macro_id, name, event_count, duration in self.db_manager.get_all_macros():
+            item = QListWidgetItem(self.macros_list)
+            item.setSizeHint(QSize(200, 50))
+
+            macro_widget = ProfileItemWidget(macro_id, f"{name}  ({event_count:,} events, {duration:.1f} s)")
+            macro_widget.load_button.setText("Play")
+            macro_widget.load_button.clicked.connect(lambda _, mid=macro_id: self.play_macro(mid))
+            macro_widget.delete_button.clicked.connect(lambda _, mid=macro_id, mname=name: self.delete_macro(mid, mname))
+
+            self.macros_list.addItem(item)
+            self.macros_list.setItemWidget(item, macro_widget)
+
+    def record_macro(self):
+        if self.macro_recorder:
+            return
+        if not self.macro_name_input.text().strip():
+            dialog = CustomDialog("warning", "Invalid Name", "Please enter a name for the macro.", show_cancel=False, parent=self)
+            dialog.exec()
+            return
+        try:
+            self.macro_recorder = MacroRecorder(on_finished=self.macro_recorded.emit)
+            self.macro_recorder.start()
+        except Exception as e:
+            self.macro_recorder = None
+            dialog = CustomDialog("warning", "Recording Error", f"Could not start recording.\nError: {e}", show_cancel=False, parent=self)
+            dialog.exec()
+            return
+        self.record_macro_btn.setText("Recording... (Esc to stop)")
+        self.record_macro_btn.setEnabled(False)
+
+    def on_macro_recorded(self, macro):
+        self.macro_recorder = None
+        self.record_macro_btn.setText("Record Macro")
+        self.record_macro_btn.setEnabled(True)
+        if not macro.click_count:
+            dialog = CustomDialog("warning", "Empty Macro", "No clicks were recorded.", show_cancel=False, parent=self)
+            dialog.exec()
+            return
+        name = self.macro_name_input.text().strip()
+        if self.db_manager.save_macro(name, macro.to_bytes(), len(macro), macro.duration):
+            self.macro_name_input.clear()
+            self.load_macros_list()
+        else:
+            dialog = CustomDialog("warning", "Error", "A macro with this name already exists.", show_cancel=False, parent=self)
+            dialog.exec()
+
+    def play_macro(self, macro_id):
+        if self.autoclicker_thread is None:
+            return
+        name, data = self.db_manager.get_macro(macro_id)
+        if data is None:
+            return
+        try:
+            macro = Macro.from_bytes(data)
+        except ValueError as e:
+            dialog = CustomDialog("warning", "Invalid Macro", f"Could not read the macro '{name}'.\nError: {e}", show_cancel=False, parent=self)
+            dialog.exec()
+            return
+        if not self.autoclicker_thread.play_macro(macro, self.macro_repeat_spinbox.value()):
+            dialog = CustomDialog("warning", "Busy", "Stop clicking before playing a macro.", show_cancel=False, parent=self)
+            dialog.exec()
+
+    def delete_macro(self, macro_id, macro_name):
+        dialog = CustomDialog("confirm", "Confirm Deletion", f"Are you sure you want to delete the macro '{macro_name}'?", parent=self)
+        if dialog.exec():
+            self.db_manager.delete_macro(macro_id)
+            self.load_macros_list()
+
 def apply_font_smoothing(widget, font):
     widget.setFont(font)
     for child in widget.findChildren(QWidget):
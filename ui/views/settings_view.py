@@ -1,10 +1,13 @@
+import os
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame, QButtonGroup
 from PyQt6.QtCore import Qt
 
-from core.hotkey_listener import HotkeyListener
-from ui.views.key_capture_dialog import KeyCaptureDialog
+from core.hotkey_matcher import hotkeys_conflict
+from core.input_backends import BACKENDS
+from core import realtime
+from ui.views.key_capture_dialog import KeyCaptureDialog, format_hotkey
 from ui.views.warning_dialog import CustomDialog
-from ui.custom_widgets import CustomRadioButton # <-- Import CustomRadioButton
+from ui.custom_widgets import CustomRadioButton, CustomComboBox, ToggleSwitch # <-- Import CustomRadioButton
 
 def apply_font_smoothing(widget, font):
     widget.setFont(font)
@@ -16,12 +19,15 @@ def create_setting_row(label_text, *widgets):
     for widget in widgets: row_layout.addWidget(widget)
     return row_frame
 
+OVERRUN_POLICY_LABELS = {'skip': "Skip Missed", 'catch_up': "Catch Up", 'stretch': "Stretch Interval"}
+PRIORITY_LABELS = {'normal': "Normal", 'high': "High", 'realtime': "Real-time (FIFO)"}
+ANY_CPU_LABEL = "Any CPU"
+
 class SettingsView(QWidget):
     def __init__(self, state_manager, font_manager):
         super().__init__()
         self.state_manager = state_manager
         self.font_manager = font_manager
-        self.hotkey_listener = HotkeyListener(self.state_manager); self.hotkey_listener.start()
         self.init_ui()
         self.state_manager.settings_updated.connect(self.update_ui_from_state)
         self.update_ui_from_state()
@@ -60,6 +66,49 @@ class SettingsView(QWidget):
 
         layout.addWidget(self.toggle_mode_radio)
         layout.addWidget(self.hold_mode_radio)
+
+        self.direct_arm_toggle = ToggleSwitch()
+        self.direct_arm_toggle.setToolTip("Hotkeys start and stop clicking straight from the keyboard hook, without waiting for the window to respond.")
+        self.direct_arm_toggle.toggled.connect(lambda checked: self.state_manager.update_setting('direct_hotkey_arm', checked))
+        layout.addWidget(create_setting_row("Fast Hotkey Activation", self.direct_arm_toggle))
+
+        # --- Click Engine ---
+        engine_separator = QFrame(); engine_separator.setFrameShape(QFrame.Shape.HLine); engine_separator.setObjectName("separator"); engine_separator.setStyleSheet("border-top: 1px solid rgba(255, 255, 255, 0.05); margin-top: 5px; margin-bottom: 5px;")
+        layout.addWidget(engine_separator)
+
+        self.overrun_policy_combo = CustomComboBox(items=list(OVERRUN_POLICY_LABELS.values()))
+        self.overrun_policy_combo.setToolTip("What to do with clicks that could not be delivered on time.")
+        self.overrun_policy_combo.currentTextChanged.connect(self.on_overrun_policy_changed)
+        layout.addWidget(create_setting_row("Missed Click Policy", self.overrun_policy_combo))
+
+        self.input_backend_combo = CustomComboBox(items=[backend.label for backend in BACKENDS.values()])
+        self.input_backend_combo.setToolTip("How clicks are injected. Saved with each profile; applies from the next session.")
+        self.input_backend_combo.currentTextChanged.connect(self.on_input_backend_changed)
+        layout.addWidget(create_setting_row("Input Backend", self.input_backend_combo))
+
+        self.process_isolation_toggle = ToggleSwitch()
+        self.process_isolation_toggle.setToolTip("Run the click loop in its own process so the interface cannot disturb click timing. Switches over when clicking is stopped.")
+        self.process_isolation_toggle.toggled.connect(lambda checked: self.state_manager.update_setting('process_isolation', checked))
+        layout.addWidget(create_setting_row("Separate Click Process", self.process_isolation_toggle))
+
+        # --- Scheduling of the click thread (Linux); applied when a session starts ---
+        self.priority_combo = CustomComboBox(items=list(PRIORITY_LABELS.values()))
+        self.priority_combo.setToolTip("Scheduling priority of the click thread. High and Real-time usually need extra privileges (CAP_SYS_NICE).")
+        self.priority_combo.currentTextChanged.connect(self.on_priority_changed)
+        layout.addWidget(create_setting_row("Click Thread Priority", self.priority_combo))
+
+        self.cpu_combo = CustomComboBox(items=[ANY_CPU_LABEL] + [f"CPU {cpu}" for cpu in range(os.cpu_count() or 1)])
+        self.cpu_combo.setToolTip("Keep the click thread on one CPU.")
+        self.cpu_combo.currentTextChanged.connect(lambda text: self.state_manager.update_setting('engine_cpu', -1 if text == ANY_CPU_LABEL else int(text.split()[1])))
+        layout.addWidget(create_setting_row("Pin Click Thread", self.cpu_combo))
+
+        self.timer_slack_toggle = ToggleSwitch()
+        self.timer_slack_toggle.setToolTip("Ask the kernel to wake the click thread exactly on time instead of batching its timers.")
+        self.timer_slack_toggle.toggled.connect(lambda checked: self.state_manager.update_setting('low_timer_slack', checked))
+        layout.addWidget(create_setting_row("Low Timer Slack", self.timer_slack_toggle))
+        if not realtime.is_supported():
+            for widget in (self.priority_combo, self.cpu_combo, self.timer_slack_toggle):
+                widget.setEnabled(False); widget.setToolTip("Only available on Linux.")
         
         layout.addStretch(); main_layout.addWidget(self.card_frame)
         
@@ -73,6 +122,24 @@ class SettingsView(QWidget):
         mode = 'Hold' if self.hold_mode_radio.isChecked() else 'Toggle'
         self.state_manager.update_setting('hotkey_mode', mode)
 
+    def on_overrun_policy_changed(self, text):
+        for policy, label in OVERRUN_POLICY_LABELS.items():
+            if label == text:
+                self.state_manager.update_setting('overrun_policy', policy)
+                return
+
+    def on_input_backend_changed(self, text):
+        for name, backend in BACKENDS.items():
+            if backend.label == text:
+                self.state_manager.update_setting('input_backend', name)
+                return
+
+    def on_priority_changed(self, text):
+        for priority, label in PRIORITY_LABELS.items():
+            if label == text:
+                self.state_manager.update_setting('engine_priority', priority)
+                return
+
     def capture_key(self, which_key):
         dialog = KeyCaptureDialog(self)
         if dialog.exec():
@@ -81,8 +148,8 @@ class SettingsView(QWidget):
 
     def set_hotkey(self, which_key, key_str):
         settings = self.state_manager.get_settings()
-        if which_key == 'start' and key_str == settings['stop_hotkey']: dialog = CustomDialog("warning", "Conflict", "This key is already used for the stop hotkey.", show_cancel=False, parent=self); dialog.exec()
-        elif which_key == 'stop' and key_str == settings['start_hotkey']: dialog = CustomDialog("warning", "Conflict", "This key is already used for the start hotkey.", show_cancel=False, parent=self); dialog.exec()
+        if which_key == 'start' and hotkeys_conflict(key_str, settings['stop_hotkey']): dialog = CustomDialog("warning", "Conflict", "This key is already used for the stop hotkey.", show_cancel=False, parent=self); dialog.exec()
+        elif which_key == 'stop' and hotkeys_conflict(key_str, settings['start_hotkey']): dialog = CustomDialog("warning", "Conflict", "This key is already used for the start hotkey.", show_cancel=False, parent=self); dialog.exec()
         else:
             if which_key == 'start': self.state_manager.update_setting('start_hotkey', key_str)
             else: self.state_manager.update_setting('stop_hotkey', key_str)
@@ -109,6 +176,25 @@ class SettingsView(QWidget):
         self.toggle_mode_radio.blockSignals(False)
         self.hold_mode_radio.blockSignals(False)
 
+        self.direct_arm_toggle.blockSignals(True)
+        self.direct_arm_toggle.setChecked(settings.get('direct_hotkey_arm', False))
+        self.direct_arm_toggle.blockSignals(False)
+        self.process_isolation_toggle.blockSignals(True)
+        self.process_isolation_toggle.setChecked(settings.get('process_isolation', False))
+        self.process_isolation_toggle.blockSignals(False)
+
+        self.overrun_policy_combo.setCurrentText(OVERRUN_POLICY_LABELS.get(settings.get('overrun_policy', 'skip'), OVERRUN_POLICY_LABELS['skip']))
+
+        self.priority_combo.setCurrentText(PRIORITY_LABELS.get(settings.get('engine_priority', 'normal'), PRIORITY_LABELS['normal']))
+        cpu = settings.get('engine_cpu', -1)
+        self.cpu_combo.setCurrentText(ANY_CPU_LABEL if cpu < 0 else f"CPU {cpu}")
+        self.timer_slack_toggle.blockSignals(True)
+        self.timer_slack_toggle.setChecked(settings.get('low_timer_slack', False))
+        self.timer_slack_toggle.blockSignals(False)
+
+        backend = BACKENDS.get(settings.get('input_backend', 'pynput'), BACKENDS['pynput'])
+        self.input_backend_combo.setCurrentText(backend.label)
+
         # Update Hotkey Buttons Text
-        self.start_hotkey_btn.setText(settings.get('start_hotkey', 'Not Set').replace('Key.', ''))
-        self.stop_hotkey_btn.setText(settings.get('stop_hotkey', 'Not Set').replace('Key.', ''))
\ No newline at end of file
+        self.start_hotkey_btn.setText(format_hotkey(settings.get('start_hotkey', 'Not Set')))
+        self.stop_hotkey_btn.setText(format_hotkey(settings.get('stop_hotkey', 'Not Set')))
\ No newline at end of file
@@ -1,10 +1,11 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout, QSpinBox, 
                              QPushButton, QFrame, QApplication, QButtonGroup)
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRect
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QRect, QPoint
 from PyQt6.QtGui import QPainter, QPen, QColor, QCursor
-import pygetwindow as gw
 from ui.custom_widgets import CustomRadioButton, CustomComboBox, ToggleSwitch
 from ui.layout_widgets import GroupFrame
+from ui.views.warning_dialog import CustomDialog
+from core.window_tracker import WindowTracker
 
 def apply_font_smoothing(widget, font):
     widget.setFont(font)
@@ -13,9 +14,13 @@ def apply_font_smoothing(widget, font):
 
 class PixelPerfectPickerOverlay(QWidget):
     location_picked = pyqtSignal(int, int)
+    # Sequence mode: every left click adds a point, Enter or a right click finishes
+    points_picked = pyqtSignal(list)
+    cancelled = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, multi=False):
         super().__init__()
+        self.multi = multi; self.points = []
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.ToolTip)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setWindowState(Qt.WindowState.WindowFullScreen)
@@ -46,27 +51,65 @@ class PixelPerfectPickerOverlay(QWidget):
         painter.drawEllipse(target_rect)
         painter.drawLine(target_rect.center().x(), target_rect.top(), target_rect.center().x(), target_rect.bottom())
         painter.drawLine(target_rect.left(), target_rect.center().y(), target_rect.right(), target_rect.center().y())
-        info_text = f"X: {cursor_pos.x()}, Y: {cursor_pos.y()}\nClick to select, Esc to cancel"
+        for number, (px, py) in enumerate(self.points, 1):
+            marker = self.mapFromGlobal(QPoint(px, py)); painter.setPen(QPen(QColor("#8A95C1"), 2)); painter.drawEllipse(marker, 6, 6); painter.setPen(Qt.GlobalColor.white); painter.drawText(marker.x() + 9, marker.y() - 9, str(number))
+        if self.multi: info_text = f"X: {cursor_pos.x()}, Y: {cursor_pos.y()}\nClick to add point {len(self.points) + 1}\nEnter / right click to finish, Esc to cancel"
+        else: info_text = f"X: {cursor_pos.x()}, Y: {cursor_pos.y()}\nClick to select, Esc to cancel"
         painter.setPen(Qt.GlobalColor.white)
         font = painter.font(); font.setPointSize(10); painter.setFont(font)
-        text_rect = QRect(target_rect.bottomLeft().x(), target_rect.bottomLeft().y() + 5, 200, 50)
+        text_rect = QRect(target_rect.bottomLeft().x(), target_rect.bottomLeft().y() + 5, 260, 70)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft, info_text)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             pos = event.globalPosition().toPoint()
+            if self.multi: self.points.append((pos.x(), pos.y())); self.update(); return
             self.location_picked.emit(pos.x(), pos.y())
             self.close()
+        elif event.button() == Qt.MouseButton.RightButton and self.multi: self.finish_points()
+
+    def finish_points(self):
+        if self.points: self.points_picked.emit(list(self.points))
+        else: self.cancelled.emit()
+        self.close()
 
     def keyPressEvent(self, event):
-        if event.key() == Qt.Key.Key_Escape: self.close()
+        if event.key() == Qt.Key.Key_Escape: self.cancelled.emit(); self.close()
+        elif self.multi and event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter): self.finish_points()
 
     def mouseMoveEvent(self, event):
         self.update()
 
+class ClickJobRow(QWidget):
+    """One editable entry of the 'click_jobs' setting."""
+    changed = pyqtSignal()
+    remove_requested = pyqtSignal(object)
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self); layout.setContentsMargins(0, 2, 0, 2)
+        self.button_combo = CustomComboBox(items=["Left", "Right", "Middle"]); self.button_combo.setCurrentText(job.get('mouse_button', 'left').capitalize())
+        self.cps_spinbox = QSpinBox(); self.cps_spinbox.setRange(1, 100); self.cps_spinbox.setSuffix(" CPS"); self.cps_spinbox.setValue(job.get('cps', 10))
+        # -1 means the cursor position
+        self.x_spinbox = QSpinBox(); self.x_spinbox.setRange(-1, 9999); self.x_spinbox.setSpecialValueText("Cursor"); self.x_spinbox.setValue(-1 if job.get('x') is None else job['x'])
+        self.y_spinbox = QSpinBox(); self.y_spinbox.setRange(-1, 9999); self.y_spinbox.setSpecialValueText("Cursor"); self.y_spinbox.setValue(-1 if job.get('y') is None else job['y'])
+        self.limit_spinbox = QSpinBox(); self.limit_spinbox.setRange(0, 1000000); self.limit_spinbox.setSpecialValueText("No Limit"); self.limit_spinbox.setValue(job.get('click_limit', 0))
+        self.enabled_toggle = ToggleSwitch(); self.enabled_toggle.setChecked(job.get('enabled', True))
+        remove_btn = QPushButton("Remove"); remove_btn.clicked.connect(lambda: self.remove_requested.emit(self))
+        self.click_type = job.get('click_type', 1)
+        layout.addWidget(self.enabled_toggle); layout.addWidget(self.button_combo); layout.addWidget(self.cps_spinbox); layout.addWidget(QLabel("X:")); layout.addWidget(self.x_spinbox); layout.addWidget(QLabel("Y:")); layout.addWidget(self.y_spinbox); layout.addWidget(self.limit_spinbox); layout.addStretch(); layout.addWidget(remove_btn)
+        self.button_combo.currentTextChanged.connect(lambda text: self.changed.emit()); self.enabled_toggle.toggled.connect(lambda checked: self.changed.emit())
+        for spinbox in (self.cps_spinbox, self.x_spinbox, self.y_spinbox, self.limit_spinbox): spinbox.valueChanged.connect(lambda value: self.changed.emit())
+
+    def to_dict(self):
+        x, y = self.x_spinbox.value(), self.y_spinbox.value()
+        at_cursor = x < 0 or y < 0
+        return {'mouse_button': self.button_combo.text().lower(), 'cps': self.cps_spinbox.value(), 'x': None if at_cursor else x, 'y': None if at_cursor else y,
+                'click_type': self.click_type, 'click_limit': self.limit_spinbox.value(), 'enabled': self.enabled_toggle.isChecked()}
+
 class TargetingView(QWidget):
     def __init__(self, state_manager, main_window_instance, font_manager):
-        super().__init__(); self.state_manager = state_manager; self.main_window = main_window_instance; self.font_manager = font_manager; self.picker_overlay = None; self.init_ui(); self.state_manager.settings_updated.connect(self.update_ui_from_state); self.update_ui_from_state()
+        super().__init__(); self.state_manager = state_manager; self.main_window = main_window_instance; self.font_manager = font_manager; self.picker_overlay = None; self.job_rows = []; self.init_ui(); self.state_manager.settings_updated.connect(self.update_ui_from_state); self.update_ui_from_state()
 
     def init_ui(self):
         main_layout = QVBoxLayout(self); main_layout.setContentsMargins(0, 0, 0, 0)
@@ -79,7 +122,16 @@ class TargetingView(QWidget):
         self.pick_location_btn = QPushButton("Pick Location"); self.pick_location_btn.setObjectName("primary_button"); self.pick_location_btn.clicked.connect(self.pick_location)
         coordinate_input_layout.addWidget(QLabel("X:")); coordinate_input_layout.addWidget(self.pos_x_spinbox); coordinate_input_layout.addWidget(QLabel("Y:")); coordinate_input_layout.addWidget(self.pos_y_spinbox); coordinate_input_layout.addStretch(); coordinate_input_layout.addWidget(self.pick_location_btn)
         self.card_frame.content_layout.addWidget(self.coordinate_input_widget)
-        self.radio_button_group = QButtonGroup(self); self.radio_button_group.addButton(self.current_pos_radio); self.radio_button_group.addButton(self.specific_pos_radio); self.radio_button_group.setExclusive(True)
+        self.sequence_radio = CustomRadioButton("Click Sequence"); self.card_frame.content_layout.addWidget(self.sequence_radio)
+        self.sequence_widget = QWidget(); sequence_layout = QHBoxLayout(self.sequence_widget); sequence_layout.setContentsMargins(28, 5, 0, 0)
+        self.sequence_label = QLabel("No points")
+        self.sequence_relative_label = QLabel("Relative to Window"); self.sequence_relative_label.setToolTip("Store newly picked points relative to the target window, so the sequence follows the window when it moves.")
+        self.sequence_relative_toggle = ToggleSwitch()
+        self.pick_sequence_btn = QPushButton("Pick Points"); self.pick_sequence_btn.setObjectName("primary_button"); self.pick_sequence_btn.clicked.connect(self.pick_sequence)
+        self.clear_sequence_btn = QPushButton("Clear"); self.clear_sequence_btn.clicked.connect(lambda: self.state_manager.update_setting('click_sequence', []))
+        sequence_layout.addWidget(self.sequence_label); sequence_layout.addStretch(); sequence_layout.addWidget(self.sequence_relative_label); sequence_layout.addWidget(self.sequence_relative_toggle); sequence_layout.addWidget(self.pick_sequence_btn); sequence_layout.addWidget(self.clear_sequence_btn)
+        self.card_frame.content_layout.addWidget(self.sequence_widget)
+        self.radio_button_group = QButtonGroup(self); self.radio_button_group.addButton(self.current_pos_radio); self.radio_button_group.addButton(self.specific_pos_radio); self.radio_button_group.addButton(self.sequence_radio); self.radio_button_group.setExclusive(True)
         separator = QFrame(); separator.setFrameShape(QFrame.Shape.HLine); separator.setObjectName("separator"); separator.setStyleSheet("border-top: 1px solid rgba(255, 255, 255, 0.05); margin-top: 10px; margin-bottom: 10px;"); self.card_frame.content_layout.addWidget(separator)
         window_toggle_layout = QHBoxLayout(); window_toggle_layout.setContentsMargins(0, 0, 0, 0)
         self.window_toggle_label = QLabel("Target a Specific Window")
@@ -96,7 +148,18 @@ class TargetingView(QWidget):
         self.refresh_windows_btn = QPushButton("Refresh")
         window_selection_layout.addWidget(self.window_selector); window_selection_layout.addWidget(self.refresh_windows_btn)
         self.card_frame.content_layout.addWidget(self.window_selection_widget)
-        self.current_pos_radio.toggled.connect(self.on_target_mode_change); self.specific_pos_radio.toggled.connect(self.on_target_mode_change); self.window_targeting_toggle.toggled.connect(self.on_window_targeting_toggled); self.refresh_windows_btn.clicked.connect(self.populate_windows_list); self.window_selector.currentTextChanged.connect(self.on_window_selected)
+        # --- CLICK JOBS: several buttons/rates/positions clicked from one engine thread ---
+        jobs_separator = QFrame(); jobs_separator.setFrameShape(QFrame.Shape.HLine); jobs_separator.setObjectName("separator"); jobs_separator.setStyleSheet("border-top: 1px solid rgba(255, 255, 255, 0.05); margin-top: 10px; margin-bottom: 10px;"); self.card_frame.content_layout.addWidget(jobs_separator)
+        jobs_toggle_layout = QHBoxLayout(); jobs_toggle_layout.setContentsMargins(0, 0, 0, 0)
+        self.jobs_toggle_label = QLabel("Run Multiple Click Jobs"); self.jobs_toggle_label.setStyleSheet("color: #8A95C1;"); self.jobs_toggle_label.setToolTip("Each job clicks with its own button, rate, position and limit. They replace the main click settings while enabled.")
+        self.jobs_toggle = ToggleSwitch(); self.jobs_toggle.toggled.connect(self.on_jobs_toggled)
+        jobs_toggle_layout.addWidget(self.jobs_toggle_label); jobs_toggle_layout.addStretch(); jobs_toggle_layout.addWidget(self.jobs_toggle)
+        self.card_frame.content_layout.addLayout(jobs_toggle_layout)
+        self.jobs_widget = QWidget(); self.jobs_layout = QVBoxLayout(self.jobs_widget); self.jobs_layout.setContentsMargins(0, 5, 0, 0)
+        self.add_job_btn = QPushButton("Add Job"); self.add_job_btn.setObjectName("primary_button"); self.add_job_btn.clicked.connect(self.add_job)
+        add_job_layout = QHBoxLayout(); add_job_layout.addStretch(); add_job_layout.addWidget(self.add_job_btn); self.jobs_layout.addLayout(add_job_layout)
+        self.card_frame.content_layout.addWidget(self.jobs_widget)
+        self.current_pos_radio.toggled.connect(self.on_target_mode_change); self.specific_pos_radio.toggled.connect(self.on_target_mode_change); self.sequence_radio.toggled.connect(self.on_target_mode_change); self.window_targeting_toggle.toggled.connect(self.on_window_targeting_toggled); self.refresh_windows_btn.clicked.connect(self.populate_windows_list); self.window_selector.currentTextChanged.connect(self.on_window_selected)
         apply_font_smoothing(self, self.font_manager.antialiased_font)
 
     def on_window_targeting_toggled(self, checked):
@@ -108,6 +171,8 @@ class TargetingView(QWidget):
             self.window_selector.setItems([])
 
     def populate_windows_list(self):
+        # Imported here: pygetwindow is slow to load and only needed once window targeting is used
+        import pygetwindow as gw
         windows = [title for title in gw.getAllTitles() if title]
         self.window_selector.setItems(windows)
 
@@ -115,14 +180,53 @@ class TargetingView(QWidget):
         self.state_manager.update_setting('target_window', window_title)
 
     def pick_location(self): self.main_window.hide(); QTimer.singleShot(100, self.show_overlay)
-    def show_overlay(self): self.picker_overlay = PixelPerfectPickerOverlay(); self.picker_overlay.location_picked.connect(self.on_location_picked); self.picker_overlay.show()
+    def show_overlay(self): self.picker_overlay = PixelPerfectPickerOverlay(); self.picker_overlay.location_picked.connect(self.on_location_picked); self.picker_overlay.cancelled.connect(self.on_pick_cancelled); self.picker_overlay.show()
     def on_location_picked(self, x, y): self.state_manager.update_setting('specific_pos_x', x); self.state_manager.update_setting('specific_pos_y', y); self.picker_overlay = None; self.main_window.show()
+    def on_pick_cancelled(self): self.picker_overlay = None; self.main_window.show()
+
+    def pick_sequence(self): self.main_window.hide(); QTimer.singleShot(100, self.show_sequence_overlay)
+    def show_sequence_overlay(self): self.picker_overlay = PixelPerfectPickerOverlay(multi=True); self.picker_overlay.points_picked.connect(self.on_points_picked); self.picker_overlay.cancelled.connect(self.on_pick_cancelled); self.picker_overlay.show()
+
+    def on_points_picked(self, points):
+        self.picker_overlay = None; self.main_window.show()
+        settings = self.state_manager.get_settings()
+        left, top, relative = 0, 0, self.sequence_relative_toggle.isChecked()
+        if relative:
+            # Store offsets from the window's current top-left corner
+            tracker = WindowTracker(settings.get('target_window') if settings.get('window_targeting_enabled') else None)
+            if tracker.resolve(): left, top = tracker.bounds[0], tracker.bounds[1]
+            else: relative = False; dialog = CustomDialog("warning", "No Target Window", "Select a target window to store points relative to it. The points were saved as screen coordinates.", show_cancel=False, parent=self); dialog.exec()
+        sequence = [{'x': x - left, 'y': y - top, 'relative': relative} for x, y in points]
+        self.state_manager.update_setting('click_sequence', settings.get('click_sequence', []) + sequence)
     
+    def on_jobs_toggled(self, checked):
+        self.state_manager.update_setting('multi_job_enabled', checked)
+        self.jobs_widget.setEnabled(checked)
+
+    def add_job(self):
+        jobs = self.state_manager.get_settings().get('click_jobs', [])
+        self.state_manager.update_setting('click_jobs', jobs + [{'mouse_button': 'left', 'cps': 10, 'x': None, 'y': None, 'click_type': 1, 'click_limit': 0, 'enabled': True}])
+
+    def save_jobs(self):
+        self.state_manager.update_setting('click_jobs', [row.to_dict() for row in self.job_rows])
+
+    def remove_job(self, row):
+        if row in self.job_rows: self.job_rows.remove(row); self.save_jobs()
+
+    def rebuild_job_rows(self, jobs):
+        for row in self.job_rows: row.deleteLater()
+        self.job_rows = []
+        for job in jobs:
+            row = ClickJobRow(job); row.changed.connect(self.save_jobs); row.remove_requested.connect(self.remove_job)
+            # Keep the "Add Job" button last
+            self.jobs_layout.insertWidget(self.jobs_layout.count() - 1, row); self.job_rows.append(row)
+        apply_font_smoothing(self.jobs_widget, self.font_manager.antialiased_font)
+
     def on_target_mode_change(self, checked):
         if not checked: return
-        is_specific = self.specific_pos_radio.isChecked()
-        self.coordinate_input_widget.setEnabled(is_specific)
-        mode = 'specific_pos' if is_specific else 'current_pos'
+        is_specific = self.specific_pos_radio.isChecked(); is_sequence = self.sequence_radio.isChecked()
+        self.coordinate_input_widget.setEnabled(is_specific); self.sequence_widget.setEnabled(is_sequence)
+        mode = 'specific_pos' if is_specific else 'sequence' if is_sequence else 'current_pos'
         if self.state_manager.get_settings()['target_mode'] != mode: self.state_manager.update_setting('target_mode', mode)
 
     def update_ui_from_state(self):
@@ -139,8 +243,18 @@ class TargetingView(QWidget):
         else:
             self.window_selector.setItems([])
         mode = settings.get('target_mode', 'current_pos'); is_specific = mode == 'specific_pos'
-        self.specific_pos_radio.blockSignals(True); self.current_pos_radio.blockSignals(True)
-        self.specific_pos_radio.setChecked(is_specific); self.current_pos_radio.setChecked(not is_specific)
-        self.specific_pos_radio.blockSignals(False); self.current_pos_radio.blockSignals(False)
-        self.coordinate_input_widget.setEnabled(is_specific)
-        self.pos_x_spinbox.setValue(settings.get('specific_pos_x', 0)); self.pos_y_spinbox.setValue(settings.get('specific_pos_y', 0))
\ No newline at end of file
+        is_sequence = mode == 'sequence'
+        self.specific_pos_radio.blockSignals(True); self.current_pos_radio.blockSignals(True); self.sequence_radio.blockSignals(True)
+        self.specific_pos_radio.setChecked(is_specific); self.sequence_radio.setChecked(is_sequence); self.current_pos_radio.setChecked(not is_specific and not is_sequence)
+        self.specific_pos_radio.blockSignals(False); self.current_pos_radio.blockSignals(False); self.sequence_radio.blockSignals(False)
+        self.coordinate_input_widget.setEnabled(is_specific); self.sequence_widget.setEnabled(is_sequence)
+        sequence = settings.get('click_sequence', []); relative_count = sum(1 for point in sequence if point.get('relative'))
+        self.sequence_label.setText(f"{len(sequence)} point(s)" + (f", {relative_count} window-relative" if relative_count else "") if sequence else "No points")
+        self.sequence_label.setToolTip("\n".join(f"{i}. {point['x']}, {point['y']}" + (" (window)" if point.get('relative') else "") for i, point in enumerate(sequence, 1)))
+        self.pos_x_spinbox.setValue(settings.get('specific_pos_x', 0)); self.pos_y_spinbox.setValue(settings.get('specific_pos_y', 0))
+        multi_job_enabled = settings.get('multi_job_enabled', False)
+        self.jobs_toggle.blockSignals(True); self.jobs_toggle.setChecked(multi_job_enabled); self.jobs_toggle.blockSignals(False)
+        self.jobs_widget.setEnabled(multi_job_enabled)
+        # Rows are only rebuilt when the list changed elsewhere (profile load, add/remove), not while being edited
+        jobs = settings.get('click_jobs', [])
+        if [row.to_dict() for row in self.job_rows] != jobs: self.rebuild_job_rows(jobs)
\ No newline at end of file